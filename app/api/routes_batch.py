@@ -0,0 +1,231 @@
+"""
+Batch synthesis: many speech requests in one HTTP call, for offline bulk jobs (IVR prompts, audiobooks).
+
+Items run through the same pipeline as POST /v1/audio/speech (cache, single-flight, inference
+workers) several at a time, so concurrent chunks fill the micro-batches and the fan-out pool.
+Results are streamed back as a zip archive as items finish, or written to a directory on the server.
+"""
+import asyncio
+import io
+import json
+import logging
+import re
+import time
+import zipfile
+from pathlib import Path
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.api.routes_tts import _check_auth, _check_loaded, plan_speech, render_speech
+from app.api.schemas import BatchSpeechItem
+
+router = APIRouter()
+log = logging.getLogger("silero")
+
+# Attempts of an item rejected with 429 while other traffic fills the inference queue
+_QUEUE_FULL_ATTEMPTS = 30
+_UNSAFE_NAME_RE = re.compile(r"[^\w.-]+")
+_JSONL_TYPES = ("application/x-ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+def _parse_items(body: bytes, content_type: str) -> list[dict]:
+    """Raw items of a JSON list, a {"items": [...]} object or JSONL (one request per line)."""
+    try:
+        if content_type.split(";")[0].strip() in _JSONL_TYPES:
+            return [json.loads(line) for line in body.decode("utf-8").splitlines() if line.strip()]
+        data = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch body: {e}")
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=400, detail='Batch body must be a JSON list, {"items": [...]} or JSONL')
+    return data
+
+
+def _file_name(index: int, item: BatchSpeechItem) -> str:
+    name = f"{index:05d}"
+    if item.id:
+        name += "_" + _UNSAFE_NAME_RE.sub("_", item.id).strip("._")[:100]
+    return f"{name}.{item.response_format or 'wav'}"
+
+
+def _concurrency(request: Request) -> int:
+    settings = request.app.state.settings
+    executor = request.app.state.executor
+    concurrency = settings.batch_concurrency or executor.workers * max(1, settings.silero_parallel_chunks)
+    # More would only be rejected by the inference queue
+    return max(1, min(concurrency, executor.capacity))
+
+
+async def _synthesize_item(request: Request, index: int, raw) -> tuple[dict, bytes | None]:
+    """Synthesizes one item; returns its manifest entry and audio (None when it failed)."""
+    entry: dict = {"index": index, "id": raw.get("id") if isinstance(raw, dict) else None}
+    t0 = time.perf_counter()
+    try:
+        item = BatchSpeechItem.model_validate(raw)
+        entry["file"] = _file_name(index, item)
+        plan = plan_speech(request, item)
+        for attempt in range(_QUEUE_FULL_ATTEMPTS):
+            try:
+                audio, hit = await render_speech(request, item.input, plan)
+                break
+            except HTTPException as e:
+                if e.status_code != 429 or attempt == _QUEUE_FULL_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(request.app.state.settings.inference_retry_after_sec)
+    except ValidationError as e:
+        entry.update(status="error", error=f"Invalid item: {e.errors(include_url=False)}")
+        return entry, None
+    except HTTPException as e:
+        entry.update(status="error", error=str(e.detail))
+        return entry, None
+    except Exception as e:
+        log.exception("Batch item %s failed", index)
+        entry.update(status="error", error=f"{type(e).__name__}: {e}")
+        return entry, None
+    entry.update(
+        status="ok",
+        cache="hit" if hit else "miss",
+        characters=len(item.input),
+        bytes=len(audio),
+        seconds=round(time.perf_counter() - t0, 3),
+    )
+    return entry, audio
+
+
+async def _run_batch(request: Request, items: list) -> AsyncIterator[tuple[dict, bytes | None]]:
+    """Yields (manifest entry, audio) of every item as it finishes; cancels the rest when abandoned."""
+    semaphore = asyncio.Semaphore(_concurrency(request))
+
+    async def run(index: int, raw) -> tuple[dict, bytes | None]:
+        async with semaphore:
+            return await _synthesize_item(request, index, raw)
+
+    tasks = [asyncio.ensure_future(run(index, raw)) for index, raw in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _report(entries: list[dict], seconds: float) -> dict:
+    ok = [e for e in entries if e["status"] == "ok"]
+    characters = sum(e["characters"] for e in ok)
+    return {
+        "items": len(entries),
+        "ok": len(ok),
+        "failed": len(entries) - len(ok),
+        "cache_hits": sum(e["cache"] == "hit" for e in ok),
+        "seconds": round(seconds, 3),
+        "items_per_sec": round(len(entries) / seconds, 2) if seconds > 0 else None,
+        "characters_per_sec": round(characters / seconds, 1) if seconds > 0 else None,
+        "bytes": sum(e["bytes"] for e in ok),
+    }
+
+
+def _manifest(entries: list[dict], t0: float) -> dict:
+    report = _report(entries, time.perf_counter() - t0)
+    log.info("Batch: %s", report)
+    return {"items": sorted(entries, key=lambda e: e["index"]), "report": report}
+
+
+class _ArchiveBuffer(io.RawIOBase):
+    """Write-only sink of a zip stream: the archive is yielded piece by piece, never kept whole."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def _stream_zip(request: Request, items: list) -> AsyncIterator[bytes]:
+    t0 = time.perf_counter()
+    buffer = _ArchiveBuffer()
+    entries = []
+    # Audio is compressed already (or small WAV): stored entries cost no CPU
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        async for entry, audio in _run_batch(request, items):
+            entries.append(entry)
+            if audio is not None:
+                archive.writestr(entry["file"], audio)
+                yield buffer.drain()
+        archive.writestr("manifest.json", json.dumps(_manifest(entries, t0), ensure_ascii=False, indent=2))
+    yield buffer.drain()
+
+
+def _output_dir(request: Request, name: str) -> Path:
+    """Directory under BATCH_OUTPUT_ROOT to write results into; the name must not leave the root."""
+    root = request.app.state.settings.batch_output_root
+    if not root:
+        raise HTTPException(status_code=400, detail="Writing batch results on the server is disabled (BATCH_OUTPUT_ROOT)")
+    root_path = Path(root).resolve()
+    path = (root_path / name).resolve()
+    if not path.is_relative_to(root_path):
+        raise HTTPException(status_code=400, detail="output_dir must stay inside BATCH_OUTPUT_ROOT")
+    return path
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+async def _write_to_dir(request: Request, items: list, out_dir: Path) -> dict:
+    t0 = time.perf_counter()
+    entries = []
+    async for entry, audio in _run_batch(request, items):
+        entries.append(entry)
+        if audio is not None:
+            await run_in_threadpool(_write_file, out_dir / entry["file"], audio)
+    manifest = _manifest(entries, t0)
+    await run_in_threadpool(
+        _write_file, out_dir / "manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+    )
+    return {"output_dir": str(out_dir), **manifest}
+
+
+@router.post("/v1/audio/speech/batch")
+async def create_speech_batch(request: Request, output_dir: str | None = None):
+    """
+    Synthesizes a batch of speech requests (JSON list, {"items": [...]} or JSONL).
+
+    Items take the fields of POST /v1/audio/speech plus an optional "id". Without output_dir the
+    response is a zip archive streamed as items finish: one audio file per successful item and
+    manifest.json (per-item status and a throughput report) at the end. With output_dir the files
+    are written under BATCH_OUTPUT_ROOT and the manifest is returned as JSON. A failed item does
+    not fail the batch.
+    """
+    _check_auth(request)
+    _check_loaded(request)
+    # Thousands of items must not be played on the server
+    request.state.auto_play = False
+    out_dir = _output_dir(request, output_dir) if output_dir is not None else None
+    items = _parse_items(await request.body(), request.headers.get("content-type", ""))
+    max_items = request.app.state.settings.batch_max_items
+    if len(items) > max_items:
+        raise HTTPException(status_code=413, detail=f"Batch has {len(items)} items, at most {max_items} allowed")
+
+    if out_dir is not None:
+        return JSONResponse(await _write_to_dir(request, items, out_dir))
+    return StreamingResponse(
+        _stream_zip(request, items),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="speech-batch.zip"'},
+    )
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter()
+
+
+def _ru_failed(request: Request) -> bool:
+    return request.app.state.engine_status["ru"]["state"] == "failed"
+
+
+def _status(request: Request, ok: bool, status: str) -> JSONResponse:
+    state = request.app.state
+    body = {
+        "status": status,
+        "engines": state.engine_status,
+        "preload": state.preload_status,
+        "warmup": state.warmup,
+        "startup_seconds": state.startup_seconds,
+    }
+    return JSONResponse(body, status_code=200 if ok else 503)
+
+
+@router.get("/healthz")
+def healthz(request: Request):
+    """Liveness probe (no auth): 200 while the process works, 503 once the RU model failed to load."""
+    if _ru_failed(request):
+        return _status(request, False, "failed")
+    return _status(request, True, "ok")
+
+
+@router.get("/readyz")
+def readyz(request: Request):
+    """Readiness probe (no auth): 503 until the models are loaded and warmed up, so no traffic reaches a cold replica."""
+    ready = request.app.state.ready.is_set()
+    return _status(request, ready, "ready" if ready else "failed" if _ru_failed(request) else "starting")
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.api.routes_tts import _check_auth
+from app.metrics import REGISTRY, state_metrics
+
+router = APIRouter()
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics")
+def metrics(request: Request):
+    """Per-stage latency histograms, throughput counters and cache/queue state for Prometheus."""
+    _check_auth(request)
+    return PlainTextResponse(REGISTRY.render(state_metrics(request.app.state)), media_type=CONTENT_TYPE)
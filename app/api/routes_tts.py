@@ -1,113 +1,565 @@
+import dataclasses
+import functools
 import logging
 import hashlib
-from io import BytesIO
+import time
+from typing import Callable, Generator, Iterable, Iterator
+
+import numpy as np
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+from starlette.concurrency import run_in_threadpool
+from app import tracing
 from app.api.schemas import SpeechRequest
+from app.audio.singleflight import Flight
+from app.text.language_router import TextSegment
 from app.text.normalize import replace_urls
+from app.tts.engine import synthesis_rate
+from app.tts.executor import InferenceSlot, QueueFullError
 from app.tts.voices import map_voice_to_silero
-from app.audio.concat import concat_wav_bytes
-from app.audio.encode import encode_audio, media_type_for
+from app.audio.buffer import AudioBuffer
+from app.audio.encode import encode_audio, finalize_wav_stream, media_type_for, stream_encode
+from app.audio.profiles import OutputProfile
+from app.audio.resample import resample
 from app.audio.player import play_audio, skip_playback
+from app.metrics import REALTIME_FACTOR, REQUEST_CHUNKS, REQUEST_SECONDS, REQUESTS, STAGE_SECONDS
 
 router = APIRouter()
 log = logging.getLogger("silero")
 
 
+def _bearer_token(req: Request) -> str | None:
+    auth = req.headers.get("authorization", "")
+    if not auth.startswith("Bearer "):
+        return None
+    return auth.split(" ", 1)[1].strip()
+
+
 def _check_auth(req: Request):
     settings = req.app.state.settings
     if not settings.require_auth:
         return
-    auth = req.headers.get("authorization", "")
-    if not auth.startswith("Bearer "):
+    token = _bearer_token(req)
+    if token is None:
         raise HTTPException(status_code=401, detail="Missing Authorization Bearer token")
-    token = auth.split(" ", 1)[1].strip()
-    if token != settings.api_key:
+    # Keys with an output profile (API_KEY_PROFILES) are valid keys as well
+    if token != settings.api_key and token not in settings.api_key_profiles:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
 
-def _synthesize_with_routing(request: Request, text: str, speaker: str) -> bytes:
+def _check_loaded(request: Request) -> None:
+    """Speech requests get 503 until the models have loaded (they load in the background at startup)."""
+    if not request.app.state.loaded.is_set():
+        retry_after = request.app.state.settings.inference_retry_after_sec
+        raise HTTPException(status_code=503, detail="Models are loading", headers={"Retry-After": str(retry_after)})
+
+
+def _resolve_profile(request: Request, payload: SpeechRequest) -> OutputProfile:
+    """Output profile of the request: its "profile" field, else the API key's profile; "sample_rate" overrides."""
+    settings = request.app.state.settings
+    name = payload.profile or settings.api_key_profiles.get(_bearer_token(request) or "")
+    profile = OutputProfile()
+    if name is not None:
+        profiles = request.app.state.output_profiles
+        if name not in profiles:
+            raise HTTPException(status_code=400, detail=f"Unknown output profile: {name}")
+        profile = profiles[name]
+    if payload.sample_rate is not None:
+        profile = dataclasses.replace(profile, sample_rate=payload.sample_rate)
+    return profile
+
+
+def _synthesize_chunk_parts(engine, chunk: str, speaker: str, sample_rate: int) -> list[np.ndarray]:
+    return [engine.synthesize_chunk(chunk, speaker, sample_rate)]
+
+
+def _synthesize_en_segment(request: Request, segment: TextSegment, speaker: str, sample_rate: int) -> list[np.ndarray]:
+    """
+    Synthesizes one EN segment; falls back to the RU engine when the EN model rejects it.
+
+    The EN model may run at its own (cheaper) sample rate: its audio is resampled to the
+    request's rate as one piece, so the filter sees no boundaries inside the segment.
+    """
+    ru_engine = request.app.state.engine
+    en_engine = request.app.state.en_engine
+    normalized = request.app.state.en_normalizer.run(segment.text)
+    if not normalized or not normalized.strip():
+        normalized = " "
+    # Sequential inside the segment: this already runs as one fan-out job
+    en_rate = synthesis_rate(en_engine.sample_rate, sample_rate)
+    try:
+        with tracing.span("segment", lang="en", chars=len(normalized)):
+            parts = list(
+                en_engine.iter_audio(normalized, speaker=en_engine.default_speaker, parallel=False, sample_rate=en_rate)
+            )
+    except (ValueError, RuntimeError) as e:
+        log.warning("EN model rejected segment, fallback to RU: %s", e)
+        normalized_ru = request.app.state.normalizer.run(segment.text)
+        return list(ru_engine.iter_audio(normalized_ru, speaker=speaker, parallel=False, sample_rate=sample_rate))
+    if en_rate != sample_rate:
+        return [resample(np.concatenate(parts), en_rate, sample_rate)]
+    return parts
+
+
+def _iter_with_routing(request: Request, text: str, speaker: str, sample_rate: int) -> Iterator[np.ndarray]:
+    """
+    Yields float32 audio of language segments in order, chunk by chunk, with pauses in between.
+
+    RU chunks and EN segments are independent jobs: with a fan-out pool they are synthesized
+    concurrently (up to SILERO_PARALLEL_CHUNKS per request) and reassembled in order.
+    """
     ru_engine = request.app.state.engine
     en_engine = request.app.state.en_engine
     ru_normalizer = request.app.state.normalizer
-    en_normalizer = request.app.state.en_normalizer
     lang_router = request.app.state.language_router
+    fanout = getattr(request.app.state, "fanout", None)
 
     # First replace URL with "link" so a phrase like "Link to GitHub: https://..." remains one segment as "Link to link"
     text = replace_urls(text)
-    segments = lang_router.split(text)
+    with STAGE_SECONDS.time(stage="split"):
+        segments = lang_router.split(text)
     if not segments:
-        return ru_engine.synthesize_wav_bytes(" ", speaker=speaker)
+        yield from ru_engine.iter_audio(" ", speaker=speaker, sample_rate=sample_rate)
+        return
 
-    wav_parts = []
-    for segment in segments:
+    # (segment index, job returning the audio parts of one piece)
+    jobs: list[tuple[int, Callable[[], list[np.ndarray]]]] = []
+    for i, segment in enumerate(segments):
         if segment.lang == "en" and en_engine is not None:
-            normalized = en_normalizer.run(segment.text)
-            if not normalized or not normalized.strip():
-                normalized = " "
-            try:
-                wav_parts.append(en_engine.synthesize_wav_bytes(normalized, speaker=en_engine.default_speaker))
-            except (ValueError, RuntimeError) as e:
-                log.warning("EN model rejected segment, fallback to RU: %s", e)
-                normalized_ru = ru_normalizer.run(segment.text)
-                wav_parts.append(ru_engine.synthesize_wav_bytes(normalized_ru, speaker=speaker))
+            jobs.append((i, functools.partial(_synthesize_en_segment, request, segment, speaker, sample_rate)))
         else:
             normalized = ru_normalizer.run(segment.text)
-            wav_parts.append(ru_engine.synthesize_wav_bytes(normalized, speaker=speaker))
+            for chunk in ru_engine.split_text(normalized):
+                jobs.append((i, functools.partial(_synthesize_chunk_parts, ru_engine, chunk, speaker, sample_rate)))
 
-    pause_sec = getattr(request.app.state.settings, "silero_pause_between_fragments_sec", 0.3)
-    return concat_wav_bytes(wav_parts, expected_sample_rate=ru_engine.sample_rate, pause_sec=pause_sec)
+    REQUEST_CHUNKS.observe(len(jobs))
+    if fanout is not None:
+        results = fanout.map_ordered(lambda job: job[1](), jobs)
+    else:
+        results = (job() for _, job in jobs)
 
+    segment_pause_sec = getattr(request.app.state.settings, "silero_pause_between_fragments_sec", 0.3)
+    prev_segment = None
+    for (segment_index, _), parts in zip(jobs, results):
+        if prev_segment is not None:
+            pause_sec = segment_pause_sec if segment_index != prev_segment else ru_engine.chunk_pause_sec
+            if pause_sec > 0:
+                yield np.zeros(int(sample_rate * pause_sec), dtype=np.float32)
+        prev_segment = segment_index
+        yield from parts
 
-@router.post("/v1/audio/speech")
-def create_speech(payload: SpeechRequest, request: Request):
-    _check_auth(request)
 
-    settings = request.app.state.settings
+def _iter_audio(request: Request, text: str, speaker: str, sample_rate: int) -> Iterator[np.ndarray]:
+    """Audio parts of the whole input at the given Silero rate: language-routed, or chunks of the RU engine."""
+    if request.app.state.settings.language_aware_routing:
+        return _iter_with_routing(request, text, speaker, sample_rate)
     engine = request.app.state.engine
-    normalizer = request.app.state.normalizer
+    chunks = engine.split_text(request.app.state.normalizer.run(text))
+    REQUEST_CHUNKS.observe(len(chunks))
+    return engine.iter_chunks(chunks, speaker=speaker, sample_rate=sample_rate)
+
+
+def _observe_realtime_factor(seconds: float, audio_sec: float) -> None:
+    if audio_sec > 0:
+        REALTIME_FACTOR.observe(seconds / audio_sec)
+
+
+def _synthesize(request: Request, text: str, speaker: str, sample_rate: int) -> AudioBuffer:
+    """Runs the text pipeline and inference for the whole input at the given Silero rate."""
+    t0 = time.perf_counter()
+    with tracing.span("synthesize", chars=len(text), sample_rate=sample_rate):
+        audio = AudioBuffer.concat(_iter_audio(request, text, speaker, sample_rate), sample_rate)
+    _observe_realtime_factor(time.perf_counter() - t0, audio.duration_sec)
+    return audio
+
+
+def _play_if_enabled(settings, audio: AudioBuffer, speed: float) -> None:
+    """Auto-play on the server side (use original PCM for better quality)."""
+    if not settings.auto_play:
+        return
+    # Apply only speed to WAV for playback
+    wav_for_play = encode_audio(
+        audio,
+        out_format="wav",
+        ffmpeg_bin=settings.ffmpeg_bin,
+        speed=speed,
+        encoder=settings.audio_encoder,
+        speed_backend=settings.speed_backend,
+    )
+    play_audio(wav_for_play, ffplay_bin=settings.ffplay_bin, volume=settings.auto_play_volume)
+
+
+def _cache_key(key_src: str) -> str:
+    return hashlib.sha256(key_src.encode("utf-8")).hexdigest()
+
+
+def _pcm_key(settings, speaker: str, synth_rate: int, text: str) -> str:
+    return _cache_key(f"lar={settings.language_aware_routing}|voice={speaker}|sr={synth_rate}|text={text.strip()}")
+
+
+def _encoded_key(pcm_key: str, out_fmt: str, speed: float, profile: OutputProfile) -> str:
+    """Key of the encoded layer; WAV at normal speed with the default profile is the PCM entry itself."""
+    if out_fmt == "wav" and abs(speed - 1.0) < 1e-6 and profile.is_default:
+        return pcm_key
+    return _cache_key(f"pcm={pcm_key}|fmt={out_fmt}|speed={speed}{profile.cache_tag()}")
+
+
+async def _cache_lookup(cache, key: str) -> bytes | None:
+    cached = cache.get_memory(key)
+    if cached is None:
+        cached = await run_in_threadpool(cache.get_disk, key)
+    return cached
+
+
+def _encode_and_store(
+    request: Request,
+    wav_bytes: bytes,
+    out_fmt: str,
+    speed: float,
+    key: str,
+    pcm_key: str | None = None,
+    profile: OutputProfile | None = None,
+) -> bytes:
+    """
+    Encodes the response, stores it in the cache and auto-plays it (ffmpeg/disk work, off the event loop).
+
+    pcm_key is set for freshly synthesized audio, which is cached as well so that other
+    formats/speeds/profiles of the same text only need encoding.
+    """
+    settings = request.app.state.settings
     cache = request.app.state.cache
+    if pcm_key is not None and pcm_key != key:
+        cache.put(pcm_key, wav_bytes)
+    # A view of the samples inside wav_bytes: nothing is decoded or copied before encoding
+    audio = AudioBuffer.from_wav(wav_bytes)
+    if key == pcm_key:
+        out_bytes = wav_bytes
+    else:
+        out_bytes = encode_audio(
+            audio,
+            out_format=out_fmt,
+            ffmpeg_bin=settings.ffmpeg_bin,
+            speed=speed,
+            encoder=settings.audio_encoder,
+            speed_backend=settings.speed_backend,
+            profile=profile,
+        )
+    cache.put(key, out_bytes)
+    # Batch jobs turn auto-play off for their items
+    if getattr(request.state, "auto_play", True):
+        _play_if_enabled(settings, audio, speed)
+    return out_bytes
+
+
+def _stream_speech(
+    request: Request,
+    payload: SpeechRequest,
+    speaker: str,
+    out_fmt: str,
+    key: str,
+    pcm_key: str,
+    synth_rate: int,
+    profile: OutputProfile,
+) -> Generator[bytes, None, bytes]:
+    """
+    Yields encoded audio while later chunks are still being synthesized.
+
+    Chunks are synthesized on the inference workers; once the stream finishes the complete
+    response is cached (and auto-played) and returned as the generator's value.
+    """
+    settings = request.app.state.settings
+    speed = payload.speed or 1.0
+    pcm_parts: list[np.ndarray] = []
+    t0 = time.perf_counter()
 
+    def _collect(parts: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        for part in parts:
+            pcm_parts.append(part)
+            yield part
+
+    encoded = []
+    pcm_stream = _collect(request.app.state.executor.iterate(_iter_audio(request, payload.input, speaker, synth_rate)))
+    chunks = stream_encode(
+        pcm_stream,
+        synth_rate,
+        out_fmt,
+        settings.ffmpeg_bin,
+        speed=speed,
+        speed_backend=settings.speed_backend,
+        profile=profile,
+    )
+    for data in chunks:
+        encoded.append(data)
+        yield data
+
+    # The streamed WAV header has open-ended sizes; the PCM layer gets a regular WAV
+    audio = AudioBuffer.concat(pcm_parts, synth_rate)
+    # Includes encoding, which overlaps with synthesis while streaming
+    _observe_realtime_factor(time.perf_counter() - t0, audio.duration_sec)
+    wav_bytes = audio.to_wav()
+    request.app.state.cache.put(pcm_key, wav_bytes)
+    out_bytes = wav_bytes
+    if key != pcm_key:
+        out_bytes = b"".join(encoded)
+        if out_fmt == "wav":
+            # Resampled, time-stretched or stereo WAV was streamed with open-ended sizes as well
+            out_bytes = finalize_wav_stream(out_bytes)
+        request.app.state.cache.put(key, out_bytes)
+    _play_if_enabled(settings, audio, speed)
+    return out_bytes
+
+
+def _next_chunk(chunks: Generator[bytes, None, bytes]) -> tuple[bool, bytes]:
+    """Advances a stream: (False, chunk), or (True, complete response) when it is over."""
+    try:
+        return False, next(chunks)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+async def _produce_stream(
+    request: Request,
+    payload: SpeechRequest,
+    speaker: str,
+    out_fmt: str,
+    key: str,
+    pcm_key: str,
+    synth_rate: int,
+    profile: OutputProfile,
+    slot: InferenceSlot,
+    flight: Flight,
+) -> bytes:
+    """
+    Runs one streamed synthesis and publishes its chunks to every request of the flight.
+
+    Runs as its own task, so the slot is released however the clients go away; synthesis
+    stops early once all of them have disconnected.
+    """
+    chunks = _stream_speech(request, payload, speaker, out_fmt, key, pcm_key, synth_rate, profile)
+    with slot:
+        try:
+            while True:
+                # A step blocks on the inference workers and ffmpeg: keep it off the event loop
+                done, data = await run_in_threadpool(tracing.profiled, _next_chunk, chunks)
+                if done:
+                    return data
+                flight.publish(data)
+                if flight.abandoned:
+                    raise RuntimeError("All clients of the stream disconnected")
+        finally:
+            await run_in_threadpool(chunks.close)
+
+
+async def _synthesize_pcm(request: Request, text: str, speaker: str, sample_rate: int) -> bytes:
+    """Synthesizes the PCM layer, serialized once as the WAV that is cached and shared by the flight."""
+    with _admit(request):
+        audio = await request.app.state.executor.run(tracing.profiled, _synthesize, request, text, speaker, sample_rate)
+    return await run_in_threadpool(audio.to_wav)
+
+
+async def _produce_speech(
+    request: Request,
+    text: str,
+    speaker: str,
+    out_fmt: str,
+    speed: float,
+    key: str,
+    pcm_key: str,
+    synth_rate: int,
+    profile: OutputProfile,
+    wav_bytes: bytes | None,
+) -> bytes:
+    """Encoded response for a cache miss; identical concurrent syntheses (same PCM key) run once."""
+    if wav_bytes is not None:
+        return await run_in_threadpool(
+            tracing.profiled, _encode_and_store, request, wav_bytes, out_fmt, speed, key, None, profile
+        )
+    synthesize = functools.partial(_synthesize_pcm, request, text, speaker, synth_rate)
+    if key == pcm_key:
+        # This flight is the PCM flight itself (WAV at normal speed)
+        wav_bytes = await synthesize()
+    else:
+        wav_bytes = await request.app.state.singleflight.do(pcm_key, synthesize)
+    return await run_in_threadpool(
+        tracing.profiled, _encode_and_store, request, wav_bytes, out_fmt, speed, key, pcm_key, profile
+    )
+
+
+class _ReleasingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that runs a release callback however the response ends.
+
+    The body iterator's own cleanup does not run when the client disconnects before
+    the first send (the iterator is never started), so the callback runs here. The
+    optional on_finish callback runs after it in the threadpool (it may do file I/O).
+    """
+
+    def __init__(self, content, release: Callable[[], None], **kwargs) -> None:
+        super().__init__(content, **kwargs)
+        self._release = release
+        self.on_finish: Callable[[], None] | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._release()
+            if self.on_finish is not None:
+                await run_in_threadpool(self.on_finish)
+
+
+def _admit(request: Request) -> InferenceSlot:
+    """Reserves an inference slot or rejects the request with 429 when the queue is full."""
+    try:
+        return request.app.state.executor.admit()
+    except QueueFullError as e:
+        retry_after = request.app.state.settings.inference_retry_after_sec
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(retry_after)})
+
+
+@router.post("/v1/audio/speech")
+async def create_speech(payload: SpeechRequest, request: Request):
+    """
+    OpenAI-compatible speech endpoint.
+
+    With tracing enabled for the request (X-Debug-Trace: 1 or TRACE_REQUESTS) the response carries
+    its stage timings in a Server-Timing header; a streamed response only has the timings up to
+    the first byte there, its complete trace is exported once the stream ends.
+    """
+    tracer = request.app.state.tracer
+    trace = tracer.begin(request.headers)
+    if trace is None:
+        return await _create_speech(payload, request)
+    try:
+        with tracing.span("create_speech", format=payload.response_format or "wav", chars=len(payload.input)):
+            response = await _create_speech(payload, request)
+    except BaseException:
+        tracer.finish(trace)
+        raise
+    response.headers["Server-Timing"] = trace.server_timing()
+    response.headers["X-Trace-Id"] = trace.trace_id
+    if isinstance(response, _ReleasingStreamingResponse):
+        response.on_finish = functools.partial(tracer.finish, trace)
+    else:
+        await run_in_threadpool(tracer.finish, trace)
+    return response
+
+
+@dataclasses.dataclass(frozen=True)
+class SpeechPlan:
+    """What a speech request resolves to: Silero speaker and rate, output encoding and cache keys."""
+
+    speaker: str
+    out_fmt: str
+    speed: float
+    profile: OutputProfile
+    synth_rate: int
+    pcm_key: str
+    key: str
+
+
+def plan_speech(request: Request, payload: SpeechRequest) -> SpeechPlan:
+    """Resolves voice, output profile and cache keys of a request (HTTPException 400 on an unknown profile)."""
+    settings = request.app.state.settings
+    engine = request.app.state.engine
     silero_speaker = map_voice_to_silero(payload.voice, default=engine.default_speaker)
     out_fmt = payload.response_format or "wav"
+    speed = payload.speed or 1.0
+    profile = _resolve_profile(request, payload)
+    # Low output rates are synthesized at the cheapest native Silero rate that covers them
+    synth_rate = synthesis_rate(engine.sample_rate, profile.sample_rate)
+    profile = profile.resolve(out_fmt, synth_rate)
+
+    # Layered cache: text + voice + rate -> PCM (WAV), then PCM + format + speed + profile -> encoded bytes
+    pcm_key = _pcm_key(settings, silero_speaker, synth_rate, payload.input)
+    key = _encoded_key(pcm_key, out_fmt, speed, profile)
+    return SpeechPlan(silero_speaker, out_fmt, speed, profile, synth_rate, pcm_key, key)
+
 
-    key_src = (
-        f"lar={settings.language_aware_routing}|voice={silero_speaker}|speed={payload.speed}|"
-        f"fmt={out_fmt}|sr={engine.sample_rate}|text={payload.input.strip()}"
+async def _speech_producer(request: Request, text: str, plan: SpeechPlan) -> tuple[bytes | None, Callable]:
+    """Cached PCM layer of the text (if any) and the single-flight producer of the encoded response."""
+    # Another format/speed of this text was synthesized already: only encoding is needed
+    wav_bytes = await _cache_lookup(request.app.state.cache, plan.pcm_key) if plan.key != plan.pcm_key else None
+    produce = functools.partial(
+        _produce_speech,
+        request,
+        text,
+        plan.speaker,
+        plan.out_fmt,
+        plan.speed,
+        plan.key,
+        plan.pcm_key,
+        plan.synth_rate,
+        plan.profile,
+        wav_bytes,
     )
-    key = hashlib.sha256(key_src.encode("utf-8")).hexdigest()
+    return wav_bytes, produce
 
-    cached = cache.get(key)
+
+async def render_speech(request: Request, text: str, plan: SpeechPlan) -> tuple[bytes, bool]:
+    """Encoded response from the cache or synthesized (once for identical requests in flight); (bytes, cache hit)."""
+    cached = await _cache_lookup(request.app.state.cache, plan.key)
     if cached is not None:
-        return StreamingResponse(BytesIO(cached), media_type=media_type_for(out_fmt))
+        REQUESTS.inc(format=plan.out_fmt, cache="hit")
+        return cached, True
+    REQUESTS.inc(format=plan.out_fmt, cache="miss")
+    _, produce = await _speech_producer(request, text, plan)
+    return await request.app.state.singleflight.do(plan.key, produce), False
 
-    if settings.language_aware_routing:
-        wav_bytes = _synthesize_with_routing(request, payload.input, silero_speaker)
-    else:
-        normalized = normalizer.run(payload.input)
-        wav_bytes = engine.synthesize_wav_bytes(normalized, speaker=silero_speaker)
-
-    out_bytes = encode_audio(
-        wav_bytes=wav_bytes,
-        out_format=out_fmt,
-        ffmpeg_bin=request.app.state.settings.ffmpeg_bin,
-        speed=payload.speed or 1.0,
-    )
 
-    cache.put(key, out_bytes)
+async def _create_speech(payload: SpeechRequest, request: Request):
+    t0 = time.perf_counter()
+    with STAGE_SECONDS.time(stage="auth"):
+        _check_auth(request)
+    _check_loaded(request)
+
+    settings = request.app.state.settings
+    singleflight = request.app.state.singleflight
+    plan = plan_speech(request, payload)
+    out_fmt, key, pcm_key = plan.out_fmt, plan.key, plan.pcm_key
+
+    stream = settings.stream_audio if payload.stream is None else payload.stream
+    if not stream:
+        out_bytes, hit = await render_speech(request, payload.input, plan)
+        REQUEST_SECONDS.observe(time.perf_counter() - t0, format=out_fmt, cache="hit" if hit else "miss")
+        # bytes body is sent as is (no BytesIO copy)
+        return Response(content=out_bytes, media_type=media_type_for(out_fmt))
+
+    cached = await _cache_lookup(request.app.state.cache, key)
+    if cached is not None:
+        REQUESTS.inc(format=out_fmt, cache="hit")
+        REQUEST_SECONDS.observe(time.perf_counter() - t0, format=out_fmt, cache="hit")
+        return Response(content=cached, media_type=media_type_for(out_fmt))
+    REQUESTS.inc(format=out_fmt, cache="miss")
+    # Identical requests in flight share one computation (single-flight)
+    wav_bytes, produce = await _speech_producer(request, payload.input, plan)
 
-    # Auto-play on the server side (use original WAV for better quality)
-    if settings.auto_play:
-        # Apply only speed to WAV for playback
-        wav_for_play = encode_audio(
-            wav_bytes=wav_bytes,
-            out_format="wav",
-            ffmpeg_bin=request.app.state.settings.ffmpeg_bin,
-            speed=payload.speed or 1.0,
+    if singleflight.in_flight(key) or wav_bytes is not None or singleflight.in_flight(pcm_key):
+        # Join the identical response in flight, or only encode (PCM cached or being synthesized)
+        flight = singleflight.join(key, produce)
+    else:
+        slot = _admit(request)
+        flight = singleflight.join_stream(
+            key,
+            functools.partial(
+                _produce_stream, request, payload, plan.speaker, out_fmt, key, pcm_key, plan.synth_rate, plan.profile, slot
+            ),
         )
-        play_audio(wav_for_play, ffplay_bin=settings.ffplay_bin, volume=settings.auto_play_volume)
+    subscription = flight.subscribe()
+    return _ReleasingStreamingResponse(subscription, subscription.close, media_type=media_type_for(out_fmt))
+
 
-    return StreamingResponse(BytesIO(out_bytes), media_type=media_type_for(out_fmt))
+@router.get("/v1/cache/stats")
+def cache_stats(request: Request):
+    """Hit/miss/eviction counters and size of each cache tier, plus request coalescing counters."""
+    _check_auth(request)
+    stats = request.app.state.cache.stats()
+    stats["singleflight"] = request.app.state.singleflight.stats()
+    chunk_cache = getattr(request.app.state, "chunk_cache", None)
+    if chunk_cache is not None:
+        stats["chunks"] = chunk_cache.stats()
+    return stats
 
 
 @router.delete("/v1/audio/speech/skip")
@@ -116,3 +568,25 @@ def skip_speech(request: Request):
     _check_auth(request)
     skipped = skip_playback()
     return {"skipped": skipped}
+
+
+def prime_cache(app, phrases: list[str], voices: list[str]) -> int:
+    """
+    Synthesizes common phrases into the response cache at startup; returns how many were added.
+
+    Entries are the PCM layer (WAV at the configured rate): WAV requests for these phrases are
+    cache hits, other formats and speeds only need encoding.
+    """
+    request = Request({"type": "http", "app": app})
+    engine = app.state.engine
+    cache = app.state.cache
+    added = 0
+    for voice in voices:
+        speaker = map_voice_to_silero(voice, default=engine.default_speaker)
+        for phrase in phrases:
+            key = _pcm_key(app.state.settings, speaker, engine.sample_rate, phrase)
+            # A persistent cache may have it from the previous run
+            if cache.get(key) is None:
+                cache.put(key, _synthesize(request, phrase, speaker, engine.sample_rate).to_wav())
+                added += 1
+    return added
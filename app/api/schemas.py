@@ -9,3 +9,10 @@ class SpeechRequest(BaseModel):
     voice: str = Field(..., description="OpenAI voice name or Silero speaker")
     response_format: Optional[AudioFormat] = "wav"
     speed: Optional[float] = Field(1.0, ge=0.25, le=4.0)
+    sample_rate: Optional[int] = Field(None, ge=8000, le=48000, description="Extension: output sample rate in Hz (default: SILERO_SAMPLE_RATE)")
+    profile: Optional[str] = Field(None, description="Extension: output profile name (default: the API key's profile, if any)")
+    stream: Optional[bool] = Field(None, description="Extension: stream audio chunk by chunk (default: STREAM_AUDIO)")
+
+class BatchSpeechItem(SpeechRequest):
+    """One item of POST /v1/audio/speech/batch ("stream" is ignored)."""
+    id: Optional[str] = Field(None, max_length=100, description="Extension: item name used in the archive and manifest")
@@ -0,0 +1,105 @@
+"""In-memory mono PCM passed between synthesis, speed change and encoding (WAV only at the edges)."""
+from __future__ import annotations
+
+import io
+import struct
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import soundfile as sf
+
+from app.audio.resample import resample
+from app.metrics import STAGE_SECONDS
+
+
+def to_pcm16(samples: np.ndarray) -> np.ndarray:
+    """float32 [-1, 1] samples -> little-endian int16 (int16 input is returned as is)."""
+    if samples.dtype == np.int16:
+        return samples
+    return np.rint(np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+
+
+def wav_header(sample_rate: int, data_bytes: int) -> bytes:
+    """44-byte header of a 16-bit mono PCM WAV."""
+    return (
+        b"RIFF" + struct.pack("<I", min(36 + data_bytes, 0xFFFFFFFF)) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b"data" + struct.pack("<I", min(data_bytes, 0xFFFFFFFF))
+    )
+
+
+@dataclass(frozen=True)
+class AudioBuffer:
+    """
+    Mono audio between pipeline stages: float32 samples in [-1, 1] or int16, plus sample rate.
+
+    Engine output stays float32 until it is serialized; audio read back from a cached WAV is an
+    int16 view of the cached bytes (no copy, no dequantization) until a stage needs floats.
+    """
+
+    samples: np.ndarray
+    sample_rate: int
+
+    @classmethod
+    def concat(cls, parts: Iterable[np.ndarray], sample_rate: int) -> "AudioBuffer":
+        """Joins float32 parts into one buffer allocated once."""
+        parts = list(parts)
+        if not parts:
+            return cls(np.zeros(0, dtype=np.float32), sample_rate)
+        with STAGE_SECONDS.time(stage="concat"):
+            return cls(np.concatenate(parts, dtype=np.float32), sample_rate)
+
+    @classmethod
+    def from_wav(cls, data: bytes) -> "AudioBuffer":
+        """Reads a WAV; 16-bit mono PCM (what this server writes) is viewed without copying."""
+        view = memoryview(data)
+        if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+            pos = 12
+            fmt = None
+            while pos + 8 <= len(data):
+                chunk_id = data[pos:pos + 4]
+                (size,) = struct.unpack_from("<I", data, pos + 4)
+                body = pos + 8
+                if chunk_id == b"fmt ":
+                    fmt = struct.unpack_from("<HHIIHH", data, body)
+                elif chunk_id == b"data" and fmt is not None:
+                    audio_format, channels, sample_rate, _, _, bits = fmt
+                    if audio_format == 1 and channels == 1 and bits == 16:
+                        # Streamed WAVs have open-ended sizes: read up to the end of the data
+                        end = min(len(data), body + size) // 2 * 2
+                        return cls(np.frombuffer(view[body:end], dtype="<i2"), sample_rate)
+                    break
+                pos = body + size + (size & 1)
+        samples, sample_rate = sf.read(io.BytesIO(data), dtype="float32")
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1).astype(np.float32)
+        return cls(samples, sample_rate)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def duration_sec(self) -> float:
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+    def float32(self) -> np.ndarray:
+        if self.samples.dtype == np.float32:
+            return self.samples
+        if self.samples.dtype == np.int16:
+            return self.samples.astype(np.float32) / 32767.0
+        return self.samples.astype(np.float32)
+
+    def pcm16(self) -> np.ndarray:
+        return to_pcm16(self.samples)
+
+    def resampled(self, sample_rate: int) -> "AudioBuffer":
+        """Same audio at another sample rate (self when the rate already matches)."""
+        if sample_rate == self.sample_rate:
+            return self
+        return AudioBuffer(resample(self.float32(), self.sample_rate, sample_rate), sample_rate)
+
+    def to_wav(self) -> bytes:
+        """Serializes as 16-bit PCM WAV (the response/cache edge)."""
+        pcm = self.pcm16().tobytes()
+        return wav_header(self.sample_rate, len(pcm)) + pcm
@@ -1,40 +1,288 @@
 from __future__ import annotations
+import json
+import logging
 import os
+import shutil
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+from app.metrics import CACHE_SECONDS
+
 class DiskCache:
-    def __init__(self, root: str, max_files: int = 2000):
+    """
+    Two-level directory cache of response bytes with an in-memory LRU index.
+
+    The index (key -> size, least recently used first) is built with one directory scan
+    at startup and then kept current on every get/put, so eviction by file count and
+    total size is O(1) per write. Writes go to a temp file that is renamed into place,
+    so concurrent readers never see a partially written entry.
+
+    With a fingerprint (persistent mode) the cache survives restarts: entries made with
+    another fingerprint (model, text pipeline) are dropped at startup, and the index is
+    loaded from the manifest saved by save_manifest() instead of rescanning the tree.
+    """
+
+    FINGERPRINT_FILE = "fingerprint"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, root: str, max_files: int = 2000, max_bytes: int = 0, fingerprint: str | None = None):
         self.root = Path(root)
         self.root.mkdir(parents=True, exist_ok=True)
         self.max_files = int(max_files)
+        self.max_bytes = int(max_bytes)  # 0 = no size limit
+
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+        self.fingerprint = fingerprint
+
+        if fingerprint is not None:
+            self._check_fingerprint()
+        if not self._load_manifest():
+            self._load_index()
 
     def _path(self, key: str) -> Path:
         return self.root / key[:2] / (key[2:4]) / f"{key}.bin"
 
+    def _check_fingerprint(self) -> None:
+        """Drops all entries when they were produced with another fingerprint."""
+        fp_file = self.root / self.FINGERPRINT_FILE
+        try:
+            stored = fp_file.read_text(encoding="utf-8").strip()
+        except OSError:
+            stored = None
+        if stored == self.fingerprint:
+            return
+        if any(self.root.iterdir()):
+            logging.getLogger("silero").info("Cache fingerprint changed, clearing %s", self.root)
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+        fp_file.write_text(self.fingerprint, encoding="utf-8")
+
+    def _load_manifest(self) -> bool:
+        """
+        Warm start: loads the index saved at the last clean shutdown.
+
+        The manifest is consumed (deleted) so that after a crash the next start falls back
+        to a directory scan and does not miss entries written after the snapshot.
+        """
+        manifest = self.root / self.MANIFEST_FILE
+        if self.fingerprint is None or not manifest.exists():
+            return False
+        try:
+            data = json.loads(manifest.read_text(encoding="utf-8"))
+            manifest.unlink()
+        except (OSError, ValueError):
+            return False
+        if data.get("fingerprint") != self.fingerprint:
+            return False
+        with self._lock:
+            for key, size in data.get("entries", []):
+                self._index[key] = int(size)
+                self._total_bytes += int(size)
+            victims = self._evict_locked()
+        self._unlink(victims)
+        return True
+
+    def save_manifest(self) -> None:
+        """Saves the index (least recently used first) for a fast warm start."""
+        with self._lock:
+            data = {"fingerprint": self.fingerprint, "entries": list(self._index.items())}
+        manifest = self.root / self.MANIFEST_FILE
+        tmp = manifest.with_name(f"{manifest.name}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, manifest)
+
+    def _load_index(self) -> None:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for fn in filenames:
+                fp = Path(dirpath) / fn
+                try:
+                    if fn.endswith(".bin"):
+                        st = fp.stat()
+                        entries.append((st.st_mtime, fn[: -len(".bin")], st.st_size))
+                    elif fn.endswith(".tmp"):
+                        # Leftover of an interrupted write
+                        fp.unlink()
+                except OSError:
+                    pass
+        entries.sort()
+        with self._lock:
+            for _, key, size in entries:
+                self._index[key] = size
+                self._total_bytes += size
+            victims = self._evict_locked()
+        self._unlink(victims)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._index),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
     def get(self, key: str) -> bytes | None:
-        p = self._path(key)
-        if not p.exists():
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+        try:
+            data = self._path(key).read_bytes()
+        except FileNotFoundError:
+            # Removed behind our back (manual cleanup, concurrent eviction)
+            with self._lock:
+                self._forget_locked(key)
+                self.misses += 1
             return None
-        return p.read_bytes()
+        with self._lock:
+            self.hits += 1
+        return data
 
     def put(self, key: str, data: bytes) -> None:
         p = self._path(key)
         p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_bytes(data)
-        self._gc()
+        tmp = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, p)
+        with self._lock:
+            self._forget_locked(key)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            victims = self._evict_locked()
+        self._unlink(victims)
 
-    def _gc(self):
-        files = []
-        for dirpath, _, filenames in os.walk(self.root):
-            for fn in filenames:
-                if fn.endswith(".bin"):
-                    fp = Path(dirpath) / fn
-                    files.append((fp.stat().st_mtime, fp))
-        if len(files) <= self.max_files:
-            return
-        files.sort()
-        for _, fp in files[: len(files) - self.max_files]:
+    def _forget_locked(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict_locked(self) -> list[Path]:
+        victims = []
+        while self._index and (
+            len(self._index) > self.max_files
+            or (self.max_bytes > 0 and self._total_bytes > self.max_bytes)
+        ):
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            victims.append(self._path(key))
+        return victims
+
+    @staticmethod
+    def _unlink(paths: list[Path]) -> None:
+        for fp in paths:
             try:
                 fp.unlink()
             except OSError:
                 pass
+
+
+class MemoryCache:
+    """Byte-budgeted in-process LRU of response bytes (0 bytes = disabled)."""
+
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        # Entries that would take the whole budget are left to the disk tier
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._total_bytes -= len(old)
+            self._items[key] = data
+            self._total_bytes += len(data)
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._total_bytes -= len(evicted)
+                self.evictions += 1
+
+
+class TieredCache:
+    """
+    RAM tier in front of DiskCache.
+
+    Writes go to both tiers. A disk hit is promoted to RAM; entries evicted from RAM
+    (demoted) are still served from disk, since the disk tier already has them.
+    """
+
+    def __init__(self, disk: DiskCache, memory: MemoryCache | None = None):
+        self.disk = disk
+        self.memory = memory if memory is not None else MemoryCache(0)
+
+    def __len__(self) -> int:
+        return len(self.disk)
+
+    def stats(self) -> dict:
+        return {"memory": self.memory.stats(), "disk": self.disk.stats()}
+
+    def get_memory(self, key: str) -> bytes | None:
+        """RAM tier only: no disk I/O, safe to call on the event loop."""
+        with CACHE_SECONDS.time(op="get", tier="memory"):
+            return self.memory.get(key)
+
+    def get_disk(self, key: str) -> bytes | None:
+        """Disk tier lookup; a hit is promoted to RAM."""
+        with CACHE_SECONDS.time(op="get", tier="disk"):
+            data = self.disk.get(key)
+        if data is not None:
+            self.memory.put(key, data)
+        return data
+
+    def get(self, key: str) -> bytes | None:
+        data = self.get_memory(key)
+        if data is not None:
+            return data
+        return self.get_disk(key)
+
+    def put(self, key: str, data: bytes) -> None:
+        with CACHE_SECONDS.time(op="put", tier="disk"):
+            self.disk.put(key, data)
+        with CACHE_SECONDS.time(op="put", tier="memory"):
+            self.memory.put(key, data)
@@ -1,7 +1,21 @@
+import io
+import struct
 import subprocess
-from typing import Literal
+import threading
+from typing import Iterable, Iterator, Literal
+
+import numpy as np
+import soundfile as sf
+
+from app.audio.buffer import AudioBuffer, to_pcm16, wav_header
+from app.audio.profiles import OutputProfile
+from app.audio.resample import resample
+from app.audio.tempo import time_stretch
+from app.metrics import ENCODE_SECONDS
 
 AudioFormat = Literal["wav", "mp3", "opus", "aac", "flac"]
+AudioEncoder = Literal["auto", "ffmpeg"]
+SpeedBackend = Literal["native", "ffmpeg"]
 
 MEDIA_TYPES = {
     "wav": "audio/wav",
@@ -28,47 +42,231 @@ def _atempo_chain(speed: float) -> str:
     filters.append(f"atempo={s:.6f}")
     return ",".join(filters)
 
-def encode_audio(wav_bytes: bytes, out_format: AudioFormat, ffmpeg_bin: str, speed: float = 1.0) -> bytes:
-    if out_format == "wav" and abs(speed - 1.0) < 1e-6:
-        return wav_bytes
+def _output_args(out_format: AudioFormat) -> list[str]:
+    """ffmpeg output arguments (codec/container) for the requested format."""
+    if out_format == "wav":
+        return ["-f", "wav"]
+    if out_format == "mp3":
+        return ["-f", "mp3"]
+    if out_format == "flac":
+        return ["-f", "flac"]
+    if out_format == "aac":
+        return ["-c:a", "aac", "-f", "adts"]
+    if out_format == "opus":
+        return ["-c:a", "libopus", "-f", "ogg"]
+    raise ValueError(f"Unsupported format: {out_format}")
+
+# Formats libsndfile can encode in-process: format -> (container, subtype)
+NATIVE_CODECS = {
+    "flac": ("FLAC", "PCM_16"),
+    "mp3": ("MP3", "MPEG_LAYER_III"),
+    "opus": ("OGG", "OPUS"),
+}
+# Ogg Opus only accepts these input sample rates
+_OPUS_SAMPLE_RATES = {8000, 12000, 16000, 24000, 48000}
+
+
+def native_encoding_supported(out_format: AudioFormat, sample_rate: int) -> bool:
+    """True when the installed libsndfile can encode the format in-process (no ffmpeg spawn)."""
+    codec = NATIVE_CODECS.get(out_format)
+    if codec is None or not sf.check_format(*codec):
+        return False
+    return out_format != "opus" or sample_rate in _OPUS_SAMPLE_RATES
+
+
+def _encode_native(audio: AudioBuffer, out_format: AudioFormat) -> bytes:
+    container, subtype = NATIVE_CODECS[out_format]
+    out = io.BytesIO()
+    sf.write(out, audio.pcm16(), audio.sample_rate, format=container, subtype=subtype)
+    return out.getvalue()
+
+
+def encode_audio(
+    audio: AudioBuffer,
+    out_format: AudioFormat,
+    ffmpeg_bin: str,
+    speed: float = 1.0,
+    encoder: AudioEncoder = "auto",
+    speed_backend: SpeedBackend = "native",
+    profile: OutputProfile | None = None,
+) -> bytes:
+    """
+    Encodes audio into out_format at the given speed (WAV is serialized here, at the edge).
+
+    The profile's sample rate is applied first (before the speed change, so downsampled output
+    is also cheaper to stretch and encode); its channels/bitrate/frame size go to ffmpeg.
+    With speed_backend="native", speed is changed in-process (WSOLA) before encoding.
+    With encoder="auto", FLAC/MP3/Opus are encoded in-process by libsndfile; AAC, ffmpeg
+    speed changes, profile codec settings and codecs missing from libsndfile go through an
+    ffmpeg subprocess, which is fed raw 16-bit PCM (no WAV to parse).
+    """
+    with ENCODE_SECONDS.time(format=out_format):
+        return _encode(audio, out_format, ffmpeg_bin, speed, encoder, speed_backend, profile or OutputProfile())
+
+
+def _encode(
+    audio: AudioBuffer,
+    out_format: AudioFormat,
+    ffmpeg_bin: str,
+    speed: float,
+    encoder: AudioEncoder,
+    speed_backend: SpeedBackend,
+    profile: OutputProfile,
+) -> bytes:
+    if profile.sample_rate:
+        audio = audio.resampled(profile.sample_rate)
+    if speed_backend == "native" and abs(speed - 1.0) > 1e-6:
+        audio = AudioBuffer(time_stretch(audio.float32(), audio.sample_rate, speed), audio.sample_rate)
+        speed = 1.0
+
+    if out_format == "wav" and abs(speed - 1.0) < 1e-6 and profile.channels == 1:
+        return audio.to_wav()
+
+    if (
+        encoder == "auto"
+        and abs(speed - 1.0) < 1e-6
+        and not profile.needs_ffmpeg
+        and native_encoding_supported(out_format, audio.sample_rate)
+    ):
+        return _encode_native(audio, out_format)
 
     afilter = _atempo_chain(speed) if abs(speed - 1.0) > 1e-6 else None
 
-    if out_format == "wav":
-        # WAV with speed adjustment via ffmpeg
-        args = [ffmpeg_bin, "-hide_banner", "-loglevel", "error", "-i", "pipe:0"]
-        if afilter:
-            args += ["-filter:a", afilter]
-        args += ["-f", "wav", "pipe:1"]
-    elif out_format == "mp3":
-        args = [ffmpeg_bin, "-hide_banner", "-loglevel", "error", "-i", "pipe:0"]
-        if afilter:
-            args += ["-filter:a", afilter]
-        args += ["-f", "mp3", "pipe:1"]
-
-    elif out_format == "flac":
-        args = [ffmpeg_bin, "-hide_banner", "-loglevel", "error", "-i", "pipe:0"]
-        if afilter:
-            args += ["-filter:a", afilter]
-        args += ["-f", "flac", "pipe:1"]
-
-    elif out_format == "aac":
-        args = [ffmpeg_bin, "-hide_banner", "-loglevel", "error", "-i", "pipe:0"]
-        if afilter:
-            args += ["-filter:a", afilter]
-        args += ["-c:a", "aac", "-f", "adts", "pipe:1"]
-
-    elif out_format == "opus":
-        args = [ffmpeg_bin, "-hide_banner", "-loglevel", "error", "-i", "pipe:0"]
-        if afilter:
-            args += ["-filter:a", afilter]
-        args += ["-c:a", "libopus", "-f", "ogg", "pipe:1"]
-
-    else:
-        raise ValueError(f"Unsupported format: {out_format}")
-
-    proc = subprocess.run(args, input=wav_bytes, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    args = [
+        ffmpeg_bin, "-hide_banner", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(audio.sample_rate), "-ac", "1", "-i", "pipe:0",
+    ]
+    if afilter:
+        args += ["-filter:a", afilter]
+    args += profile.ffmpeg_args() + _output_args(out_format) + ["pipe:1"]
+
+    proc = subprocess.run(args, input=audio.pcm16().tobytes(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if proc.returncode != 0:
         err = proc.stderr.decode("utf-8", errors="ignore")[:4000]
         raise RuntimeError(f"ffmpeg failed: {err}")
     return proc.stdout
+
+def pcm16_bytes(audio_np: np.ndarray) -> bytes:
+    """float32 [-1, 1] mono samples -> little-endian 16-bit PCM."""
+    return to_pcm16(audio_np).tobytes()
+
+def wav_stream_header(sample_rate: int) -> bytes:
+    """
+    Header of an open-ended 16-bit mono WAV stream.
+
+    RIFF and data sizes are unknown while streaming, so they are set to 0xFFFFFFFF
+    (players read until the end of the stream).
+    """
+    return wav_header(sample_rate, 0xFFFFFFFF)
+
+def finalize_wav_stream(data: bytes) -> bytes:
+    """
+    Complete WAV stream with the open-ended RIFF and data sizes replaced by the real ones.
+
+    Walks the chunks, so headers written by ffmpeg (with extra chunks before "data") work as well.
+    """
+    wav = bytearray(data)
+    if len(wav) < 12 or wav[:4] != b"RIFF" or wav[8:12] != b"WAVE":
+        return data
+    struct.pack_into("<I", wav, 4, len(wav) - 8)
+    pos = 12
+    while pos + 8 <= len(wav):
+        chunk_id = bytes(wav[pos : pos + 4])
+        if chunk_id == b"data":
+            struct.pack_into("<I", wav, pos + 4, len(wav) - pos - 8)
+            break
+        (size,) = struct.unpack_from("<I", wav, pos + 4)
+        pos += 8 + size + (size & 1)
+    return bytes(wav)
+
+def _stretched(parts: Iterable[np.ndarray], sample_rate: int, speed: float) -> Iterator[np.ndarray]:
+    for part in parts:
+        yield time_stretch(part, sample_rate, speed)
+
+
+def _resampled(parts: Iterable[np.ndarray], from_rate: int, to_rate: int) -> Iterator[np.ndarray]:
+    for part in parts:
+        yield resample(part, from_rate, to_rate)
+
+def stream_encode(
+    pcm_parts: Iterable[np.ndarray],
+    sample_rate: int,
+    out_format: AudioFormat,
+    ffmpeg_bin: str,
+    speed: float = 1.0,
+    speed_backend: SpeedBackend = "native",
+    profile: OutputProfile | None = None,
+) -> Iterator[bytes]:
+    """
+    Encodes float32 audio parts as they arrive and yields encoded bytes.
+
+    The profile's sample rate is applied to every part as it arrives (parts are chunks of
+    speech with silent edges, so they are resampled independently).
+    With speed_backend="native", every part is time-stretched in-process as it arrives.
+    WAV without (ffmpeg) speed change is written directly (open-ended header + PCM).
+    Other formats go through one long-lived ffmpeg process: a feeder thread writes raw PCM
+    to its stdin while encoded frames are read from stdout and yielded immediately.
+    """
+    profile = profile or OutputProfile()
+    if profile.sample_rate and profile.sample_rate != sample_rate:
+        pcm_parts = _resampled(pcm_parts, sample_rate, profile.sample_rate)
+        sample_rate = profile.sample_rate
+    if speed_backend == "native" and abs(speed - 1.0) > 1e-6:
+        pcm_parts = _stretched(pcm_parts, sample_rate, speed)
+        speed = 1.0
+
+    if out_format == "wav" and abs(speed - 1.0) < 1e-6 and profile.channels == 1:
+        yield wav_stream_header(sample_rate)
+        for part in pcm_parts:
+            yield pcm16_bytes(part)
+        return
+
+    # Disable input probing/buffering, otherwise ffmpeg waits for the whole input before emitting output
+    args = [
+        ffmpeg_bin, "-hide_banner", "-loglevel", "error",
+        "-probesize", "32", "-analyzeduration", "0", "-fflags", "nobuffer",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+    ]
+    if abs(speed - 1.0) > 1e-6:
+        args += ["-filter:a", _atempo_chain(speed)]
+    args += profile.ffmpeg_args() + _output_args(out_format) + ["-flush_packets", "1", "pipe:1"]
+
+    proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    errors: list[BaseException] = []
+
+    def _feed() -> None:
+        try:
+            for part in pcm_parts:
+                proc.stdin.write(pcm16_bytes(part))
+                proc.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            # ffmpeg exited (error or client disconnect) - nothing left to feed
+            pass
+        except Exception as e:
+            errors.append(e)
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    feeder = threading.Thread(target=_feed, daemon=True, name="ffmpeg-stream-feed")
+    feeder.start()
+    try:
+        while True:
+            data = proc.stdout.read1(65536)
+            if not data:
+                break
+            yield data
+        feeder.join()
+        proc.wait()
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    if errors:
+        raise errors[0]
+    if proc.returncode != 0:
+        err = proc.stderr.read().decode("utf-8", errors="ignore")[:4000]
+        raise RuntimeError(f"ffmpeg failed: {err}")
@@ -0,0 +1,106 @@
+"""Named output profiles: sample rate, channels and codec settings of a response."""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields, replace
+
+from app.api.schemas import AudioFormat
+
+_BITRATE_FORMATS = {"mp3", "opus", "aac"}
+# Frame durations libopus accepts, in milliseconds
+_OPUS_FRAMES_MS = {2.5, 5.0, 10.0, 20.0, 40.0, 60.0}
+
+
+@dataclass(frozen=True)
+class OutputProfile:
+    """
+    How a response is rendered beyond format and speed (None/1 = as synthesized, codec defaults).
+
+    bitrate is an ffmpeg bitrate ("16k"); opus_frame_ms is the Opus frame duration.
+    """
+
+    sample_rate: int | None = None
+    channels: int = 1
+    bitrate: str | None = None
+    opus_frame_ms: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.sample_rate is not None and not 8000 <= self.sample_rate <= 48000:
+            raise ValueError(f"sample_rate must be 8000-48000 Hz, got {self.sample_rate}")
+        if self.channels not in (1, 2):
+            raise ValueError(f"channels must be 1 or 2, got {self.channels}")
+        if self.opus_frame_ms is not None and float(self.opus_frame_ms) not in _OPUS_FRAMES_MS:
+            raise ValueError(f"opus_frame_ms must be one of {sorted(_OPUS_FRAMES_MS)}, got {self.opus_frame_ms}")
+
+    @property
+    def is_default(self) -> bool:
+        return self == OutputProfile()
+
+    @property
+    def needs_ffmpeg(self) -> bool:
+        """libsndfile codecs only write mono at their default bitrate and frame size."""
+        return self.channels != 1 or self.bitrate is not None or self.opus_frame_ms is not None
+
+    def resolve(self, out_format: AudioFormat, synthesis_rate: int) -> "OutputProfile":
+        """
+        Drops settings that do not change this response, so equivalent requests share cache entries.
+
+        A sample rate equal to the synthesis rate needs no conversion; bitrate only applies to
+        lossy formats and the frame size only to Opus.
+        """
+        return replace(
+            self,
+            sample_rate=None if self.sample_rate == synthesis_rate else self.sample_rate,
+            bitrate=self.bitrate if out_format in _BITRATE_FORMATS else None,
+            opus_frame_ms=self.opus_frame_ms if out_format == "opus" else None,
+        )
+
+    def cache_tag(self) -> str:
+        """Cache key fragment ("" for the default profile)."""
+        tag = ""
+        if self.sample_rate is not None:
+            tag += f"|sr={self.sample_rate}"
+        if self.channels != 1:
+            tag += f"|ch={self.channels}"
+        if self.bitrate is not None:
+            tag += f"|br={self.bitrate}"
+        if self.opus_frame_ms is not None:
+            tag += f"|frame={self.opus_frame_ms}"
+        return tag
+
+    def ffmpeg_args(self) -> list[str]:
+        """ffmpeg output options for this profile (sample rate is converted before ffmpeg)."""
+        args = []
+        if self.channels != 1:
+            args += ["-ac", str(self.channels)]
+        if self.bitrate is not None:
+            args += ["-b:a", self.bitrate]
+        if self.opus_frame_ms is not None:
+            args += ["-frame_duration", f"{self.opus_frame_ms:g}"]
+        return args
+
+
+# Telephony/embedded clients: narrowband or wideband mono at a low bitrate, 20 ms Opus frames
+BUILTIN_PROFILES: dict[str, OutputProfile] = {
+    "default": OutputProfile(),
+    "telephony": OutputProfile(sample_rate=8000, bitrate="16k", opus_frame_ms=20),
+    "wideband": OutputProfile(sample_rate=16000, bitrate="24k", opus_frame_ms=20),
+}
+
+
+def load_profiles(custom: dict[str, dict]) -> dict[str, OutputProfile]:
+    """Built-in profiles plus custom ones (OUTPUT_PROFILES); a custom profile may replace a built-in one."""
+    names = {f.name for f in fields(OutputProfile)}
+    profiles = dict(BUILTIN_PROFILES)
+    for name, options in custom.items():
+        unknown = set(options) - names
+        if unknown:
+            raise ValueError(f"Output profile {name!r}: unknown options {sorted(unknown)}")
+        profiles[name] = OutputProfile(**options)
+    return profiles
+
+
+def check_key_profiles(key_profiles: dict[str, str], profiles: dict[str, OutputProfile]) -> None:
+    """Fails at startup on API_KEY_PROFILES naming a missing profile (every request of that key would get 400)."""
+    unknown = sorted({name for name in key_profiles.values() if name not in profiles})
+    if unknown:
+        raise ValueError(f"API_KEY_PROFILES: unknown output profiles {unknown}, available: {sorted(profiles)}")
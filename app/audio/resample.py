@@ -0,0 +1,21 @@
+"""Sample rate conversion (polyphase, vectorized in scipy)."""
+from __future__ import annotations
+
+from math import gcd
+
+import numpy as np
+from scipy.signal import resample_poly
+
+
+def resample(audio: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """
+    Converts float32 mono audio from from_rate to to_rate.
+
+    Uses a polyphase filter with the reduced up/down ratio (48k -> 24k is 1/2, 24k -> 48k is 2/1,
+    48k -> 8k is 1/6), so typical conversions cost one FIR pass over the signal.
+    """
+    if from_rate == to_rate or len(audio) == 0:
+        return audio
+    g = gcd(from_rate, to_rate)
+    out = resample_poly(np.asarray(audio, dtype=np.float32), to_rate // g, from_rate // g)
+    return out.astype(np.float32, copy=False)
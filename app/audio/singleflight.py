@@ -0,0 +1,147 @@
+"""Request coalescing: one computation per key for concurrent identical requests."""
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable
+
+
+class Flight:
+    """
+    One in-flight computation of a response; confined to the event loop.
+
+    Streamed chunks are kept and replayed to every subscriber, so a request that joins late
+    still gets the whole response. result() is the complete (non-streamed) response body.
+    """
+
+    def __init__(self) -> None:
+        self.task: asyncio.Task | None = None
+        self._chunks: list[bytes] = []
+        self._changed = asyncio.Event()
+        self._done = False
+        self._error: BaseException | None = None
+        self._subscribers = 0
+
+    @property
+    def abandoned(self) -> bool:
+        """True when nobody waits for the response any more (every client disconnected)."""
+        return self._subscribers == 0
+
+    def publish(self, chunk: bytes) -> None:
+        self._chunks.append(chunk)
+        self._wake()
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self._done = True
+        self._error = error
+        self._wake()
+
+    def _wake(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def subscribe(self) -> "FlightSubscription":
+        """Registers a reader now (before the response starts) and returns its chunk iterator."""
+        return FlightSubscription(self)
+
+    async def result(self) -> bytes:
+        self._subscribers += 1
+        try:
+            # Shielded: a waiter that goes away must not cancel the work others wait for
+            return await asyncio.shield(self.task)
+        finally:
+            self._subscribers -= 1
+
+
+class FlightSubscription:
+    """Async iterator over the chunks of a Flight; close() unregisters the reader."""
+
+    def __init__(self, flight: Flight) -> None:
+        self._flight = flight
+        self._closed = False
+        flight._subscribers += 1
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._flight._subscribers -= 1
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        flight = self._flight
+        i = 0
+        try:
+            while True:
+                if i < len(flight._chunks):
+                    i += 1
+                    yield flight._chunks[i - 1]
+                    continue
+                if flight._done:
+                    if flight._error is not None:
+                        raise flight._error
+                    return
+                await flight._changed.wait()
+        finally:
+            self.close()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent computations of the same cache key (thundering herd protection).
+
+    The first request (leader) starts the computation as a separate task; identical requests
+    arriving while it runs join that Flight instead of computing again, whether they want
+    a buffered or a streamed response.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._flights), "leaders": self.leaders, "coalesced": self.coalesced}
+
+    def join(self, key: str, fn: Callable[[], Awaitable[bytes]]) -> Flight:
+        """Joins the flight of key or starts fn(); the whole result is published as one chunk."""
+        return self._join(key, fn, streaming=False)
+
+    def join_stream(self, key: str, fn: Callable[[Flight], Awaitable[bytes]]) -> Flight:
+        """Joins the flight of key or starts fn(flight), which publishes chunks as they are produced."""
+        return self._join(key, fn, streaming=True)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[bytes]]) -> bytes:
+        return await self.join(key, fn).result()
+
+    def _join(self, key: str, fn: Callable, streaming: bool) -> Flight:
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            return flight
+        self.leaders += 1
+        flight = Flight()
+        self._flights[key] = flight
+        flight.task = asyncio.ensure_future(self._run(key, flight, fn, streaming))
+        flight.task.add_done_callback(_retrieve_exception)
+        return flight
+
+    async def _run(self, key: str, flight: Flight, fn: Callable, streaming: bool) -> bytes:
+        try:
+            result = await (fn(flight) if streaming else fn())
+            if not streaming:
+                flight.publish(result)
+            flight.finish()
+            return result
+        except BaseException as e:
+            flight.finish(e)
+            raise
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Marks the exception as retrieved even if every waiter went away
+    if not task.cancelled():
+        task.exception()
@@ -2,4 +2,4 @@
 import uvicorn
 
 def main():
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
+    uvicorn.run("app.main:create_app", factory=True, host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
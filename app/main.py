@@ -1,15 +1,51 @@
+import hashlib
 import logging
 import shutil
+import threading
+import time
 from fastapi import FastAPI
 from app.settings import Settings
 from app.tts.engine import SileroTTSEngine
-from app.text.normalize import TextNormalizer
+from app.tts.executor import InferenceExecutor
+from app.tts.parallel import FanoutPool
+from app.tts.process_pool import ShardedSileroTTSEngine
+from app.text.normalize import TextNormalizer, text_pipeline_fingerprint
 from app.text.language_router import LanguageAwareRouter
-from app.audio.cache import DiskCache
+from app.audio.cache import DiskCache, MemoryCache, TieredCache
+from app.audio.profiles import check_key_profiles, load_profiles
+from app.audio.singleflight import SingleFlight
+from app.api.routes_batch import router as batch_router
+from app.api.routes_health import router as health_router
+from app.api.routes_metrics import router as metrics_router
 from app.api.routes_tts import router as tts_router
+from app.tracing import Tracer
+from app.startup import start_in_background
+
+APP_VERSION = "0.1.0"
+
+
+def _cache_fingerprint(settings: Settings) -> str:
+    """Identifies everything that changes synthesized audio for the same cache key."""
+    parts = [
+        f"app={APP_VERSION}",
+        f"text_pipeline={text_pipeline_fingerprint()}",
+        f"ru={settings.silero_language}/{settings.silero_model_id}/{settings.silero_sample_rate}",
+        f"en={settings.silero_en_enabled}/{settings.silero_en_language}/{settings.silero_en_model_id}/"
+        f"{settings.silero_en_sample_rate}/{settings.silero_en_default_speaker}",
+        f"translit={settings.transliterate_latin}",
+        f"chunk={settings.silero_max_chars_per_chunk}",
+        f"pause={settings.silero_pause_between_fragments_sec}",
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
 
 
 def create_app() -> FastAPI:
+    """
+    Builds the app without loading models (uvicorn factory: `uvicorn app.main:create_app --factory`).
+
+    Models load in the background once the server starts; see app.startup.
+    """
+    started_at = time.perf_counter()
     settings = Settings()
 
     logging.basicConfig(
@@ -21,12 +57,23 @@ def create_app() -> FastAPI:
     if settings.ffmpeg_bin:
         if shutil.which(settings.ffmpeg_bin) is None:
             logging.getLogger("silero").warning(
-                "ffmpeg not found in PATH. Non-WAV formats and speed change will not work."
+                "ffmpeg not found in PATH. AAC, output profile bitrate/stereo/Opus frame size options "
+                "and SPEED_BACKEND=ffmpeg will not work."
             )
 
-    app = FastAPI(title="Silero OpenAI-compatible TTS", version="0.1.0")
+    app = FastAPI(title="Silero OpenAI-compatible TTS", version=APP_VERSION)
 
-    ru_engine = SileroTTSEngine(
+    fanout = None
+    if settings.silero_parallel_chunks > 1:
+        fanout = FanoutPool(workers=settings.silero_parallel_pool_size, max_parallel=settings.silero_parallel_chunks)
+
+    engine_cls = SileroTTSEngine
+    engine_extra = {}
+    if settings.silero_processes > 0:
+        engine_cls = ShardedSileroTTSEngine
+        engine_extra = dict(num_workers=settings.silero_processes, start_method=settings.silero_process_start_method)
+
+    ru_engine = engine_cls(
         language=settings.silero_language,
         model_id=settings.silero_model_id,
         device=settings.silero_device,
@@ -36,11 +83,15 @@ def create_app() -> FastAPI:
         max_chars_per_chunk=settings.silero_max_chars_per_chunk,
         chunk_pause_sec=settings.silero_pause_between_fragments_sec,
         models_dir=settings.silero_models_dir,
+        batch_max_size=settings.silero_batch_max_size,
+        batch_wait_ms=settings.silero_batch_wait_ms,
+        fanout=fanout,
+        **engine_extra,
     )
 
     en_engine = None
     if settings.language_aware_routing and settings.silero_en_enabled:
-        en_engine = SileroTTSEngine(
+        en_engine = engine_cls(
             language=settings.silero_en_language,
             model_id=settings.silero_en_model_id,
             device=settings.silero_device,
@@ -50,6 +101,10 @@ def create_app() -> FastAPI:
             max_chars_per_chunk=settings.silero_max_chars_per_chunk,
             chunk_pause_sec=settings.silero_pause_between_fragments_sec,
             models_dir=settings.silero_models_dir,
+            batch_max_size=settings.silero_batch_max_size,
+            batch_wait_ms=settings.silero_batch_wait_ms,
+            fanout=fanout,
+            **engine_extra,
         )
 
     if settings.language_aware_routing:
@@ -63,7 +118,29 @@ def create_app() -> FastAPI:
         en_normalizer = None
         lang_router = None
 
-    cache = DiskCache(settings.cache_dir, max_files=settings.cache_max_files)
+    disk_cache = DiskCache(
+        settings.cache_dir,
+        max_files=settings.cache_max_files,
+        max_bytes=settings.cache_max_bytes,
+        fingerprint=_cache_fingerprint(settings) if settings.cache_persistent else None,
+    )
+    cache = TieredCache(disk_cache, MemoryCache(settings.cache_memory_max_bytes))
+    chunk_cache = None
+    if settings.cache_chunks:
+        # Own store and limits: many small float32 chunk entries must not evict whole responses
+        chunk_cache = TieredCache(
+            DiskCache(
+                settings.cache_chunks_dir,
+                max_files=settings.cache_chunks_max_files,
+                max_bytes=settings.cache_chunks_max_bytes,
+                fingerprint=disk_cache.fingerprint,
+            ),
+            MemoryCache(settings.cache_chunks_memory_max_bytes),
+        )
+        ru_engine.chunk_cache = chunk_cache
+        if en_engine is not None:
+            en_engine.chunk_cache = chunk_cache
+    executor = InferenceExecutor(workers=settings.inference_workers, max_queue=settings.inference_max_queue)
 
     app.state.settings = settings
     app.state.engine = ru_engine
@@ -72,23 +149,68 @@ def create_app() -> FastAPI:
     app.state.en_normalizer = en_normalizer
     app.state.language_router = lang_router
     app.state.cache = cache
+    app.state.chunk_cache = chunk_cache
+    app.state.singleflight = SingleFlight()
+    app.state.output_profiles = load_profiles(settings.output_profiles)
+    check_key_profiles(settings.api_key_profiles, app.state.output_profiles)
+    app.state.executor = executor
+    app.state.fanout = fanout
+    app.state.tracer = Tracer(
+        trace_all=settings.trace_requests,
+        allow_header=settings.trace_allow_header,
+        export_path=settings.trace_export_path,
+        profile_slowest=settings.trace_profile_slowest,
+        profile_dir=settings.trace_profile_dir,
+    )
+    app.state.started_at = started_at
+    app.state.startup_seconds = None
+    app.state.loaded = threading.Event()
+    app.state.ready = threading.Event()
+    app.state.engine_status = {"ru": {"state": "pending", "seconds": None}}
+    if en_engine is not None:
+        app.state.engine_status["en"] = {"state": "pending", "seconds": None}
+    app.state.preload_status = {}
+    app.state.warmup = {"status": "pending" if settings.warmup_enabled else "disabled", "seconds": None}
+
+    @app.on_event("startup")
+    def _startup():
+        # The port is bound right away: speech requests get 503 and /readyz reports progress meanwhile
+        start_in_background(app)
 
     @app.on_event("shutdown")
     def _shutdown():
-        cache_dir = app.state.settings.cache_dir
-        try:
-            shutil.rmtree(cache_dir)
-            logging.getLogger("silero").info("Cache cleared: %s", cache_dir)
-        except OSError as e:
-            logging.getLogger("silero").warning("Could not remove cache dir %s: %s", cache_dir, e)
-
-    # Load model(s) immediately on app creation to avoid dependency on startup order
-    ru_engine.load()
-    if en_engine is not None:
-        en_engine.load()
+        executor.shutdown()
+        if fanout is not None:
+            fanout.shutdown()
+        ru_engine.close()
+        if en_engine is not None:
+            en_engine.close()
+        caches = [(app.state.settings.cache_dir, cache)]
+        if chunk_cache is not None:
+            caches.append((app.state.settings.cache_chunks_dir, chunk_cache))
+        for cache_dir, tiered in caches:
+            if app.state.settings.cache_persistent:
+                tiered.disk.save_manifest()
+                logging.getLogger("silero").info("Cache kept (persistent): %s, %s files", cache_dir, len(tiered))
+                continue
+            try:
+                shutil.rmtree(cache_dir)
+                logging.getLogger("silero").info("Cache cleared: %s", cache_dir)
+            except OSError as e:
+                logging.getLogger("silero").warning("Could not remove cache dir %s: %s", cache_dir, e)
 
     app.include_router(tts_router)
+
+    app.include_router(batch_router)
+    app.include_router(health_router)
+    app.include_router(metrics_router)
     return app
 
 
-app = create_app()
+def __getattr__(name: str):
+    """`uvicorn app.main:app` still works: the app is created on first access, not at import."""
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
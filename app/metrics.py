@@ -0,0 +1,259 @@
+"""
+Prometheus metrics in the text exposition format, without a client library.
+
+Pipeline stages observe into the module-level metrics below; GET /metrics renders them
+together with values read from the app state at scrape time (cache counters, queue depth).
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from typing import Iterable
+
+from app import tracing
+
+# Seconds, from a memory cache lookup to synthesis of a long chunk
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+CHUNK_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        try:
+            if len(labels) == len(self.labelnames):
+                return tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            pass
+        raise ValueError(f"{self.name} takes labels {self.labelnames}, got {sorted(labels)}")
+
+    def _sample_lines(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines += self._sample_lines()
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _sample_lines(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+        span: str | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Name (format string over the labels) of the trace span time() records in traced requests
+        self.span = span
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (non-cumulative, the last one is +Inf), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """Observes the duration of the block (also when it raises); a span of it as well in traced requests."""
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _sample_lines(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, ([*counts], total, n)) for key, (counts, total, n) in self._values.items())
+        lines = []
+        names = self.labelnames + ("le",)
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(names, (*key, _format_value(bound)))} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {n}")
+        return lines
+
+
+class _Timer:
+    # A plain class: cheaper than a @contextmanager generator on per-chunk and per-call paths
+    __slots__ = ("_histogram", "_labels", "_t0", "_span")
+
+    def __init__(self, histogram: Histogram, labels: dict) -> None:
+        self._histogram = histogram
+        self._labels = labels
+        self._span = None
+
+    def __enter__(self) -> None:
+        if self._histogram.span is not None and tracing.active():
+            self._span = tracing.span(self._histogram.span.format(**self._labels), **self._labels)
+            self._span.__enter__()
+        self._t0 = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._histogram.observe(time.perf_counter() - self._t0, **self._labels)
+        if self._span is not None:
+            self._span.__exit__(exc_type, exc, tb)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self, extra: Iterable[_Metric] = ()) -> str:
+        """Exposition text of the registered metrics plus extra ones (built at scrape time)."""
+        return "".join(metric.render() for metric in [*self._metrics, *extra])
+
+    def clear(self) -> None:
+        for metric in self._metrics:
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "tts_stage_seconds",
+        "Time spent per pipeline stage (auth, normalize, split, concat).",
+        ("stage",),
+        span="{stage}",
+    )
+)
+INFERENCE_SECONDS = REGISTRY.register(
+    Histogram("tts_inference_seconds", "Model inference time per chunk (cache misses only).", ("engine",), span="inference")
+)
+ENCODE_SECONDS = REGISTRY.register(
+    Histogram("tts_encode_seconds", "Encoding time per response (resampling, speed change and codec).", ("format",), span="encode")
+)
+CACHE_SECONDS = REGISTRY.register(
+    Histogram("tts_cache_seconds", "Cache operation time per tier.", ("op", "tier"), span="cache.{op}")
+)
+REQUEST_SECONDS = REGISTRY.register(
+    Histogram("tts_request_seconds", "Latency of non-streamed speech responses.", ("format", "cache"))
+)
+REQUEST_CHUNKS = REGISTRY.register(
+    Histogram("tts_request_chunks", "Text chunks (and language segments) per synthesized request.", buckets=CHUNK_BUCKETS)
+)
+REALTIME_FACTOR = REGISTRY.register(
+    Histogram("tts_realtime_factor", "Synthesis time divided by the duration of the audio.", buckets=RTF_BUCKETS)
+)
+CHARACTERS = REGISTRY.register(
+    Counter("tts_characters_total", "Characters of normalized text sent to the model.", ("engine",))
+)
+REQUESTS = REGISTRY.register(
+    Counter("tts_requests_total", "Speech requests by response format and cache outcome.", ("format", "cache"))
+)
+
+
+def state_metrics(state) -> list[_Metric]:
+    """Metrics read from the app state at scrape time: cache counters, queue depth, coalescing, startup."""
+    hits = Counter("tts_cache_hits_total", "Cache hits per cache and tier.", ("cache", "tier"))
+    misses = Counter("tts_cache_misses_total", "Cache misses per cache and tier.", ("cache", "tier"))
+    evictions = Counter("tts_cache_evictions_total", "Cache evictions per cache and tier.", ("cache", "tier"))
+    size = Gauge("tts_cache_bytes", "Bytes stored per cache and tier.", ("cache", "tier"))
+    caches = {"responses": state.cache}
+    if getattr(state, "chunk_cache", None) is not None:
+        caches["chunks"] = state.chunk_cache
+    for cache_name, cache in caches.items():
+        for tier, stats in cache.stats().items():
+            hits.inc(stats["hits"], cache=cache_name, tier=tier)
+            misses.inc(stats["misses"], cache=cache_name, tier=tier)
+            evictions.inc(stats["evictions"], cache=cache_name, tier=tier)
+            size.set(stats["bytes"], cache=cache_name, tier=tier)
+
+    queue_depth = Gauge("tts_queue_depth", "Admitted speech requests (running and waiting for a worker).")
+    queue_depth.set(state.executor.depth)
+    queue_capacity = Gauge("tts_queue_capacity", "Admitted requests allowed before HTTP 429.")
+    queue_capacity.set(state.executor.capacity)
+
+    flights = state.singleflight.stats()
+    in_flight = Gauge("tts_singleflight_in_flight", "Distinct computations in flight.")
+    in_flight.set(flights["in_flight"])
+    coalesced = Counter("tts_singleflight_coalesced_total", "Requests that joined an identical computation in flight.")
+    coalesced.inc(flights["coalesced"])
+
+    loaded = Gauge("tts_engine_loaded", "1 when the engine's model is loaded.", ("engine",))
+    load_seconds = Gauge("tts_engine_load_seconds", "Time the engine's model took to load.", ("engine",))
+    for engine_name, status in state.engine_status.items():
+        loaded.set(status["state"] == "loaded", engine=engine_name)
+        if status.get("seconds") is not None:
+            load_seconds.set(status["seconds"], engine=engine_name)
+    metrics = [hits, misses, evictions, size, queue_depth, queue_capacity, in_flight, coalesced, loaded, load_seconds]
+    if state.startup_seconds is not None:
+        startup = Gauge("tts_startup_seconds", "Time from app creation until it was ready.")
+        startup.set(state.startup_seconds)
+        metrics.append(startup)
+    return metrics
@@ -18,18 +18,63 @@ class Settings(BaseSettings):
     silero_pause_between_fragments_sec: float = 0.3  # pause between chunks/segments (sec)
     silero_models_dir: str = "models"  # persistent directory for Silero cache/models (torch.hub)
 
+    inference_workers: int = 1  # concurrent synthesis jobs; keep workers * silero_num_threads <= CPU cores
+    inference_max_queue: int = 16  # requests allowed to wait for a worker; beyond that -> HTTP 429
+    inference_retry_after_sec: int = 1  # Retry-After header value for HTTP 429
+
+    silero_parallel_chunks: int = 1  # chunks/segments of one request synthesized concurrently (1 = sequential)
+    silero_parallel_pool_size: int = 8  # threads shared by all requests for parallel chunk synthesis
+
+    silero_processes: int = 0  # >0: run inference in N worker processes, each with its own model and SILERO_NUM_THREADS
+    silero_process_start_method: str = "spawn"  # multiprocessing start method for worker processes
+
+    silero_batch_max_size: int = 1  # >1 enables micro-batching of concurrent chunks into one apply_tts call
+    silero_batch_wait_ms: float = 5.0  # how long the first chunk waits for others to join its batch
+
     require_auth: bool = False
     api_key: str = "dummy-local-key"
+    api_key_profiles: dict[str, str] = {}  # JSON: extra API keys -> output profile used by their requests
+
+    output_profiles: dict[str, dict] = {}  # JSON: custom output profiles, name -> {sample_rate, channels, bitrate, opus_frame_ms}
 
     cache_dir: str = ".cache_tts"
     cache_max_files: int = 2000
+    cache_max_bytes: int = 0  # total size limit of the disk cache in bytes (0 = unlimited)
+    cache_memory_max_bytes: int = 64 * 1024 * 1024  # in-process LRU tier in front of the disk cache (0 = disabled)
+    cache_chunks: bool = False  # also cache audio of every chunk/segment by normalized text (sub-phrase reuse)
+    cache_chunks_dir: str = ".cache_tts_chunks"  # chunk entries have their own store and limits
+    cache_chunks_max_files: int = 20000
+    cache_chunks_max_bytes: int = 0  # 0 = unlimited
+    cache_chunks_memory_max_bytes: int = 32 * 1024 * 1024
+    cache_persistent: bool = False  # keep the cache across restarts (dropped when model/text pipeline changes)
 
     ffmpeg_bin: str = "ffmpeg"
+    speed_backend: str = "native"  # native = in-process WSOLA time stretch, ffmpeg = atempo filter
+    audio_encoder: str = "auto"  # auto = in-process libsndfile codecs where possible, ffmpeg = always spawn ffmpeg
     ffplay_bin: str = "ffplay.exe"  # Windows ffplay for WSL2 compatibility
     auto_play: bool = True  # auto-play audio on the server side
     auto_play_volume: float = 1.0  # auto-play volume (1.0 = 100%)
 
+    stream_audio: bool = False  # stream audio chunk by chunk when the request does not set "stream"
+
+    batch_max_items: int = 10000  # items accepted by POST /v1/audio/speech/batch
+    batch_concurrency: int = 0  # batch items processed at once (0 = INFERENCE_WORKERS x SILERO_PARALLEL_CHUNKS)
+    batch_output_root: str = ""  # directory batch jobs may write results into (empty = only zip responses)
+
     transliterate_latin: bool = True  # Latin → Cyrillic transliteration for pronouncing English words
+    warmup_enabled: bool = True  # synthesize representative texts at startup; /readyz answers 503 until done
+    warmup_runs: int = 2  # runs of each warmup text (TorchScript optimizes a graph after its first calls)
+    warmup_texts: list[str] = []  # JSON: RU warmup texts (empty = built-in sentences)
+    warmup_speakers: list[str] = []  # JSON: voices to warm up, OpenAI names or Silero speakers (empty = default speaker)
+    warmup_cache_phrases: list[str] = []  # JSON: common phrases synthesized into the response cache at startup
+
+    morph_preload: bool = True  # build the Russian morphology analyzer and agree common nouns at startup
+
+    trace_requests: bool = False  # trace every speech request (else only those with the X-Debug-Trace: 1 header)
+    trace_allow_header: bool = True  # let clients enable tracing of a request with the X-Debug-Trace header
+    trace_export_path: str = ""  # JSONL file of OpenTelemetry (OTLP/JSON) spans of traced requests (empty = off)
+    trace_profile_slowest: int = 0  # keep cProfile dumps of the N slowest traced requests (0 = no profiling)
+    trace_profile_dir: str = "profiles"  # directory of the .prof dumps
 
     language_aware_routing: bool = True
 
@@ -0,0 +1,75 @@
+"""Background startup: models load after the port is bound, then warmup; /healthz and /readyz report progress."""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI
+
+from app.text import morph
+from app.warmup import run_warmup
+
+log = logging.getLogger("silero")
+
+
+def _load(status: dict, load) -> None:
+    status["state"] = "loading"
+    t0 = time.perf_counter()
+    try:
+        load()
+        status["state"] = "loaded"
+    except Exception as e:
+        status["state"] = "failed"
+        status["error"] = str(e)
+        raise
+    finally:
+        status["seconds"] = round(time.perf_counter() - t0, 3)
+
+
+def load_engines(app: FastAPI) -> bool:
+    """
+    Loads the RU and EN models concurrently (and preloads morphology); returns False if the RU model failed.
+
+    The EN model is optional: when it fails to load, EN segments fall back to the RU model.
+    """
+    state = app.state
+    jobs = {"ru": state.engine.load}
+    if state.en_engine is not None:
+        jobs["en"] = state.en_engine.load
+    statuses = {name: state.engine_status.setdefault(name, {}) for name in jobs}
+    if state.settings.morph_preload:
+        # Not a TTS engine: reported apart, so probes and engine metrics only list the models
+        jobs["morph"] = morph.preload
+        statuses["morph"] = state.preload_status.setdefault("morph", {})
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="load") as pool:
+        futures = {name: pool.submit(_load, statuses[name], load) for name, load in jobs.items()}
+    for name, future in futures.items():
+        error = future.exception()
+        if error is None:
+            continue
+        if name == "ru":
+            log.error("Failed to load the RU model: %s", error, exc_info=error)
+            return False
+        log.warning("Failed to load %s, continuing without it: %s", name, error, exc_info=error)
+        if name == "en":
+            state.en_engine = None
+    state.loaded.set()
+    return True
+
+
+def _start(app: FastAPI) -> None:
+    state = app.state
+    if not load_engines(app):
+        return
+    if state.settings.warmup_enabled:
+        run_warmup(app)
+    state.ready.set()
+    state.startup_seconds = round(time.perf_counter() - state.started_at, 3)
+    log.info("Ready in %.2fs", state.startup_seconds)
+
+
+def start_in_background(app: FastAPI) -> threading.Thread:
+    """Runs model loading and warmup in a thread, so the server answers probes while they run."""
+    thread = threading.Thread(target=_start, args=(app,), name="startup", daemon=True)
+    thread.start()
+    return thread
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 import re
 
+from app.text.segment import split_trailing_opening
+
 CYRILLIC_RE = re.compile(r"[А-Яа-яЁё]")
 LATIN_RE = re.compile(r"[A-Za-z]")
 TOKEN_RE = re.compile(r"[A-Za-z]+|[А-Яа-яЁё]+|[^A-Za-zА-Яа-яЁё]+")
@@ -48,12 +50,14 @@ class LanguageAwareRouter:
                 current_parts.append(token)
                 continue
 
-            segment_text = "".join(current_parts).strip()
+            # Opening quotes and brackets before the switch belong to the new segment: «Hello»
+            segment_text, opening = split_trailing_opening("".join(current_parts).rstrip())
+            segment_text = segment_text.strip()
             if segment_text:
                 segments.append(TextSegment(text=segment_text, lang=current_lang))
 
             current_lang = token_lang
-            current_parts = [token]
+            current_parts = [opening, token]
 
         segment_text = "".join(current_parts).strip()
         if segment_text:
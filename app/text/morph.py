@@ -1,21 +1,70 @@
-import pymorphy3
+import threading
+from functools import lru_cache
 
-_morph = pymorphy3.MorphAnalyzer(lang="ru")
+# Built on first use: constructing it loads the dictionaries (slow imports, slow test collection)
+_morph = None
+_morph_lock = threading.Lock()
 
+# Count nouns that keep recurring in numbers ("5 рублей", "3 дня"); agreement for them can be preloaded
+FREQUENT_NOUNS = (
+    "рубль", "копейка", "доллар", "евро", "процент", "штука", "человек", "раз", "год", "месяц", "неделя",
+    "день", "сутки", "час", "минута", "секунда", "километр", "метр", "сантиметр", "миллиметр", "килограмм",
+    "грамм", "тонна", "литр", "градус", "страница", "пункт", "позиция", "товар", "заказ", "балл", "место",
+    "этаж", "комната", "квартира", "дом", "книга", "вопрос", "ответ", "сообщение", "файл", "строка",
+)
+# Representatives of the three numeral agreement classes: "1 рубль", "2 рубля", "5 рублей"
+_CLASS_NUMBERS = (1, 2, 5)
+
+
+def _analyzer():
+    global _morph
+    if _morph is None:
+        with _morph_lock:
+            if _morph is None:
+                import pymorphy3
+
+                _morph = pymorphy3.MorphAnalyzer(lang="ru")
+    return _morph
+
+
+@lru_cache(maxsize=16384)
 def _best_noun_parse(word: str):
-    parses = _morph.parse(word)
+    parses = _analyzer().parse(word)
     for p in parses:
         if p.tag.POS == "NOUN":
             return p
     return parses[0] if parses else None
 
-def agree_word_with_number(word: str, n: int) -> str:
+
+def _agreement_class(n: int) -> int:
+    """Numeral agreement depends on n only through this class (same rule as pymorphy3)."""
+    if n % 10 == 1 and n % 100 != 11:
+        return 0
+    if 2 <= n % 10 <= 4 and not 10 <= n % 100 < 20:
+        return 1
+    return 2
+
+
+@lru_cache(maxsize=16384)
+def _agree(word: str, agreement_class: int) -> str:
     p = _best_noun_parse(word)
     if p is None:
         return word
-    agreed = p.make_agree_with_number(n)
+    agreed = p.make_agree_with_number(_CLASS_NUMBERS[agreement_class])
     return agreed.word if agreed else word
 
+
+def agree_word_with_number(word: str, n: int) -> str:
+    return _agree(word, _agreement_class(n))
+
+
+def preload(nouns=FREQUENT_NOUNS) -> None:
+    """Builds the analyzer and fills the agreement cache for nouns, so first requests skip both."""
+    for noun in nouns:
+        for agreement_class in range(len(_CLASS_NUMBERS)):
+            _agree(noun, agreement_class)
+
+
 def match_case(template: str, word: str) -> str:
     if template.isupper():
         return word.upper()
@@ -1,4 +1,6 @@
 import re
+from functools import lru_cache
+
 from num2words import num2words
 from app.text.morph import agree_word_with_number, match_case
 
@@ -7,60 +9,66 @@ PERCENT_RE = re.compile(r"(?<!\w)(\d{1,18})\s*%(?!\w)")
 RUBLE_RE = re.compile(r"(?<!\w)(\d{1,18})\s*(₽|руб\.?|рубля|рублей|рубль)(?!\w)", re.IGNORECASE)
 STANDALONE_INT_RE = re.compile(r"(?<!\d\.)\b(\d{1,18})\b(?![.:]\d)")
 
+# NUM_NOUN_RE, PERCENT_RE and RUBLE_RE in one pass. Their matches never overlap, and at one
+# position the alternatives are tried in the order the separate passes used to run.
+COUNTED_RE = re.compile(
+    r"(?<!\w)(?P<num>\d{1,18})\s+(?P<noun>[А-Яа-яЁё]+)(?!\w)"
+    r"|(?<!\w)(?P<percent>\d{1,18})\s*%(?!\w)"
+    r"|(?<!\w)(?P<ruble>\d{1,18})\s*(?i:₽|руб\.?|рубля|рублей|рубль)(?!\w)"
+)
+
+# Token results are pure functions of the token: repeated numbers and nouns skip num2words/pymorphy
+_TOKEN_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def _num_to_words_ru(n: int) -> str:
     return num2words(n, lang="ru").replace("-", " ")
 
-def expand_numbers(text: str) -> str:
-    def repl_num_noun(m: re.Match) -> str:
-        n = int(m.group(1))
-        noun = m.group(2)
-        noun2 = agree_word_with_number(noun.lower(), n)
-        noun2 = match_case(noun, noun2)
-        return f"{_num_to_words_ru(n)} {noun2}"
 
-    text = NUM_NOUN_RE.sub(repl_num_noun, text)
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
+def _counted_words(n: int, noun: str) -> str:
+    """"5 яблоко" -> "пять яблок" (noun agreed with the number, case of the original kept)."""
+    noun2 = match_case(noun, agree_word_with_number(noun.lower(), n))
+    return f"{_num_to_words_ru(n)} {noun2}"
 
-    def repl_percent(m: re.Match) -> str:
-        n = int(m.group(1))
-        noun2 = agree_word_with_number("процент", n)
-        return f"{_num_to_words_ru(n)} {noun2}"
 
-    text = PERCENT_RE.sub(repl_percent, text)
+def _repl_counted(m: re.Match) -> str:
+    if m.group("num") is not None:
+        return _counted_words(int(m.group("num")), m.group("noun"))
+    if m.group("percent") is not None:
+        return _counted_words(int(m.group("percent")), "процент")
+    return _counted_words(int(m.group("ruble")), "рубль")
 
-    def repl_ruble(m: re.Match) -> str:
-        n = int(m.group(1))
-        noun2 = agree_word_with_number("рубль", n)
-        return f"{_num_to_words_ru(n)} {noun2}"
 
-    text = RUBLE_RE.sub(repl_ruble, text)
+def _repl_standalone(m: re.Match) -> str:
+    return _num_to_words_ru(int(m.group(1)))
 
-    def repl_standalone(m: re.Match) -> str:
-        n = int(m.group(1))
-        return _num_to_words_ru(n)
 
-    text = STANDALONE_INT_RE.sub(repl_standalone, text)
-    return text
+def expand_numbers(text: str) -> str:
+    # Counted numbers first: the standalone pass must see their digits already replaced
+    text = COUNTED_RE.sub(_repl_counted, text)
+    return STANDALONE_INT_RE.sub(_repl_standalone, text)
 
 
 # English: standalone numbers and #N
 HASH_NUM_RE = re.compile(r"#(\d{1,18})\b")
 
 
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def _num_to_words_en(n: int) -> str:
     return num2words(n, lang="en").replace("-", " ")
 
 
-def expand_numbers_en(text: str) -> str:
-    """Expands numbers in English text: 1 → one, #1 → number one."""
-    def repl_hash(m: re.Match) -> str:
-        n = int(m.group(1))
-        return f"number {_num_to_words_en(n)}"
+def _repl_hash(m: re.Match) -> str:
+    return f"number {_num_to_words_en(int(m.group(1)))}"
+
 
-    text = HASH_NUM_RE.sub(repl_hash, text)
+def _repl_standalone_en(m: re.Match) -> str:
+    return _num_to_words_en(int(m.group(1)))
 
-    def repl_standalone_en(m: re.Match) -> str:
-        n = int(m.group(1))
-        return _num_to_words_en(n)
 
-    text = STANDALONE_INT_RE.sub(repl_standalone_en, text)
-    return text
+def expand_numbers_en(text: str) -> str:
+    """Expands numbers in English text: 1 → one, #1 → number one."""
+    text = HASH_NUM_RE.sub(_repl_hash, text)
+    return STANDALONE_INT_RE.sub(_repl_standalone_en, text)
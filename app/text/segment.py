@@ -0,0 +1,157 @@
+"""
+Sentence segmentation and balanced chunking of text for synthesis.
+
+Chunks end at natural pause points: sentence ends first, then clause punctuation, then
+spaces; a word is cut only when it alone exceeds the limit. Among the cuts that keep every
+chunk within the limit, chunk_text picks the one with the most even chunk lengths, since
+inference cost grows faster than the chunk length and parallel chunks finish with the
+longest one.
+"""
+from __future__ import annotations
+
+import math
+import re
+
+# Closing quotes and brackets stay with the sentence they end; opening ones start the next text
+CLOSING_PUNCTUATION = "\"'»”’)]"
+OPENING_PUNCTUATION = "\"'«„“‘(["
+
+# A run of terminal punctuation with its closing quotes, followed by whitespace or the end; or a line break
+_BOUNDARY_RE = re.compile(r"[.!?…]+[" + re.escape(CLOSING_PUNCTUATION) + r"]*(?=\s|$)|\n")
+# Clause punctuation followed by a space, and a space before a dash
+_CLAUSE_RE = re.compile(r"(?<=[,;:])\s+|\s+(?=[—–-]\s)")
+
+# Abbreviations after which a period does not end the sentence even before a capital letter
+# ("ул. Ленина", "Mr. Smith"); "т.е.", "etc." and the like end one when a capital letter follows
+NO_BREAK_ABBREVIATIONS = frozenset(
+    {
+        "г", "гг", "ул", "пр", "пер", "просп", "д", "кв", "им", "св", "проф", "акад", "доц", "ген",
+        "рис", "табл", "гл", "стр", "см", "ср", "т", "тт",
+        "mr", "mrs", "ms", "dr", "prof", "st", "vs", "fig", "jr", "sr",
+    }
+)
+# Longest word looked at behind a period: bounds the work per boundary
+_MAX_ABBREVIATION_LOOKBACK = 8
+
+# Preference of the cut a chunk ends at, as a cost added to its squared relative deviation from the target
+_SENTENCE, _CLAUSE, _WORD, _HARD = 0, 1, 2, 3
+_CUT_PENALTY = (0.0, 0.25, 1.0, 4.0)
+
+
+def _word_before(text: str, end: int) -> str:
+    start = end
+    limit = max(0, end - _MAX_ABBREVIATION_LOOKBACK - 1)
+    while start > limit and not text[start - 1].isspace():
+        start -= 1
+    return text[start:end].lstrip(OPENING_PUNCTUATION)
+
+
+def _is_sentence_end(text: str, match: re.Match) -> bool:
+    if match.group() == "\n":
+        return True
+    # First letter of the next sentence, past a dialogue dash
+    nxt = match.end()
+    while nxt < len(text) and (text[nxt].isspace() or text[nxt] in "—–"):
+        nxt += 1
+    if nxt == len(text):
+        return True
+    # "т.е. это", "Ну... ладно", "— Что?! — спросил он": the sentence goes on
+    if text[nxt].islower():
+        return False
+    if match.group() != ".":
+        return True
+    word = _word_before(text, match.start())
+    # Initials: "А. С. Пушкин"
+    if len(word) == 1 and word.isupper():
+        return False
+    return word.lower() not in NO_BREAK_ABBREVIATIONS
+
+
+def split_sentences(text: str) -> list[str]:
+    """Splits text into sentences (line breaks end one as well); one pass over the text."""
+    sentences = []
+    start = 0
+    for match in _BOUNDARY_RE.finditer(text):
+        if not _is_sentence_end(text, match):
+            continue
+        sentence = text[start : match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def split_trailing_opening(text: str) -> tuple[str, str]:
+    """Splits off the opening quotes and brackets text ends with: ("Он сказал ", "«")."""
+    end = len(text)
+    while end > 0 and text[end - 1] in OPENING_PUNCTUATION:
+        end -= 1
+    return text[:end], text[end:]
+
+
+def _pieces(sentence: str, max_chars: int) -> list[tuple[str, int]]:
+    """Parts of a sentence no longer than max_chars, each with the kind of cut after it."""
+    if len(sentence) <= max_chars:
+        return [(sentence, _SENTENCE)]
+    pieces = []
+    for clause in _CLAUSE_RE.split(sentence):
+        if len(clause) <= max_chars:
+            pieces.append((clause, _CLAUSE))
+            continue
+        for word in clause.split():
+            if len(word) <= max_chars:
+                pieces.append((word, _WORD))
+            else:
+                # Even slices rather than max_chars and a remainder
+                size = math.ceil(len(word) / math.ceil(len(word) / max_chars))
+                pieces += [(word[i : i + size], _HARD) for i in range(0, len(word), size)]
+    pieces[-1] = (pieces[-1][0], _SENTENCE)
+    return pieces
+
+
+def chunk_text(text: str, max_chars: int) -> list[str]:
+    """
+    Splits text into chunks of at most max_chars with balanced lengths.
+
+    Text within the limit is one chunk. Longer text is cut into sentences (clauses and words
+    only when a sentence is too long), which are then grouped into chunks of about equal length
+    close to total / ceil(total / max_chars), preferring sentence ends. The grouping is a
+    dynamic program over the pieces that fit into one chunk, linear in the text length.
+    """
+    max_chars = max(1, int(max_chars))
+    text = (text or "").strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    pieces = [piece for sentence in split_sentences(text) for piece in _pieces(sentence, max_chars)]
+    # offsets[i]: length of pieces[:i] joined by single spaces, plus one
+    offsets = [0]
+    for piece, _ in pieces:
+        offsets.append(offsets[-1] + len(piece) + 1)
+    n = len(pieces)
+    total = offsets[n] - 1
+    target = total / math.ceil(total / max_chars)
+
+    # best[j]: (cost, start of the last chunk) of the best grouping of pieces[:j]
+    best: list[tuple[float, int]] = [(0.0, 0)] + [(math.inf, 0)] * n
+    for j in range(1, n + 1):
+        penalty = _CUT_PENALTY[pieces[j - 1][1]] if j < n else 0.0
+        for i in range(j - 1, -1, -1):
+            length = offsets[j] - offsets[i] - 1
+            if length > max_chars:
+                break
+            cost = best[i][0] + ((length - target) / target) ** 2 + penalty
+            if cost < best[j][0]:
+                best[j] = (cost, i)
+
+    chunks = []
+    j = n
+    while j > 0:
+        i = best[j][1]
+        chunks.append(" ".join(piece for piece, _ in pieces[i:j]))
+        j = i
+    chunks.reverse()
+    return chunks
@@ -1,5 +1,6 @@
 """Latin-to-Cyrillic transliteration to pronounce English words with Russian TTS (Silero)."""
 import re
+from functools import lru_cache
 
 # Latin → Cyrillic (Russian-style pronunciation: hello → "khello" style)
 _LATIN_TO_CYRILLIC = str.maketrans(
@@ -22,21 +23,26 @@ _LATIN_DIGRAPHS = [
 ]
 
 
+# Latin words: sequences of Latin letters (a-zA-Z)
+LATIN_WORD_RE = re.compile(r"[a-zA-Z]+")
+
+
+@lru_cache(maxsize=8192)
 def _transliterate_word(word: str) -> str:
-    """Converts one token (Latin letters only) to Cyrillic."""
+    """Converts one token (Latin letters only) to Cyrillic (cached: the same words keep recurring)."""
     s = word.replace("x", "кс").replace("X", "Кс")
     for lat, cyr in _LATIN_DIGRAPHS:
         s = s.replace(lat, cyr)
     return s.translate(_LATIN_TO_CYRILLIC)
 
 
+def _repl_latin_word(m: re.Match) -> str:
+    return _transliterate_word(m.group(0))
+
+
 def transliterate_latin_to_cyrillic(text: str) -> str:
     """
     Replaces words made of Latin letters with Cyrillic transliteration.
     The rest of the text (Cyrillic, digits, punctuation) remains unchanged.
     """
-    # Tokens: sequences of Latin letters (a-zA-Z)
-    def repl(m: re.Match) -> str:
-        return _transliterate_word(m.group(0))
-
-    return re.sub(r"[a-zA-Z]+", repl, text)
+    return LATIN_WORD_RE.sub(_repl_latin_word, text)
@@ -0,0 +1,230 @@
+"""
+Opt-in request tracing: timing spans, a Server-Timing header, JSONL span export and cProfile
+dumps of the slowest requests.
+
+A traced request carries its Trace in a context variable; the inference executor and the
+fan-out pool copy the context into their threads, so chunk spans land in the same trace.
+With no trace active, span() returns a shared no-op context manager.
+"""
+from __future__ import annotations
+
+import cProfile
+import heapq
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+log = logging.getLogger("silero")
+
+T = TypeVar("T")
+
+_trace: ContextVar["Trace | None"] = ContextVar("tts_trace", default=None)
+_parent: ContextVar[str | None] = ContextVar("tts_span", default=None)
+# Set while a thread runs under cProfile: a nested profiled() call must not replace that profiler
+_profiling = threading.local()
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_otlp(self, trace_id: str) -> dict:
+        """OpenTelemetry (OTLP/JSON) span fields."""
+        otlp = {
+            "traceId": trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+        }
+        if self.parent_id is not None:
+            otlp["parentSpanId"] = self.parent_id
+        return otlp
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Trace:
+    """Spans of one request (appended from any thread) and its merged cProfile stats."""
+
+    def __init__(self, profile: bool = False) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self.profile = profile
+        self.stats: pstats.Stats | None = None
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def add_profile(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            if self.stats is None:
+                self.stats = pstats.Stats(profiler)
+            else:
+                self.stats.add(profiler)
+
+    @property
+    def duration_ms(self) -> float:
+        """First span start to last span end: covers a streamed body that outlives the handler's span."""
+        if not self.spans:
+            return 0.0
+        return (max(s.end_ns for s in self.spans) - min(s.start_ns for s in self.spans)) / 1e6
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: total time per span name (parallel chunks add up)."""
+        totals: dict[str, float] = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in totals.items())
+
+
+class _SpanContext:
+    __slots__ = ("_trace", "_span", "_token")
+
+    def __init__(self, trace: Trace, name: str, attributes: dict) -> None:
+        self._trace = trace
+        self._span = Span(name, os.urandom(8).hex(), _parent.get(), 0, attributes=attributes)
+
+    def __enter__(self) -> Span:
+        self._token = _parent.set(self._span.span_id)
+        self._span.start_ns = time.time_ns()
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._span.end_ns = time.time_ns()
+        if exc_type is not None:
+            self._span.attributes["error"] = exc_type.__name__
+        _parent.reset(self._token)
+        self._trace.add(self._span)
+
+
+class _NoSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **attributes):
+    """Times the block as a span of the current trace (no-op when the request is not traced)."""
+    trace = _trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _SpanContext(trace, name, attributes)
+
+
+def active() -> bool:
+    return _trace.get() is not None
+
+
+def profiled(fn: Callable[..., T], *args: Any) -> T:
+    """Runs fn(*args), under cProfile when the current trace is profiled (cProfile only sees this thread)."""
+    trace = _trace.get()
+    if trace is None or not trace.profile or getattr(_profiling, "active", False):
+        return fn(*args)
+    profiler = cProfile.Profile()
+    _profiling.active = True
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        _profiling.active = False
+        trace.add_profile(profiler)
+
+
+class Tracer:
+    """
+    Decides which requests are traced and where finished traces go.
+
+    export_path: JSONL file, one OTLP/JSON span per line (a stand-in for a collector).
+    profile_slowest: keep cProfile dumps of the N slowest traced requests in profile_dir.
+    """
+
+    HEADER = "x-debug-trace"
+
+    def __init__(
+        self,
+        trace_all: bool = False,
+        allow_header: bool = True,
+        export_path: str = "",
+        profile_slowest: int = 0,
+        profile_dir: str = "profiles",
+    ) -> None:
+        self.trace_all = trace_all
+        self.allow_header = allow_header
+        self.export_path = Path(export_path) if export_path else None
+        self.profile_slowest = max(0, int(profile_slowest))
+        self.profile_dir = Path(profile_dir)
+        self._lock = threading.Lock()
+        # Min-heap of (duration_ms, path) of the kept profile dumps
+        self._slowest: list[tuple[float, str]] = []
+
+    def wants(self, headers) -> bool:
+        if self.trace_all:
+            return True
+        return self.allow_header and headers.get(self.HEADER, "").lower() in ("1", "true", "yes")
+
+    def begin(self, headers) -> Trace | None:
+        """Starts a trace for this request's context when it is enabled for it."""
+        if not self.wants(headers):
+            return None
+        trace = Trace(profile=self.profile_slowest > 0)
+        _trace.set(trace)
+        return trace
+
+    def finish(self, trace: Trace) -> None:
+        """Exports the spans and keeps the profile if the request is among the slowest."""
+        try:
+            if self.export_path is not None:
+                lines = "".join(json.dumps(s.to_otlp(trace.trace_id)) + "\n" for s in trace.spans)
+                with self._lock:
+                    self.export_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.export_path, "a", encoding="utf-8") as f:
+                        f.write(lines)
+            if trace.stats is not None:
+                self._keep_profile(trace)
+        except OSError as e:
+            log.warning("Could not export trace %s: %s", trace.trace_id, e)
+
+    def _keep_profile(self, trace: Trace) -> None:
+        duration = trace.duration_ms
+        with self._lock:
+            if len(self._slowest) >= self.profile_slowest and duration <= self._slowest[0][0]:
+                return
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            path = self.profile_dir / f"{duration:010.1f}ms_{trace.trace_id}.prof"
+            trace.stats.dump_stats(path)
+            heapq.heappush(self._slowest, (duration, str(path)))
+            if len(self._slowest) > self.profile_slowest:
+                _, evicted = heapq.heappop(self._slowest)
+                Path(evicted).unlink(missing_ok=True)
@@ -0,0 +1,69 @@
+"""Dynamic micro-batching of concurrent synthesis calls."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.items: list[Any] = []
+        self.results: list[Any] | None = None
+        self.error: BaseException | None = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-item calls with the same key into one batched call.
+
+    The first caller of a batch becomes its leader: it waits up to max_wait_ms for other
+    callers (or until max_batch_size items are collected), runs batch_fn(key, items) once
+    in its own thread and hands every caller its result. No background thread is needed.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[Hashable, list[Any]], list[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_sec = max(0.0, float(max_wait_ms)) / 1000.0
+        self._lock = threading.Lock()
+        self._open: dict[Hashable, _Batch] = {}
+
+    def submit(self, key: Hashable, item: Any) -> Any:
+        """Adds item to the open batch for key and blocks until its result is ready."""
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._open[key] = batch
+            index = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.max_batch_size:
+                # Close the batch: new callers start the next one
+                del self._open[key]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.max_wait_sec)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            try:
+                batch.results = self.batch_fn(key, batch.items)
+            except BaseException as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[index]
@@ -1,16 +1,46 @@
-import io
+import contextlib
+import hashlib
 import logging
 import os
+import threading
 from pathlib import Path
+from typing import Iterator
 
 import numpy as np
-import soundfile as sf
+
+from app import tracing
+from app.audio.buffer import AudioBuffer
+from app.audio.concat import with_pauses
+from app.metrics import CHARACTERS, INFERENCE_SECONDS
+from app.text.segment import chunk_text
+from app.tts.batching import MicroBatcher
+from app.tts.parallel import FanoutPool
 
 log = logging.getLogger("silero")
 
+# The RU and EN models load concurrently; the first download of the hub repo must not run twice at once
+_HUB_REPO = "snakers4/silero-models"
+_hub_download_lock = threading.Lock()
+
+# Sample rates Silero models synthesize at natively
+SILERO_SAMPLE_RATES = (8000, 24000, 48000)
+
+
+def synthesis_rate(max_rate: int, out_rate: int | None) -> int:
+    """
+    Cheapest Silero rate that still covers out_rate, never above the configured max_rate.
+
+    Inference cost grows with the rate, so 8 kHz telephony output is synthesized at 8 kHz and
+    16 kHz output at 24 kHz instead of downsampling 48 kHz audio.
+    """
+    if out_rate is None:
+        return max_rate
+    candidates = [rate for rate in SILERO_SAMPLE_RATES if out_rate <= rate <= max_rate]
+    return min(candidates) if candidates else max_rate
+
 
 class SileroTTSEngine:
-    def __init__(self, language: str, model_id: str, device: str, sample_rate: int, default_speaker: str, num_threads: int = 0, max_chars_per_chunk: int = 500, chunk_pause_sec: float = 0.0, models_dir: str = "models"):
+    def __init__(self, language: str, model_id: str, device: str, sample_rate: int, default_speaker: str, num_threads: int = 0, max_chars_per_chunk: int = 500, chunk_pause_sec: float = 0.0, models_dir: str = "models", batch_max_size: int = 1, batch_wait_ms: float = 5.0, fanout: FanoutPool | None = None, chunk_cache=None):
         self.language = language
         self.model_id = model_id
         self.device_mode = (device or "auto").lower()  # auto|cpu|cuda
@@ -20,6 +50,8 @@ class SileroTTSEngine:
         self.max_chars_per_chunk = max(1, int(max_chars_per_chunk))
         self.chunk_pause_sec = max(0.0, float(chunk_pause_sec))
         self.models_dir = Path(models_dir).expanduser()
+        self.fanout = fanout
+        self.chunk_cache = chunk_cache  # any cache with get(key) -> bytes | None and put(key, bytes)
 
         self._torch = None
         self.device = None
@@ -28,6 +60,18 @@ class SileroTTSEngine:
         self._symbols = None
         self._apply_tts = None
 
+        # Micro-batching of chunks from concurrent requests (same speaker and rate); set up by load()
+        self.batch_max_size = int(batch_max_size)
+        self.batch_wait_ms = float(batch_wait_ms)
+        self._batcher = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None and self._torch is not None
+
+    def close(self) -> None:
+        """Releases engine resources (nothing to do for the in-process model)."""
+
     def _resolve_device(self):
         torch = self._torch
         if self.device_mode == "cpu":
@@ -75,13 +119,15 @@ class SileroTTSEngine:
 
         log.info("Silero model cache directory: %s", self.models_dir.resolve())
 
+        repo_dir = Path(torch.hub.get_dir()) / f"{_HUB_REPO.replace('/', '_')}_master"
         # One hub.load call: repo may return 5 values (new API) or 2 (old API)
-        result = torch.hub.load(
-            repo_or_dir="snakers4/silero-models",
-            model="silero_tts",
-            language=self.language,
-            speaker=self.model_id,
-        )
+        with contextlib.nullcontext() if repo_dir.is_dir() else _hub_download_lock:
+            result = torch.hub.load(
+                repo_or_dir=_HUB_REPO,
+                model="silero_tts",
+                language=self.language,
+                speaker=self.model_id,
+            )
         if len(result) == 5:
             model, symbols, _sr, _example_text, apply_tts = result
             # Some torch hub model `.to()` implementations work in-place
@@ -98,93 +144,151 @@ class SileroTTSEngine:
             self._apply_tts = None
             self._symbols = None
             log.info("Silero loaded (model.apply_tts API).")
+        self._init_batcher()
+
+    def _init_batcher(self) -> None:
+        """
+        Enables micro-batching when it is configured and the model API takes a list of texts.
 
-    @staticmethod
-    def _split_long_text(text: str, max_chars: int) -> list[str]:
-        """Splits long text into chunks no longer than max_chars, by sentence or word boundaries."""
-        text = (text or "").strip()
-        if not text or len(text) <= max_chars:
-            return [text] if text else []
-
-        chunks = []
-        while text:
-            if len(text) <= max_chars:
-                chunks.append(text.strip())
-                break
-            # Search boundary only within first max_chars (not max_chars+1) so chunk does not exceed the limit
-            piece = text[:max_chars]
-            last_sent = max(
-                piece.rfind("."), piece.rfind("!"), piece.rfind("?"), piece.rfind("\n")
+        model.apply_tts takes one text, so a "batch" would run its chunks one after another
+        on the leader thread: slower than letting the callers run concurrently.
+        """
+        if self.batch_max_size <= 1:
+            return
+        if self._apply_tts is None:
+            log.warning(
+                "SILERO_BATCH_MAX_SIZE=%s ignored: %s uses the single-text model.apply_tts API",
+                self.batch_max_size, self.model_id,
             )
-            if last_sent >= 0:
-                chunk = text[: last_sent + 1].strip()
-                text = text[last_sent + 1 :].lstrip()
-            else:
-                last_space = piece.rfind(" ")
-                if last_space >= 0:
-                    chunk = text[: last_space + 1].strip()
-                    text = text[last_space + 1 :].lstrip()
-                else:
-                    chunk = text[:max_chars].strip()
-                    text = text[max_chars:].lstrip()
-            if chunk:
-                # Edge-case safeguard: do not pass chunks longer than the limit
-                if len(chunk) > max_chars:
-                    chunk = chunk[:max_chars].rstrip()
-                if chunk:
-                    chunks.append(chunk)
-        return chunks
+            return
+        self._batcher = MicroBatcher(
+            lambda key, texts: self._synthesize_batch(texts, *key),
+            max_batch_size=self.batch_max_size,
+            max_wait_ms=self.batch_wait_ms,
+        )
 
-    def _synthesize_chunk(self, text: str, speaker: str) -> np.ndarray:
-        """Synthesizes one text fragment and returns a float32 mono array."""
+    def _synthesize_batch(self, texts: list[str], speaker: str, sample_rate: int | None = None) -> list[np.ndarray]:
+        """Synthesizes several text fragments in one inference call; returns float32 mono arrays."""
+        sample_rate = sample_rate or self.sample_rate
         torch = self._torch
         with torch.inference_mode():
             if self._apply_tts is not None:
-                audio = self._apply_tts(
-                    texts=[text],
+                audios = self._apply_tts(
+                    texts=texts,
                     model=self._model,
-                    sample_rate=self.sample_rate,
+                    sample_rate=sample_rate,
                     symbols=self._symbols,
                     device=self.device,
-                )[0]
-                return audio.detach().cpu().numpy().astype(np.float32)
-            return (
+                )
+                return [audio.detach().cpu().numpy().astype(np.float32) for audio in audios]
+            # model.apply_tts takes a single text (micro-batching is not enabled for this API)
+            return [
                 self._model.apply_tts(
                     text=text,
                     speaker=speaker,
-                    sample_rate=self.sample_rate,
+                    sample_rate=sample_rate,
                 )
                 .detach()
                 .cpu()
                 .numpy()
                 .astype(np.float32)
-            )
+                for text in texts
+            ]
 
-    def synthesize_wav_bytes(self, text: str, speaker: str | None = None) -> bytes:
-        if self._model is None or self._torch is None:
-            raise RuntimeError("Silero model is not loaded")
+    def _chunk_key(self, text: str, speaker: str, sample_rate: int) -> str:
+        key_src = f"chunk|{self.language}/{self.model_id}|voice={speaker}|sr={sample_rate}|text={text}"
+        return hashlib.sha256(key_src.encode("utf-8")).hexdigest()
 
-        spk = speaker or self.default_speaker
-        chunks = self._split_long_text(text, self.max_chars_per_chunk)
+    def _synthesize_chunk(self, text: str, speaker: str, sample_rate: int | None = None) -> np.ndarray:
+        """
+        Synthesizes one text fragment and returns a float32 mono array (micro-batched when enabled).
+
+        With a chunk cache, audio of every chunk is cached by its normalized text, so texts that
+        share sentences only pay inference for the new chunks.
+        """
+        sample_rate = sample_rate or self.sample_rate
+        with tracing.span("chunk", engine=self.language, chars=len(text)):
+            key = None
+            if self.chunk_cache is not None:
+                key = self._chunk_key(text, speaker, sample_rate)
+                cached = self.chunk_cache.get(key)
+                if cached is not None:
+                    return np.frombuffer(cached, dtype=np.float32)
+
+            with INFERENCE_SECONDS.time(engine=self.language):
+                if self._batcher is not None:
+                    audio = self._batcher.submit((speaker, sample_rate), text)
+                else:
+                    audio = self._synthesize_batch([text], speaker, sample_rate)[0]
+            CHARACTERS.inc(len(text), engine=self.language)
+
+            if key is not None:
+                self.chunk_cache.put(key, np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+            return audio
+
+    def split_text(self, text: str) -> list[str]:
+        """Splits text into the chunks that are synthesized independently (sentence-aligned, balanced lengths)."""
+        chunks = chunk_text(text, self.max_chars_per_chunk)
         if not chunks:
             # Empty text -> minimal silence
             chunks = [" "]
 
         if len(chunks) > 1:
             log.debug("Silero long text split into %s chunks", len(chunks))
+        return chunks
+
+    def synthesize_chunk(self, text: str, speaker: str | None = None, sample_rate: int | None = None) -> np.ndarray:
+        """Synthesizes one chunk (see split_text) and returns a float32 mono array."""
+        if not self.is_loaded:
+            raise RuntimeError("Silero model is not loaded")
+        return self._synthesize_chunk(text, speaker or self.default_speaker, sample_rate)
+
+    def iter_audio(
+        self, text: str, speaker: str | None = None, parallel: bool = True, sample_rate: int | None = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Synthesizes text chunk by chunk and yields float32 mono arrays (pauses between chunks included).
 
-        parts = [self._synthesize_chunk(chunk, spk) for chunk in chunks]
-        if len(parts) > 1 and self.chunk_pause_sec > 0:
-            silence = np.zeros(int(self.sample_rate * self.chunk_pause_sec), dtype=np.float32)
-            audio_parts = []
-            for i, p in enumerate(parts):
-                audio_parts.append(p)
-                if i < len(parts) - 1:
-                    audio_parts.append(silence)
-            audio_np = np.concatenate(audio_parts, axis=0)
+        With a fan-out pool and parallel=True, chunks are synthesized concurrently and yielded in order.
+        sample_rate selects a lower native Silero rate (see synthesis_rate); default: the configured one.
+        """
+        return self.iter_chunks(self.split_text(text), speaker, parallel, sample_rate)
+
+    def iter_chunks(
+        self, chunks: list[str], speaker: str | None = None, parallel: bool = True, sample_rate: int | None = None
+    ) -> Iterator[np.ndarray]:
+        """iter_audio for text already split by split_text."""
+        if not self.is_loaded:
+            raise RuntimeError("Silero model is not loaded")
+
+        spk = speaker or self.default_speaker
+        sr = sample_rate or self.sample_rate
+        if parallel and self.fanout is not None:
+            parts = self.fanout.map_ordered(lambda chunk: self._synthesize_chunk(chunk, spk, sr), chunks)
         else:
-            audio_np = np.concatenate(parts, axis=0)
+            parts = (self._synthesize_chunk(chunk, spk, sr) for chunk in chunks)
+        yield from with_pauses(parts, sr, self.chunk_pause_sec)
+
+    def synthesize(self, text: str, speaker: str | None = None, sample_rate: int | None = None) -> AudioBuffer:
+        """Synthesizes the whole text into one float32 buffer (no WAV round trip)."""
+        sr = sample_rate or self.sample_rate
+        return AudioBuffer.concat(self.iter_audio(text, speaker, sample_rate=sr), sr)
 
-        buf = io.BytesIO()
-        sf.write(buf, audio_np, self.sample_rate, format="WAV", subtype="PCM_16")
-        return buf.getvalue()
+    def synthesize_wav_bytes(self, text: str, speaker: str | None = None) -> bytes:
+        return self.synthesize(text, speaker).to_wav()
+
+    def warm_up(self, texts: list[str], speakers: list[str], sample_rates: list[int], runs: int = 2) -> None:
+        """
+        Runs every chunk of texts through the model for each speaker and rate, runs times.
+
+        The first calls pay for lazy Torch initialization, allocator growth and TorchScript
+        profiling runs; the chunk cache and the micro-batcher are bypassed so each run reaches the model.
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Silero model is not loaded")
+        chunks = [chunk for text in texts for chunk in self.split_text(text)]
+        for sample_rate in sample_rates:
+            for speaker in speakers:
+                for _ in range(runs):
+                    for chunk in chunks:
+                        self._synthesize_batch([chunk], speaker, sample_rate)
@@ -0,0 +1,96 @@
+"""Bounded inference executor: dedicated worker threads for synthesis with back-pressure."""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class QueueFullError(RuntimeError):
+    """Raised when all workers are busy and the waiting queue is full."""
+
+
+class InferenceSlot:
+    """Admission of one request; released exactly once (when the response is done)."""
+
+    def __init__(self, executor: "InferenceExecutor") -> None:
+        self._executor = executor
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._executor._release()
+
+    def __enter__(self) -> "InferenceSlot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class InferenceExecutor:
+    """
+    Runs synthesis jobs on a fixed number of worker threads.
+
+    At most `workers` requests are synthesized concurrently and at most `max_queue` more
+    may wait; beyond that admit() raises QueueFullError so the API can answer 429
+    instead of piling up requests (and torch threads).
+    """
+
+    def __init__(self, workers: int = 1, max_queue: int = 16) -> None:
+        self.workers = max(1, int(workers))
+        self.max_queue = max(0, int(max_queue))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tts-inference")
+        self._lock = threading.Lock()
+        self._admitted = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of admitted requests (running + waiting)."""
+        return self._admitted
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def admit(self) -> InferenceSlot:
+        """Reserves a place for one request or raises QueueFullError."""
+        with self._lock:
+            if self._admitted >= self.capacity:
+                raise QueueFullError(f"Inference queue is full ({self._admitted} requests admitted)")
+            self._admitted += 1
+        return InferenceSlot(self)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._admitted = max(0, self._admitted - 1)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Runs fn(*args) on an inference worker without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self._pool, functools.partial(ctx.run, fn, *args))
+
+    def iterate(self, iterable: Iterable[T]) -> Iterator[T]:
+        """Pulls items of a synthesis iterator on the inference workers (one job per item)."""
+        it = iter(iterable)
+        while True:
+            ctx = contextvars.copy_context()
+            item = self._pool.submit(ctx.run, next, it, _DONE).result()
+            if item is _DONE:
+                return
+            yield item
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
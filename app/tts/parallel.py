@@ -0,0 +1,60 @@
+"""Fan-out of independent pieces (chunks, segments) of one request to a shared thread pool."""
+from __future__ import annotations
+
+import contextvars
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from app import tracing
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_END = object()
+
+
+class FanoutPool:
+    """
+    Shared pool that synthesizes independent pieces of a request concurrently.
+
+    map_ordered() keeps at most max_parallel pieces of one request in flight and yields
+    results in input order as soon as the next one is ready, so streaming still starts
+    after the first piece while the following ones are already running.
+    Jobs must not submit to the same pool themselves (nested waits could deadlock it).
+    """
+
+    def __init__(self, workers: int = 8, max_parallel: int = 4) -> None:
+        self.workers = max(1, int(workers))
+        self.max_parallel = max(1, int(max_parallel))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tts-fanout")
+
+    def _submit(self, fn: Callable[[T], R], item: T) -> Future:
+        # The job runs in the caller's context: trace spans and profiles join its request
+        ctx = contextvars.copy_context()
+        return self._pool.submit(ctx.run, tracing.profiled, fn, item)
+
+    def map_ordered(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        items = list(items)
+        if len(items) <= 1 or self.max_parallel <= 1:
+            for item in items:
+                yield fn(item)
+            return
+
+        remaining = iter(items)
+        # range first: zip must not pull an extra item from `remaining` once the window is full
+        pending: deque[Future] = deque(self._submit(fn, item) for _, item in zip(range(self.max_parallel), remaining))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                nxt = next(remaining, _END)
+                if nxt is not _END:
+                    pending.append(self._submit(fn, nxt))
+                yield result
+        finally:
+            # Consumer stopped early (error, client disconnect): drop pieces that have not started
+            for fut in pending:
+                fut.cancel()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
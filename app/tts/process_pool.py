@@ -0,0 +1,143 @@
+"""Multi-process engine sharding: inference runs in N worker processes, each with its own model copy."""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from app.tts.engine import SileroTTSEngine
+
+log = logging.getLogger("silero")
+
+# Engine of the current worker process (set by the pool initializer)
+_worker_engine: SileroTTSEngine | None = None
+
+
+def _init_worker(engine_kwargs: dict, load_lock) -> None:
+    global _worker_engine
+    num_threads = engine_kwargs.get("num_threads", 0)
+    if num_threads > 0:
+        # Pin OpenMP/MKL pools before torch is imported in this process
+        os.environ["OMP_NUM_THREADS"] = str(num_threads)
+        os.environ["MKL_NUM_THREADS"] = str(num_threads)
+    engine = SileroTTSEngine(**engine_kwargs)
+    # Serialize loading: the first worker downloads the model into torch.hub cache, the rest reuse it
+    with load_lock:
+        engine.load()
+    _worker_engine = engine
+
+
+def _worker_synthesize(texts: list[str], speaker: str, sample_rate: int | None) -> list[np.ndarray]:
+    return _worker_engine._synthesize_batch(texts, speaker, sample_rate)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+class ShardedSileroTTSEngine(SileroTTSEngine):
+    """
+    SileroTTSEngine that dispatches chunk inference to a pool of worker processes.
+
+    The API process only splits text, batches and concatenates; each worker loads its own
+    model with num_threads torch threads, so N small chunks run on N cores instead of
+    competing for one oversubscribed intra-op thread pool.
+    """
+
+    def __init__(self, *args, num_workers: int = 2, start_method: str = "spawn", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_workers = max(1, int(num_workers))
+        self.start_method = start_method
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._pool is not None
+
+    def _worker_kwargs(self) -> dict:
+        return dict(
+            language=self.language,
+            model_id=self.model_id,
+            device=self.device_mode,
+            sample_rate=self.sample_rate,
+            default_speaker=self.default_speaker,
+            num_threads=self.num_threads,
+            max_chars_per_chunk=self.max_chars_per_chunk,
+            chunk_pause_sec=self.chunk_pause_sec,
+            models_dir=str(self.models_dir),
+        )
+
+    def load(self):
+        if self.batch_max_size > 1:
+            # A batch would be dispatched to one worker, undoing the sharding
+            log.warning("SILERO_BATCH_MAX_SIZE=%s ignored with worker processes", self.batch_max_size)
+        self._pool = self._start_pool()
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        ctx = multiprocessing.get_context(self.start_method)
+        log.info(
+            "Starting %s Silero worker processes (%s, %s threads each): language=%s speaker_model=%s",
+            self.num_workers, self.start_method, self.num_threads, self.language, self.model_id,
+        )
+        pool = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self._worker_kwargs(), ctx.Lock()),
+        )
+        # Start the workers (and load their models) now instead of on the first request
+        pids = {f.result() for f in [pool.submit(_worker_pid) for _ in range(self.num_workers)]}
+        log.info("Silero worker processes ready: %s", sorted(pids))
+        return pool
+
+    def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Replaces a pool whose worker died; the engine stays unloaded if the restart fails."""
+        with self._pool_lock:
+            if self._pool is not broken:
+                # Already restarted by a concurrent request
+                return
+            self._pool = None
+            broken.shutdown(wait=False, cancel_futures=True)
+            try:
+                self._pool = self._start_pool()
+            except Exception:
+                log.exception("Failed to restart Silero worker processes")
+
+    def _synthesize_batch(self, texts: list[str], speaker: str, sample_rate: int | None = None) -> list[np.ndarray]:
+        pool = self._pool
+        if pool is None:
+            raise RuntimeError("Silero worker processes are not running")
+        try:
+            return pool.submit(_worker_synthesize, texts, speaker, sample_rate).result()
+        except BrokenProcessPool as e:
+            # A worker crashed (OOM kill, segfault): every later submit would fail the same way
+            log.error("Silero worker process died, restarting the worker pool: %s", e)
+            self._restart_pool(pool)
+            raise RuntimeError("Silero worker process died during synthesis") from e
+
+    def warm_up(self, texts: list[str], speakers: list[str], sample_rates: list[int], runs: int = 2) -> None:
+        """Each worker has its own model: the runs are submitted num_workers times at once to reach all of them."""
+        pool = self._pool
+        if pool is None:
+            raise RuntimeError("Silero worker processes are not running")
+        chunks = [chunk for text in texts for chunk in self.split_text(text)]
+        futures = [
+            pool.submit(_worker_synthesize, [chunk], speaker, sample_rate)
+            for sample_rate in sample_rates
+            for speaker in speakers
+            for _ in range(runs * self.num_workers)
+            for chunk in chunks
+        ]
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,85 @@
+"""Startup warmup: representative syntheses per engine and speaker before the replica reports ready."""
+import logging
+import time
+
+from fastapi import FastAPI
+
+from app.api.routes_tts import prime_cache
+from app.tts.engine import synthesis_rate
+from app.tts.voices import map_voice_to_silero
+
+log = logging.getLogger("silero")
+
+# Short sentences with the usual constructs: punctuation, a question, numbers with nouns
+DEFAULT_WARMUP_TEXTS = {
+    "ru": [
+        "Здравствуйте! Чем я могу помочь?",
+        "Заказ номер двадцать один оплачен, сумма пять тысяч рублей.",
+    ],
+    "en": [
+        "Hello! How can I help you?",
+        "Order number twenty one has been paid.",
+    ],
+}
+
+
+def warmup_rates(max_rate: int, profiles) -> list[int]:
+    """Silero rates requests will synthesize at: the configured one plus those the output profiles select."""
+    rates = {max_rate} | {synthesis_rate(max_rate, p.sample_rate) for p in profiles.values()}
+    return sorted(rates, reverse=True)
+
+
+def _warm_up_engine(engine, normalizer, texts: list[str], speakers: list[str], sample_rates: list[int], runs: int) -> None:
+    t0 = time.perf_counter()
+    normalized = [normalizer.run(text) for text in texts] if normalizer is not None else texts
+    engine.warm_up(normalized, speakers, sample_rates, runs=runs)
+    log.info(
+        "Warmup %s/%s: %s texts, speakers=%s, rates=%s, %s runs in %.2fs",
+        engine.language, engine.model_id, len(texts), speakers, sample_rates, runs, time.perf_counter() - t0,
+    )
+
+
+def run_warmup(app: FastAPI) -> None:
+    """
+    Warms up the loaded engines and primes the response cache.
+
+    Best effort: a failed warmup is logged and the app still becomes ready, since requests only
+    run slower on a cold model.
+    """
+    state = app.state
+    settings = state.settings
+    state.warmup["status"] = "running"
+    t0 = time.perf_counter()
+    try:
+        ru_engine = state.engine
+        speakers = [map_voice_to_silero(v, default=ru_engine.default_speaker) for v in settings.warmup_speakers]
+        ru_rates = warmup_rates(ru_engine.sample_rate, state.output_profiles)
+        _warm_up_engine(
+            ru_engine,
+            state.normalizer,
+            settings.warmup_texts or DEFAULT_WARMUP_TEXTS["ru"],
+            list(dict.fromkeys(speakers)) or [ru_engine.default_speaker],
+            ru_rates,
+            settings.warmup_runs,
+        )
+        en_engine = state.en_engine
+        if en_engine is not None:
+            # EN segments always use the EN default speaker
+            _warm_up_engine(
+                en_engine,
+                state.en_normalizer,
+                DEFAULT_WARMUP_TEXTS["en"],
+                [en_engine.default_speaker],
+                sorted({synthesis_rate(en_engine.sample_rate, rate) for rate in ru_rates}, reverse=True),
+                settings.warmup_runs,
+            )
+        if settings.warmup_cache_phrases:
+            added = prime_cache(app, settings.warmup_cache_phrases, settings.warmup_speakers or [ru_engine.default_speaker])
+            state.warmup["cached_phrases"] = added
+            log.info("Warmup: %s common phrases added to the cache", added)
+        state.warmup["status"] = "done"
+    except Exception:
+        log.exception("Warmup failed; serving with cold models")
+        state.warmup["status"] = "failed"
+    finally:
+        state.warmup["seconds"] = round(time.perf_counter() - t0, 3)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Encoding latency: in-process libsndfile codecs vs a per-request ffmpeg subprocess.
+
+Manual benchmark (not collected by pytest). Needs ffmpeg for the comparison column:
+    FFMPEG_BIN=/usr/bin/ffmpeg python tests/bench_encode.py
+Environment: BENCH_SECONDS (audio length per phrase, default 3), BENCH_RUNS (default 20).
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.audio.buffer import AudioBuffer  # noqa: E402
+from app.audio.encode import encode_audio, native_encoding_supported  # noqa: E402
+
+FFMPEG_BIN = os.environ.get("FFMPEG_BIN", "ffmpeg")
+SECONDS = float(os.environ.get("BENCH_SECONDS", "3"))
+RUNS = int(os.environ.get("BENCH_RUNS", "20"))
+SAMPLE_RATE = 48000
+
+
+def _speech_like() -> AudioBuffer:
+    """Tone with a syllable-rate envelope and some noise (compresses roughly like speech)."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(SAMPLE_RATE * SECONDS)) / SAMPLE_RATE
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+    audio = envelope * (0.3 * np.sin(2 * np.pi * 180 * t) + 0.05 * rng.standard_normal(len(t)))
+    return AudioBuffer(audio.astype(np.float32), SAMPLE_RATE)
+
+
+def _time_ms(fn) -> tuple[float, float, int]:
+    fn()  # warm-up (codec init, page cache)
+    samples = []
+    size = 0
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        size = len(fn())
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1], size
+
+
+def main() -> None:
+    audio = _speech_like()
+    have_ffmpeg = shutil.which(FFMPEG_BIN) is not None
+    print(f"{SECONDS:.1f} s of 48 kHz audio, {RUNS} runs; ffmpeg: {FFMPEG_BIN if have_ffmpeg else 'not found'}")
+    print(f"{'format':<7} {'native p50':>11} {'native p95':>11} {'ffmpeg p50':>11} {'ffmpeg p95':>11} {'speedup':>8}")
+    for fmt in ("flac", "mp3", "opus", "aac"):
+        native = ffmpeg = None
+        if native_encoding_supported(fmt, SAMPLE_RATE):
+            native = _time_ms(lambda: encode_audio(audio, fmt, FFMPEG_BIN, encoder="auto"))
+        if have_ffmpeg:
+            ffmpeg = _time_ms(lambda: encode_audio(audio, fmt, FFMPEG_BIN, encoder="ffmpeg"))
+        cells = []
+        for result in (native, ffmpeg):
+            cells += [f"{result[0]:9.1f}ms", f"{result[1]:9.1f}ms"] if result else ["-", "-"]
+        speedup = f"{ffmpeg[0] / native[0]:7.1f}x" if native and ffmpeg else "-"
+        print(f"{fmt:<7} {cells[0]:>11} {cells[1]:>11} {cells[2]:>11} {cells[3]:>11} {speedup:>8}")
+
+
+if __name__ == "__main__":
+    main()
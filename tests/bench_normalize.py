@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Text normalization cost per character on long inputs.
+
+Manual benchmark (not collected by pytest):
+    python tests/bench_normalize.py
+Environment: BENCH_CHARS (input length, default 4000), BENCH_RUNS (default 50).
+
+"cold" clears the per-token caches before every run (first sight of every number and word),
+"warm" keeps them (recurring vocabulary), "staged" runs the stage functions one after another
+(URL, numbers, transliteration) for comparison. Inputs this long bypass the whole-input memo;
+"memo" shows a repeated short phrase.
+"""
+from __future__ import annotations
+
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.text import morph, numbers, transliterate  # noqa: E402
+from app.text.normalize import TextNormalizer, replace_urls  # noqa: E402
+
+CHARS = int(os.environ.get("BENCH_CHARS", "4000"))
+RUNS = int(os.environ.get("BENCH_RUNS", "50"))
+
+_WORDS = [
+    "счёт", "оплата", "позиция", "товар", "рублей", "рубль", "процентов", "итого", "доставка", "скидка",
+    "API", "Docker", "email", "server", "report", "https://example.com/invoice", "и", "по", "за", "в",
+]
+
+
+def _invoice_like(chars: int) -> str:
+    """Number-heavy text: quantities with nouns, percents, rubles, Latin terms and URLs."""
+    rng = random.Random(0)
+    parts = []
+    while sum(len(p) + 1 for p in parts) < chars:
+        kind = rng.random()
+        if kind < 0.25:
+            parts.append(f"{rng.randint(1, 999)} {rng.choice(['штук', 'позиций', 'дней', 'товаров'])}")
+        elif kind < 0.35:
+            parts.append(f"{rng.randint(1, 100)}%")
+        elif kind < 0.45:
+            parts.append(f"{rng.randint(1, 100000)} руб.")
+        elif kind < 0.55:
+            parts.append(str(rng.randint(1, 10 ** rng.randint(1, 6))))
+        else:
+            parts.append(rng.choice(_WORDS))
+    return " ".join(parts)[:chars]
+
+
+def _clear_token_caches() -> None:
+    for fn in (
+        numbers._num_to_words_ru,
+        numbers._counted_words,
+        morph._agree,
+        morph._best_noun_parse,
+        transliterate._transliterate_word,
+    ):
+        fn.cache_clear()
+
+
+def _us_per_char(fn, text: str, before=None) -> float:
+    fn(text)
+    samples = []
+    for _ in range(RUNS):
+        if before is not None:
+            before()
+        t0 = time.perf_counter()
+        fn(text)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e6 / len(text)
+
+
+def _staged(text: str) -> str:
+    text = numbers.expand_numbers(replace_urls(text))
+    return " ".join(transliterate.transliterate_latin_to_cyrillic(text).split())
+
+
+def main() -> None:
+    text = _invoice_like(CHARS)
+    normalizer = TextNormalizer(transliterate_latin=True)
+    assert normalizer.run(text) == _staged(text.strip())
+    phrase = "Итого 3 позиции на 1500 руб., скидка 5%"
+
+    print(f"{len(text)} chars of invoice-like text, {RUNS} runs (median)")
+    print(f"{'cold':<8} {_us_per_char(normalizer.run, text, _clear_token_caches):8.3f} us/char")
+    print(f"{'warm':<8} {_us_per_char(normalizer.run, text):8.3f} us/char")
+    print(f"{'staged':<8} {_us_per_char(_staged, text):8.3f} us/char")
+    print(f"{'memo':<8} {_us_per_char(normalizer.run, phrase):8.3f} us/char  ({len(phrase)}-char phrase)")
+
+
+if __name__ == "__main__":
+    main()
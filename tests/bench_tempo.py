@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Speed change: in-process WSOLA (app.audio.tempo) vs ffmpeg atempo.
+
+Manual benchmark (not collected by pytest). Needs ffmpeg for the comparison:
+    FFMPEG_BIN=/usr/bin/ffmpeg python tests/bench_tempo.py
+Environment: BENCH_SECONDS (default 3), BENCH_RUNS (default 10).
+
+Latency is measured end to end on a WAV response (decode, stretch, WAV out). Quality columns:
+pitch error on a 220 Hz tone, and log-spectral distance (dB) between the WSOLA and atempo
+outputs of a speech-like signal (lower = closer to atempo).
+"""
+from __future__ import annotations
+
+import io
+import os
+import shutil
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.audio.buffer import AudioBuffer  # noqa: E402
+from app.audio.encode import encode_audio  # noqa: E402
+
+FFMPEG_BIN = os.environ.get("FFMPEG_BIN", "ffmpeg")
+SECONDS = float(os.environ.get("BENCH_SECONDS", "3"))
+RUNS = int(os.environ.get("BENCH_RUNS", "10"))
+SR = 48000
+SPEEDS = (0.5, 0.8, 1.25, 1.5, 2.0)
+
+
+def _tone() -> np.ndarray:
+    t = np.arange(int(SR * SECONDS)) / SR
+    return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _speech_like() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(SR * SECONDS)) / SR
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)  # gliding pitch
+    voiced = np.sin(2 * np.pi * np.cumsum(f0) / SR) + 0.4 * np.sin(4 * np.pi * np.cumsum(f0) / SR)
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))  # ~4 syllables per second
+    return (0.3 * envelope * voiced + 0.02 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def _stretch(audio: AudioBuffer, speed: float, backend: str) -> np.ndarray:
+    out = encode_audio(audio, "wav", FFMPEG_BIN, speed=speed, speed_backend=backend)
+    return sf.read(io.BytesIO(out), dtype="float32")[0]
+
+
+def _p50_ms(fn) -> float:
+    fn()
+    samples = []
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _pitch_error_hz(audio: np.ndarray) -> float:
+    spectrum = np.abs(np.fft.rfft(audio * np.hanning(len(audio))))
+    return abs(np.argmax(spectrum) * SR / len(audio) - 220.0)
+
+
+def _log_spectral_distance_db(a: np.ndarray, b: np.ndarray, n_fft: int = 2048) -> float:
+    n = min(len(a), len(b)) // n_fft * n_fft
+    spec_a = np.abs(np.fft.rfft(a[:n].reshape(-1, n_fft) * np.hanning(n_fft), axis=1)) + 1e-6
+    spec_b = np.abs(np.fft.rfft(b[:n].reshape(-1, n_fft) * np.hanning(n_fft), axis=1)) + 1e-6
+    diff = 20 * np.log10(spec_a / spec_b)
+    return float(np.mean(np.sqrt(np.mean(diff ** 2, axis=1))))
+
+
+def main() -> None:
+    have_ffmpeg = shutil.which(FFMPEG_BIN) is not None
+    tone = AudioBuffer(_tone(), SR)
+    speech = AudioBuffer(_speech_like(), SR)
+    print(f"{SECONDS:.1f} s of 48 kHz audio, {RUNS} runs; ffmpeg: {FFMPEG_BIN if have_ffmpeg else 'not found'}")
+    print(f"{'speed':>5} {'wsola p50':>10} {'atempo p50':>11} {'wsola pitch err':>16} {'atempo pitch err':>17} {'LSD vs atempo':>14}")
+    for speed in SPEEDS:
+        native_ms = _p50_ms(lambda: _stretch(speech, speed, "native"))
+        native_pitch = _pitch_error_hz(_stretch(tone, speed, "native"))
+        row = [f"{native_ms:8.1f}ms", "-", f"{native_pitch:13.2f}Hz", "-", "-"]
+        if have_ffmpeg:
+            row[1] = f"{_p50_ms(lambda: _stretch(speech, speed, 'ffmpeg')):9.1f}ms"
+            row[3] = f"{_pitch_error_hz(_stretch(tone, speed, 'ffmpeg')):14.2f}Hz"
+            lsd = _log_spectral_distance_db(_stretch(speech, speed, "native"), _stretch(speech, speed, "ffmpeg"))
+            row[4] = f"{lsd:11.2f}dB"
+        print(f"{speed:>5} {row[0]:>10} {row[1]:>11} {row[2]:>16} {row[3]:>17} {row[4]:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Load test of POST /v1/audio/speech: latency percentiles, time to first byte, throughput,
+real-time factor and cache hit ratio, printed as JSON to compare across commits.
+
+Manual benchmark (not collected by pytest):
+    python tests/benchmark_tts.py                                  # in-process app, fake engine
+    python tests/benchmark_tts.py --engine real --workers 2        # in-process app, Silero models
+    python tests/benchmark_tts.py --url http://localhost:8000      # running server over HTTP
+    python tests/benchmark_tts.py --engine mymodule:make_engine    # custom engine factory
+
+The fake engine needs no model: it sleeps --fake-rtf times the duration of the audio it returns
+(0.07 s per character), like inference that releases the GIL. In-process requests are driven
+through the ASGI interface directly, so TTFB is measured at the first body message, as it would
+be on the wire. Cache hit ratio comes from the server's tts_requests_total metric.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import io
+import json
+import random
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.audio.buffer import AudioBuffer  # noqa: E402
+from app.text.segment import chunk_text  # noqa: E402
+from app.tts.executor import InferenceExecutor  # noqa: E402
+from tests.conftest import MockSileroEngine, create_test_app  # noqa: E402
+
+_SENTENCES = [
+    "Здравствуйте! Чем я могу помочь?",
+    "Ваш заказ номер 21 передан в доставку.",
+    "Сумма к оплате составляет 1500 рублей, скидка 5%.",
+    "Температура воздуха сегодня около 12 градусов.",
+    "Пожалуйста, оставайтесь на линии, оператор скоро ответит.",
+    "Отчёт за третий квартал отправлен на почту.",
+    "Встреча перенесена на понедельник, на 10 часов утра.",
+    "Спасибо за обращение, хорошего дня!",
+]
+_REQUESTS_RE = re.compile(r'^tts_requests_total\{format="[^"]*",cache="(hit|miss)"\} ([0-9.e+]+)$', re.M)
+FAKE_SEC_PER_CHAR = 0.07
+
+
+class FakeCostEngine(MockSileroEngine):
+    """MockSileroEngine with a cost model: chunks are split like Silero's and take rtf x audio time."""
+
+    def __init__(self, rtf: float, max_chars_per_chunk: int = 500) -> None:
+        super().__init__(default_speaker="baya")
+        self.rtf = rtf
+        self.max_chars_per_chunk = max_chars_per_chunk
+
+    def split_text(self, text: str) -> list[str]:
+        return chunk_text(text, self.max_chars_per_chunk) or [" "]
+
+    def synthesize_chunk(self, text: str, speaker: str | None = None, sample_rate: int | None = None) -> np.ndarray:
+        sample_rate = sample_rate or self.sample_rate
+        audio_sec = len(text) * FAKE_SEC_PER_CHAR
+        time.sleep(audio_sec * self.rtf)
+        return np.zeros(int(sample_rate * audio_sec), dtype=np.float32)
+
+
+@dataclass
+class Result:
+    status: int
+    latency: float
+    ttfb: float
+    audio_sec: float
+    size: int
+
+
+def _length_distribution(spec: str) -> tuple[list[int], list[float]]:
+    """"80:0.5,400:0.4,2000:0.1" -> text lengths (characters) and their weights."""
+    lengths, weights = [], []
+    for item in spec.split(","):
+        length, _, weight = item.partition(":")
+        lengths.append(int(length))
+        weights.append(float(weight or 1))
+    return lengths, weights
+
+
+def _make_texts(n: int, spec: str, repeat: float, seed: int) -> list[str]:
+    """n request texts of the given length distribution; a `repeat` share reuses an earlier text."""
+    rng = random.Random(seed)
+    lengths, weights = _length_distribution(spec)
+    texts: list[str] = []
+    for i in range(n):
+        if texts and rng.random() < repeat:
+            texts.append(rng.choice(texts))
+            continue
+        target = rng.choices(lengths, weights)[0]
+        # A request number keeps distinct texts distinct (no accidental cache hits)
+        parts = [f"Запрос {i}."]
+        while sum(len(p) + 1 for p in parts) < target:
+            parts.append(rng.choice(_SENTENCES))
+        texts.append(" ".join(parts)[: max(target, len(parts[0]))])
+    return texts
+
+
+def _audio_sec(data: bytes, fmt: str) -> float:
+    try:
+        if fmt == "wav":
+            return AudioBuffer.from_wav(data).duration_sec
+        return sf.info(io.BytesIO(data)).duration
+    except Exception:
+        return 0.0
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": p50, "p95": p95, "p99": p99, "mean": float(np.mean(values)), "max": max(values)}
+
+
+def _ms(stats: dict) -> dict:
+    return {k: round(v * 1000, 2) for k, v in stats.items()}
+
+
+class AsgiClient:
+    """Drives the ASGI app directly; records the time of the first body message (TTFB)."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> tuple[int, float, bytes]:
+        t0 = time.perf_counter()
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+            "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(b"content-type", b"application/json"), (b"host", b"bench")],
+            "client": ("127.0.0.1", 0), "server": ("bench", 80), "app": self.app,
+        }
+        sent = False
+        status, ttfb, chunks = 0, 0.0, []
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.Event().wait()  # the client never disconnects
+
+        async def send(message):
+            nonlocal status, ttfb
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and message.get("body"):
+                if not chunks:
+                    ttfb = time.perf_counter() - t0
+                chunks.append(message["body"])
+
+        await self.app(scope, receive, send)
+        return status, ttfb, b"".join(chunks)
+
+
+class HttpClient:
+    def __init__(self, url: str, api_key: str | None) -> None:
+        import httpx
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.client = httpx.AsyncClient(base_url=url, headers=headers, timeout=600)
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> tuple[int, float, bytes]:
+        t0 = time.perf_counter()
+        ttfb, chunks = 0.0, []
+        headers = {"content-type": "application/json"}
+        async with self.client.stream(method, path, content=body, headers=headers) as response:
+            async for chunk in response.aiter_raw():
+                if not chunks:
+                    ttfb = time.perf_counter() - t0
+                chunks.append(chunk)
+        return response.status_code, ttfb, b"".join(chunks)
+
+
+def _build_app(args):
+    """In-process app: the fake engine on the test app, or create_app() with a real or custom engine."""
+    if args.engine == "real":
+        from app.main import create_app
+
+        app = create_app()
+        asyncio.run(app.router.startup())
+        print("Loading models...", file=sys.stderr)
+        while not app.state.ready.wait(0.5):
+            if app.state.engine_status["ru"]["state"] == "failed":
+                raise SystemExit(f"Models failed to load: {app.state.engine_status}")
+        return app
+    app = create_test_app(require_auth=False)
+    app.state.settings.auto_play = False
+    if args.engine == "fake":
+        app.state.engine = FakeCostEngine(args.fake_rtf)
+    else:
+        module, _, attr = args.engine.partition(":")
+        app.state.engine = getattr(importlib.import_module(module), attr)()
+    app.state.executor = InferenceExecutor(workers=args.workers, max_queue=max(16, args.concurrency))
+    return app
+
+
+async def _requests_by_cache(client) -> dict[str, float]:
+    status, _, body = await client.request("GET", "/metrics")
+    totals = {"hit": 0.0, "miss": 0.0}
+    if status == 200:
+        for outcome, value in _REQUESTS_RE.findall(body.decode()):
+            totals[outcome] += float(value)
+    return totals
+
+
+async def _run(client, texts: list[str], args) -> tuple[list[Result], float, dict]:
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for text in texts:
+        queue.put_nowait(text)
+    results: list[Result] = []
+
+    async def worker() -> None:
+        while not queue.empty():
+            text = queue.get_nowait()
+            payload = {"model": "tts-1", "voice": args.voice, "input": text, "response_format": args.format,
+                       "stream": args.stream}
+            t0 = time.perf_counter()
+            status, ttfb, body = await client.request("POST", "/v1/audio/speech", json.dumps(payload).encode())
+            latency = time.perf_counter() - t0
+            audio_sec = _audio_sec(body, args.format) if status == 200 else 0.0
+            results.append(Result(status, latency, ttfb, audio_sec, len(body)))
+
+    before = await _requests_by_cache(client)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+    after = await _requests_by_cache(client)
+    return results, elapsed, {k: after[k] - before[k] for k in after}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _report(results: list[Result], elapsed: float, cache: dict, args) -> dict:
+    ok = [r for r in results if r.status == 200]
+    audio_total = sum(r.audio_sec for r in ok)
+    looked_up = cache["hit"] + cache["miss"]
+    return {
+        "commit": _git_commit(),
+        "config": {
+            "target": args.url or f"in-process/{args.engine}",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "lengths": args.lengths,
+            "repeat": args.repeat,
+            "format": args.format,
+            "stream": args.stream,
+            "workers": args.workers if not args.url else None,
+            "fake_rtf": args.fake_rtf if args.engine == "fake" and not args.url else None,
+        },
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "status_codes": {str(s): sum(r.status == s for r in results) for s in sorted({r.status for r in results})},
+        "duration_sec": round(elapsed, 3),
+        "throughput_rps": round(len(ok) / elapsed, 3) if elapsed else None,
+        "audio_sec_per_sec": round(audio_total / elapsed, 3) if elapsed else None,
+        "latency_ms": _ms(_percentiles([r.latency for r in ok])),
+        "ttfb_ms": _ms(_percentiles([r.ttfb for r in ok])),
+        # Latency over audio duration per request (client-side, includes queueing)
+        "rtf": {k: round(v, 4) for k, v in _percentiles([r.latency / r.audio_sec for r in ok if r.audio_sec]).items()},
+        "cache_hit_ratio": round(cache["hit"] / looked_up, 4) if looked_up else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--api-key", help="Bearer token for --url")
+    parser.add_argument("--engine", default="fake", help="fake | real | module:factory (in-process only)")
+    parser.add_argument("--fake-rtf", type=float, default=0.02, help="fake engine: synthesis time / audio time")
+    parser.add_argument("--workers", type=int, default=1, help="in-process inference workers")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--lengths", default="80:0.5,400:0.4,2000:0.1", help="text lengths in characters:weight")
+    parser.add_argument("--repeat", type=float, default=0.2, help="share of requests repeating an earlier text")
+    parser.add_argument("--format", default="wav", choices=["wav", "mp3", "opus", "aac", "flac"])
+    parser.add_argument("--stream", action="store_true", help="request streamed responses (meaningful TTFB)")
+    parser.add_argument("--voice", default="alloy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    texts = _make_texts(args.requests, args.lengths, args.repeat, args.seed)
+    client = HttpClient(args.url, args.api_key) if args.url else AsgiClient(_build_app(args))
+    results, elapsed, cache = asyncio.run(_run(client, texts, args))
+    report = json.dumps(_report(results, elapsed, cache, args), indent=2, ensure_ascii=False)
+    print(report)
+    if args.out:
+        Path(args.out).write_text(report + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 """API test fixtures: test app with a mock engine (without loading Silero)."""
 import io
 import tempfile
+import threading
+import types
 
 import numpy as np
 import pytest
@@ -8,11 +10,21 @@ import soundfile as sf
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from app.api.routes_batch import router as batch_router
+from app.api.routes_health import router as health_router
+from app.api.routes_metrics import router as metrics_router
 from app.api.routes_tts import router as tts_router
-from app.audio.cache import DiskCache
+from app.audio.buffer import AudioBuffer
+from app.audio.cache import DiskCache, MemoryCache, TieredCache
+from app.audio.profiles import load_profiles
+from app.audio.singleflight import SingleFlight
 from app.settings import Settings
 from app.text.language_router import LanguageAwareRouter
 from app.text.normalize import TextNormalizer
+from app.tracing import Tracer
+from app.tts.engine import SileroTTSEngine
+from app.tts.executor import InferenceExecutor
+from app.tts.parallel import FanoutPool
 
 
 def _minimal_wav_bytes(sample_rate: int = 48000) -> bytes:
@@ -28,23 +40,111 @@ class MockSileroEngine:
 
     default_speaker = "baya"
     sample_rate = 48000
+    language = "ru"
+    model_id = "mock"
 
     def __init__(self, default_speaker: str = "baya") -> None:
         self.default_speaker = default_speaker
         self.calls: list[tuple[str, str | None]] = []
+        self.rates: list[int] = []
+        self.warmups: list[tuple[list[str], list[str], list[int], int]] = []
 
     def load(self) -> None:
         pass
 
+    def split_text(self, text: str) -> list[str]:
+        return [text]
+
+    def synthesize_chunk(self, text: str, speaker: str | None = None, sample_rate: int | None = None) -> np.ndarray:
+        self.calls.append((text, speaker))
+        self.rates.append(sample_rate or self.sample_rate)
+        return np.zeros(int((sample_rate or self.sample_rate) * 0.01), dtype=np.float32)
+
+    def iter_audio(self, text: str, speaker: str | None = None, parallel: bool = True, sample_rate: int | None = None):
+        yield self.synthesize_chunk(text, speaker, sample_rate)
+
+    def iter_chunks(self, chunks: list[str], speaker: str | None = None, parallel: bool = True, sample_rate: int | None = None):
+        for chunk in chunks:
+            yield self.synthesize_chunk(chunk, speaker, sample_rate)
+
+    def synthesize(self, text: str, speaker: str | None = None, sample_rate: int | None = None) -> AudioBuffer:
+        sample_rate = sample_rate or self.sample_rate
+        self.calls.append((text, speaker))
+        self.rates.append(sample_rate)
+        return AudioBuffer(np.zeros(int(sample_rate * 0.01), dtype=np.float32), sample_rate)
+
     def synthesize_wav_bytes(self, text: str, speaker: str | None = None) -> bytes:
         self.calls.append((text, speaker))
         return _minimal_wav_bytes(self.sample_rate)
 
+    def warm_up(self, texts: list[str], speakers: list[str], sample_rates: list[int], runs: int = 2) -> None:
+        self.warmups.append((texts, speakers, sample_rates, runs))
+
+
+class _FakeInferenceMode:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
 
-def create_test_app(*, require_auth: bool = False, cache_dir: str | None = None, language_aware_routing: bool = False) -> FastAPI:
+
+class _FakeAudio:
+    """Stands in for a torch tensor returned by apply_tts: one 0.1 sample per character."""
+
+    def __init__(self, text: str):
+        self._data = np.full(len(text), 0.1, dtype=np.float32)
+
+    def detach(self):
+        return self
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._data
+
+
+@pytest.fixture
+def fake_apply_tts_engine():
+    """
+    Factory of real SileroTTSEngine objects with a fake torch surface (no model download).
+
+    Returns (engine, apply_calls): apply_calls records the list of texts of every apply_tts call.
+    """
+
+    def make(**kwargs) -> tuple[SileroTTSEngine, list[list[str]]]:
+        apply_calls: list[list[str]] = []
+
+        def fake_apply_tts(texts, **_kwargs):
+            apply_calls.append(list(texts))
+            return [_FakeAudio(t) for t in texts]
+
+        engine_kwargs = dict(language="ru", model_id="v5_1_ru", device="cpu", sample_rate=48000, default_speaker="baya")
+        engine_kwargs.update(kwargs)
+        engine = SileroTTSEngine(**engine_kwargs)
+        engine._torch = types.SimpleNamespace(inference_mode=_FakeInferenceMode)
+        engine._model = object()
+        engine._apply_tts = fake_apply_tts
+        engine._init_batcher()
+        return engine, apply_calls
+
+    return make
+
+
+def create_test_app(
+    *,
+    require_auth: bool = False,
+    cache_dir: str | None = None,
+    language_aware_routing: bool = False,
+    parallel_chunks: int = 1,
+) -> FastAPI:
     """Creates a FastAPI test app with a mock engine."""
     app = FastAPI(title="Silero TTS Test", version="0.1.0")
     app.include_router(tts_router)
+    app.include_router(batch_router)
+    app.include_router(health_router)
+    app.include_router(metrics_router)
 
     cache_path = cache_dir or tempfile.mkdtemp(prefix="silero_tts_test_cache_")
     settings = Settings(
@@ -62,7 +162,24 @@ def create_test_app(*, require_auth: bool = False, cache_dir: str | None = None,
     app.state.normalizer = TextNormalizer(transliterate_latin=not language_aware_routing)
     app.state.en_normalizer = TextNormalizer(transliterate_latin=False, expand_numeric=False) if language_aware_routing else None
     app.state.language_router = LanguageAwareRouter() if language_aware_routing else None
-    app.state.cache = DiskCache(settings.cache_dir, max_files=settings.cache_max_files)
+    app.state.cache = TieredCache(
+        DiskCache(settings.cache_dir, max_files=settings.cache_max_files),
+        MemoryCache(settings.cache_memory_max_bytes),
+    )
+    app.state.singleflight = SingleFlight()
+    app.state.output_profiles = load_profiles(settings.output_profiles)
+    app.state.executor = InferenceExecutor(workers=settings.inference_workers, max_queue=settings.inference_max_queue)
+    app.state.fanout = FanoutPool(workers=4, max_parallel=parallel_chunks) if parallel_chunks > 1 else None
+    app.state.tracer = Tracer()
+    app.state.started_at = 0.0
+    app.state.startup_seconds = 0.0
+    app.state.loaded = threading.Event()
+    app.state.loaded.set()
+    app.state.ready = threading.Event()
+    app.state.ready.set()
+    app.state.engine_status = {"ru": {"state": "loaded", "seconds": 0.0}}
+    app.state.preload_status = {}
+    app.state.warmup = {"status": "disabled", "seconds": None}
 
     return app
 
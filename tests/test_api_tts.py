@@ -1,6 +1,13 @@
 """TTS API tests: POST /v1/audio/speech."""
+import asyncio
+import io
+import json
+import struct
+
 import pytest
+import soundfile as sf
 from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
 
 
 def test_speech_success(client: TestClient, valid_speech_payload: dict) -> None:
@@ -21,6 +28,49 @@ def test_speech_success_cached(client: TestClient, valid_speech_payload: dict) -
     assert r1.content == r2.content
 
 
+def test_cache_stats_counts_memory_hits(client: TestClient, valid_speech_payload: dict) -> None:
+    """A repeated request is served from the RAM tier and counted in /v1/cache/stats."""
+    client.post("/v1/audio/speech", json=valid_speech_payload)
+    client.post("/v1/audio/speech", json=valid_speech_payload)
+    stats = client.get("/v1/cache/stats").json()
+    assert stats["memory"]["hits"] == 1
+    assert stats["disk"]["files"] == 1
+
+
+def test_cache_stats_report_chunk_cache_separately(client: TestClient, app, tmp_path) -> None:
+    """Chunk entries live in their own cache and are reported under "chunks"."""
+    from app.audio.cache import DiskCache, MemoryCache, TieredCache
+
+    app.state.chunk_cache = TieredCache(DiskCache(str(tmp_path), max_files=10), MemoryCache(1 << 20))
+    app.state.chunk_cache.put("chunk", b"\x00" * 8)
+    stats = client.get("/v1/cache/stats").json()
+    assert stats["chunks"]["disk"]["files"] == 1
+    assert stats["disk"]["files"] == 0
+
+
+def test_speech_other_format_reuses_cached_pcm(client: TestClient, app, valid_speech_payload: dict, monkeypatch) -> None:
+    """A new format/speed of an already synthesized text only re-runs the encoder, not inference."""
+    import app.api.routes_tts as routes_tts
+
+    encoded = []
+
+    def fake_encode_audio(audio, out_format, ffmpeg_bin, speed=1.0, **kwargs):
+        encoded.append((out_format, speed))
+        return f"{out_format}@{speed}".encode()
+
+    monkeypatch.setattr(routes_tts, "encode_audio", fake_encode_audio)
+    app.state.settings.auto_play = False
+
+    client.post("/v1/audio/speech", json=valid_speech_payload)
+    mp3 = client.post("/v1/audio/speech", json={**valid_speech_payload, "response_format": "mp3"})
+    fast = client.post("/v1/audio/speech", json={**valid_speech_payload, "speed": 1.25})
+
+    assert mp3.content == b"mp3@1.0"
+    assert fast.content == b"wav@1.25"
+    assert len(app.state.engine.calls) == 1
+    assert ("mp3", 1.0) in encoded and ("wav", 1.25) in encoded
+
+
 def test_speech_validation_missing_input(client: TestClient) -> None:
     """Missing input returns 422."""
     payload = {"model": "gpt-4o-mini-tts", "voice": "alloy"}
@@ -143,6 +193,230 @@ def test_speech_with_language_aware_routing_uses_both_engines(
     assert "hello" in en_calls[0][0].lower()
 
 
+def test_speech_routing_resamples_en_engine_rate(valid_speech_payload: dict) -> None:
+    """An EN engine at another sample rate is resampled to the RU rate instead of failing."""
+    from tests.conftest import create_test_app
+
+    payload = {**valid_speech_payload, "input": "Привет, hello world! Пока."}
+    same_rate = TestClient(create_test_app(language_aware_routing=True)).post("/v1/audio/speech", json=payload)
+    app = create_test_app(language_aware_routing=True)
+    app.state.en_engine.sample_rate = 24000
+    response = TestClient(app).post("/v1/audio/speech", json=payload)
+
+    assert response.status_code == 200
+    info = sf.info(io.BytesIO(response.content))
+    assert info.samplerate == 48000
+    assert info.frames == sf.info(io.BytesIO(same_rate.content)).frames
+
+
+def test_speech_sample_rate_option(client: TestClient, valid_speech_payload: dict) -> None:
+    """sample_rate converts the output and is part of the cache key."""
+    native = client.post("/v1/audio/speech", json=valid_speech_payload)
+    phone = client.post("/v1/audio/speech", json={**valid_speech_payload, "sample_rate": 8000})
+    streamed = client.post("/v1/audio/speech", json={**valid_speech_payload, "sample_rate": 16000, "stream": True})
+
+    assert sf.info(io.BytesIO(native.content)).samplerate == 48000
+    info = sf.info(io.BytesIO(phone.content))
+    assert info.samplerate == 8000
+    assert info.frames == sf.info(io.BytesIO(native.content)).frames // 6
+    assert streamed.content[24:28] == (16000).to_bytes(4, "little")
+    assert client.post("/v1/audio/speech", json={**valid_speech_payload, "sample_rate": 1000}).status_code == 422
+
+
+def test_speech_profile_synthesizes_at_low_native_rate(client: TestClient, app, valid_speech_payload: dict) -> None:
+    """The telephony profile is synthesized at 8 kHz instead of downsampling 48 kHz audio."""
+    response = client.post("/v1/audio/speech", json={**valid_speech_payload, "profile": "telephony"})
+
+    assert response.status_code == 200
+    assert sf.info(io.BytesIO(response.content)).samplerate == 8000
+    assert app.state.engine.rates == [8000]
+    assert client.post("/v1/audio/speech", json={**valid_speech_payload, "profile": "nope"}).status_code == 400
+
+
+def test_speech_profile_of_api_key(valid_speech_payload: dict) -> None:
+    """Keys in API_KEY_PROFILES authenticate and select their profile; the request can override it."""
+    from tests.conftest import create_test_app
+
+    app = create_test_app(require_auth=True)
+    app.state.settings.api_key_profiles = {"phone-key": "telephony"}
+    client = TestClient(app)
+    phone = client.post("/v1/audio/speech", json=valid_speech_payload, headers={"Authorization": "Bearer phone-key"})
+    default = client.post(
+        "/v1/audio/speech",
+        json={**valid_speech_payload, "profile": "default"},
+        headers={"Authorization": "Bearer phone-key"},
+    )
+
+    assert sf.info(io.BytesIO(phone.content)).samplerate == 8000
+    assert sf.info(io.BytesIO(default.content)).samplerate == 48000
+
+
+def test_speech_parallel_routing_matches_sequential(valid_speech_payload: dict) -> None:
+    """Fanning segments out to the pool yields the same audio as sequential synthesis."""
+    from tests.conftest import create_test_app
+
+    payload = {**valid_speech_payload, "input": "Привет, hello world! Пока. Ещё one раз."}
+    sequential = TestClient(create_test_app(language_aware_routing=True)).post("/v1/audio/speech", json=payload)
+    parallel_app = create_test_app(language_aware_routing=True, parallel_chunks=4)
+    parallel = TestClient(parallel_app).post("/v1/audio/speech", json=payload)
+
+    assert sequential.status_code == 200 and parallel.status_code == 200
+    assert parallel.content == sequential.content
+    assert len(parallel_app.state.engine.calls) == 3
+    assert len(parallel_app.state.en_engine.calls) == 2
+
+
+def test_speech_stream_wav_open_ended_header(client: TestClient, valid_speech_payload: dict) -> None:
+    """stream=true returns WAV with an open-ended header followed by PCM."""
+    payload = {**valid_speech_payload, "stream": True}
+    response = client.post("/v1/audio/speech", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+    assert response.content[:4] == b"RIFF"
+    assert response.content[4:8] == b"\xff\xff\xff\xff"
+    assert len(response.content) > 44
+
+
+@pytest.mark.parametrize("extra", [{}, {"speed": 1.25}, {"sample_rate": 16000}])
+def test_speech_stream_caches_regular_wav(client: TestClient, valid_speech_payload: dict, extra: dict) -> None:
+    """After a streamed response, the cache serves a regular WAV with real sizes (also resampled or time-stretched)."""
+    payload = {**valid_speech_payload, **extra, "stream": True}
+    streamed = client.post("/v1/audio/speech", json=payload)
+    cached = client.post("/v1/audio/speech", json={**payload, "stream": False})
+    assert streamed.status_code == 200 and cached.status_code == 200
+    assert streamed.content[4:8] == b"\xff\xff\xff\xff"
+    assert cached.content[:4] == b"RIFF"
+    assert struct.unpack("<I", cached.content[4:8])[0] == len(cached.content) - 8
+    assert cached.content[36:40] == b"data"
+    assert struct.unpack("<I", cached.content[40:44])[0] == len(cached.content) - 44
+    assert cached.content[44:] == streamed.content[44:]
+
+
+def test_speech_stream_with_routing(client_with_routing: TestClient, app_with_routing, valid_speech_payload: dict) -> None:
+    """Streaming mode goes through language-aware routing as well."""
+    payload = {**valid_speech_payload, "input": "Привет, hello world! Пока.", "stream": True}
+    response = client_with_routing.post("/v1/audio/speech", json=payload)
+    assert response.status_code == 200
+    assert response.content[:4] == b"RIFF"
+    assert len(app_with_routing.state.engine.calls) == 2
+    assert len(app_with_routing.state.en_engine.calls) == 1
+
+
+def test_speech_stream_disconnect_before_body_releases_slot(app, valid_speech_payload: dict) -> None:
+    """A client that goes away before the first byte is sent does not leak its inference slot."""
+    body = json.dumps({**valid_speech_payload, "stream": True}).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v1/audio/speech",
+        "raw_path": b"/v1/audio/speech",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    with pytest.raises(ClientDisconnect):
+        asyncio.run(app(scope, receive, send))
+    assert app.state.executor.depth == 0
+
+
+def _post_concurrently(app, payloads: list[dict]) -> list:
+    """Sends the requests at the same time through one event loop (TestClient runs them one by one)."""
+    import httpx
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+            return await asyncio.gather(*(ac.post("/v1/audio/speech", json=p) for p in payloads))
+
+    return asyncio.run(run())
+
+
+def _slow_down(engine, monkeypatch, delay: float = 0.2) -> None:
+    """Makes mock inference slow enough for concurrent requests to overlap."""
+    import time
+
+    synthesize_chunk = engine.synthesize_chunk
+    synthesize = engine.synthesize
+
+    def slow_chunk(*args, **kwargs):
+        time.sleep(delay)
+        return synthesize_chunk(*args, **kwargs)
+
+    def slow_synthesize(*args, **kwargs):
+        time.sleep(delay)
+        return synthesize(*args, **kwargs)
+
+    monkeypatch.setattr(engine, "synthesize_chunk", slow_chunk)
+    monkeypatch.setattr(engine, "synthesize", slow_synthesize)
+
+
+def test_concurrent_identical_requests_are_coalesced(client: TestClient, app, valid_speech_payload: dict, monkeypatch) -> None:
+    """Identical requests in flight share one synthesis; other formats of the text share its PCM."""
+    import app.api.routes_tts as routes_tts
+
+    monkeypatch.setattr(routes_tts, "encode_audio", lambda audio, out_format, ffmpeg_bin, speed=1.0, **kwargs: out_format.encode())
+    app.state.settings.auto_play = False
+    _slow_down(app.state.engine, monkeypatch)
+
+    payloads = [valid_speech_payload] * 3 + [{**valid_speech_payload, "response_format": "mp3"}] * 2
+    responses = _post_concurrently(app, payloads)
+
+    assert [r.status_code for r in responses] == [200] * 5
+    assert responses[0].content == responses[1].content == responses[2].content
+    assert responses[3].content == responses[4].content == b"mp3"
+    assert len(app.state.engine.calls) == 1
+    stats = client.get("/v1/cache/stats").json()["singleflight"]
+    # Leaders: the WAV (= PCM) flight and the mp3 flight; coalesced: 2 WAV + 1 mp3 duplicates
+    # and the mp3 flight itself joining the PCM flight
+    assert stats == {"in_flight": 0, "leaders": 2, "coalesced": 4}
+
+
+def test_concurrent_identical_streams_share_one_synthesis(client: TestClient, app, valid_speech_payload: dict, monkeypatch) -> None:
+    """Duplicate stream=true requests subscribe to the stream in flight instead of synthesizing again."""
+    app.state.settings.auto_play = False
+    _slow_down(app.state.engine, monkeypatch)
+
+    payload = {**valid_speech_payload, "stream": True}
+    responses = _post_concurrently(app, [payload] * 3)
+
+    assert [r.status_code for r in responses] == [200] * 3
+    assert responses[0].content[4:8] == b"\xff\xff\xff\xff"
+    assert responses[0].content == responses[1].content == responses[2].content
+    assert len(app.state.engine.calls) == 1
+    assert client.get("/v1/cache/stats").json()["singleflight"]["coalesced"] == 2
+    assert app.state.executor.depth == 0
+
+
+def test_speech_queue_full_returns_429(client: TestClient, app, valid_speech_payload: dict) -> None:
+    """When all workers are busy and the queue is full, the request is rejected with 429 + Retry-After."""
+    executor = app.state.executor
+    slots = [executor.admit() for _ in range(executor.capacity)]
+    try:
+        response = client.post("/v1/audio/speech", json=valid_speech_payload)
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+    finally:
+        for slot in slots:
+            slot.release()
+
+    response = client.post("/v1/audio/speech", json=valid_speech_payload)
+    assert response.status_code == 200
+    assert executor.depth == 0
+
+
 def test_skip_playback(client: TestClient) -> None:
     """Skip endpoint returns 200 with skipped status."""
     response = client.delete("/v1/audio/speech/skip")
@@ -0,0 +1,112 @@
+"""Tests for POST /v1/audio/speech/batch."""
+import io
+import json
+import zipfile
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.api.routes_batch import _concurrency
+
+
+def _items(payload: dict, texts: list[str]) -> list[dict]:
+    return [{**payload, "input": text, "id": f"prompt-{i}"} for i, text in enumerate(texts)]
+
+
+def _archive(response) -> zipfile.ZipFile:
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    return zipfile.ZipFile(io.BytesIO(response.content))
+
+
+def test_batch_returns_zip_with_manifest(client: TestClient, app, valid_speech_payload: dict, monkeypatch):
+    played = []
+    monkeypatch.setattr("app.api.routes_tts.play_audio", lambda *args, **kwargs: played.append(args))
+    app.state.settings.auto_play = True  # must not play batch items
+    items = _items(valid_speech_payload, ["Первый.", "Второй.", "Третий."])
+    archive = _archive(client.post("/v1/audio/speech/batch", json=items))
+
+    manifest = json.loads(archive.read("manifest.json"))
+    assert [e["file"] for e in manifest["items"]] == ["00000_prompt-0.wav", "00001_prompt-1.wav", "00002_prompt-2.wav"]
+    assert all(e["status"] == "ok" for e in manifest["items"])
+    for entry in manifest["items"]:
+        assert archive.read(entry["file"])[:4] == b"RIFF"
+    report = manifest["report"]
+    assert (report["items"], report["ok"], report["failed"]) == (3, 3, 0)
+    assert report["items_per_sec"] > 0
+    assert played == []
+    # Same pipeline as single requests: the PCM layer of each text is cached
+    assert client.post("/v1/audio/speech", json=items[0]).content == archive.read("00000_prompt-0.wav")
+
+
+def test_batch_accepts_jsonl_and_reports_failed_items(client: TestClient, app, valid_speech_payload: dict):
+    app.state.settings.auto_play = False
+    lines = [
+        json.dumps({**valid_speech_payload, "input": "Хорошо."}),
+        json.dumps({**valid_speech_payload, "input": ""}),
+        json.dumps({**valid_speech_payload, "input": "Плохо.", "profile": "missing"}),
+    ]
+    response = client.post(
+        "/v1/audio/speech/batch", content="\n".join(lines) + "\n", headers={"Content-Type": "application/x-ndjson"}
+    )
+    archive = _archive(response)
+    manifest = json.loads(archive.read("manifest.json"))
+    assert [e["status"] for e in manifest["items"]] == ["ok", "error", "error"]
+    assert "Invalid item" in manifest["items"][1]["error"]
+    assert "Unknown output profile" in manifest["items"][2]["error"]
+    assert archive.namelist() == ["00000.wav", "manifest.json"]
+
+
+def test_batch_coalesces_identical_items(client: TestClient, app, valid_speech_payload: dict):
+    app.state.settings.auto_play = False
+    items = [valid_speech_payload] * 4
+    archive = _archive(client.post("/v1/audio/speech/batch", json={"items": items}))
+    assert len(archive.namelist()) == 5
+    assert len(app.state.engine.calls) == 1
+
+
+def test_batch_writes_to_output_dir(client: TestClient, app, tmp_path, valid_speech_payload: dict):
+    app.state.settings.auto_play = False
+    app.state.settings.batch_output_root = str(tmp_path)
+    items = _items(valid_speech_payload, ["Один.", "Два."])
+    response = client.post("/v1/audio/speech/batch?output_dir=job1", json=items)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["report"]["ok"] == 2
+    assert sorted(p.name for p in (tmp_path / "job1").iterdir()) == ["00000_prompt-0.wav", "00001_prompt-1.wav", "manifest.json"]
+    assert json.loads((tmp_path / "job1" / "manifest.json").read_text(encoding="utf-8")) == {
+        k: v for k, v in body.items() if k != "output_dir"
+    }
+
+
+def test_batch_output_dir_is_confined(client: TestClient, app, tmp_path, valid_speech_payload: dict):
+    response = client.post("/v1/audio/speech/batch?output_dir=job", json=[valid_speech_payload])
+    assert response.status_code == 400  # BATCH_OUTPUT_ROOT not set
+    app.state.settings.batch_output_root = str(tmp_path / "root")
+    response = client.post("/v1/audio/speech/batch?output_dir=../outside", json=[valid_speech_payload])
+    assert response.status_code == 400
+    assert not (tmp_path / "outside").exists()
+
+
+def test_batch_concurrency_defaults_to_workers_times_parallel_chunks(app):
+    settings = app.state.settings
+    settings.batch_concurrency = 0
+    settings.silero_parallel_chunks = 3
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(settings=settings, executor=None)))
+    request.app.state.executor = SimpleNamespace(workers=2, capacity=18)
+    assert _concurrency(request) == 6
+    request.app.state.executor = SimpleNamespace(workers=2, capacity=4)
+    assert _concurrency(request) == 4  # more would only be rejected by the inference queue
+    settings.batch_concurrency = 3
+    assert _concurrency(request) == 3
+
+
+def test_batch_limits_and_body_errors(client: TestClient, app, valid_speech_payload: dict):
+    app.state.settings.batch_max_items = 2
+    assert client.post("/v1/audio/speech/batch", json=[valid_speech_payload] * 3).status_code == 413
+    assert client.post("/v1/audio/speech/batch", content=b"{not json", headers={"Content-Type": "application/json"}).status_code == 400
+    assert client.post("/v1/audio/speech/batch", json={"input": "x"}).status_code == 400
+
+
+def test_batch_requires_auth(client_with_auth: TestClient, valid_speech_payload: dict):
+    assert client_with_auth.post("/v1/audio/speech/batch", json=[valid_speech_payload]).status_code == 401
@@ -0,0 +1,98 @@
+"""Tests for dynamic micro-batching of concurrent synthesis calls."""
+import threading
+
+import pytest
+
+from app.tts.batching import MicroBatcher
+from app.tts.engine import SileroTTSEngine
+
+
+def _run_concurrently(fn, args_list):
+    results = [None] * len(args_list)
+    errors = []
+
+    def worker(i, args):
+        try:
+            results[i] = fn(*args)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i, a)) for i, a in enumerate(args_list)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_concurrent_calls_share_one_batch():
+    calls = []
+
+    def batch_fn(key, items):
+        calls.append((key, list(items)))
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=2000)
+    results, errors = _run_concurrently(batcher.submit, [("baya", t) for t in ("a", "b", "c", "d")])
+
+    assert not errors
+    assert results == ["A", "B", "C", "D"]
+    assert len(calls) == 1
+    assert sorted(calls[0][1]) == ["a", "b", "c", "d"]
+
+
+def test_different_keys_are_not_mixed():
+    calls = []
+
+    def batch_fn(key, items):
+        calls.append((key, list(items)))
+        return [f"{key}:{item}" for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=500)
+    results, errors = _run_concurrently(batcher.submit, [("baya", "x"), ("aidar", "y"), ("baya", "z"), ("aidar", "w")])
+
+    assert not errors
+    assert results == ["baya:x", "aidar:y", "baya:z", "aidar:w"]
+    assert sorted((key, sorted(items)) for key, items in calls) == [("aidar", ["w", "y"]), ("baya", ["x", "z"])]
+
+
+def test_batch_error_is_raised_in_every_caller():
+    def batch_fn(key, items):
+        raise ValueError("bad text")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=1000)
+    _, errors = _run_concurrently(batcher.submit, [("baya", "a"), ("baya", "b")])
+    assert len(errors) == 2
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_engine_batches_chunks_into_one_apply_tts_call(fake_apply_tts_engine):
+    """Chunks from concurrent callers reach apply_tts as one list of texts."""
+    engine, apply_calls = fake_apply_tts_engine(batch_max_size=3, batch_wait_ms=2000)
+
+    results, errors = _run_concurrently(engine._synthesize_chunk, [("a", "baya"), ("bb", "baya"), ("ccc", "baya")])
+
+    assert not errors
+    assert [len(r) for r in results] == [1, 2, 3]
+    assert len(apply_calls) == 1
+    assert sorted(apply_calls[0]) == ["a", "bb", "ccc"]
+
+
+def test_engine_with_single_text_api_does_not_batch():
+    """model.apply_tts takes one text: batching would serialize concurrent chunks, so it stays off."""
+    engine = SileroTTSEngine(
+        language="ru", model_id="v5_1_ru", device="cpu", sample_rate=48000,
+        default_speaker="baya", batch_max_size=4,
+    )
+    engine._apply_tts = None
+    engine._init_batcher()
+    assert engine._batcher is None
+
+
+@pytest.mark.parametrize("batch_max_size", [0, 1])
+def test_engine_without_batching_has_no_batcher(batch_max_size):
+    engine = SileroTTSEngine(
+        language="ru", model_id="v5_1_ru", device="cpu", sample_rate=48000,
+        default_speaker="baya", batch_max_size=batch_max_size,
+    )
+    assert engine._batcher is None
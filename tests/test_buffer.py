@@ -0,0 +1,60 @@
+"""Tests for AudioBuffer (in-memory PCM between pipeline stages)."""
+import io
+
+import numpy as np
+import soundfile as sf
+
+from app.audio.buffer import AudioBuffer
+from app.audio.encode import wav_stream_header
+
+
+def test_wav_round_trip_matches_soundfile() -> None:
+    samples = np.linspace(-1.0, 1.0, 4801, dtype=np.float32)
+    wav = AudioBuffer(samples, 24000).to_wav()
+
+    decoded, sample_rate = sf.read(io.BytesIO(wav), dtype="int16")
+    assert sample_rate == 24000
+    assert np.array_equal(decoded, AudioBuffer.from_wav(wav).samples)
+    assert abs(int(decoded[0])) == 32767 and decoded[-1] == 32767
+
+
+def test_from_wav_is_a_view_of_the_bytes() -> None:
+    wav = AudioBuffer(np.full(100, 0.5, dtype=np.float32), 48000).to_wav()
+    audio = AudioBuffer.from_wav(wav)
+
+    assert audio.samples.dtype == np.int16
+    assert not audio.samples.flags.owndata
+    assert audio.pcm16() is audio.samples
+    assert len(audio) == 100 and audio.sample_rate == 48000
+
+
+def test_from_wav_reads_streamed_header() -> None:
+    """Streamed WAVs declare open-ended sizes; samples run to the end of the bytes."""
+    pcm = np.arange(10, dtype="<i2").tobytes()
+    audio = AudioBuffer.from_wav(wav_stream_header(16000) + pcm)
+    assert audio.samples.tolist() == list(range(10))
+
+
+def test_from_wav_falls_back_to_soundfile_for_other_layouts() -> None:
+    buf = io.BytesIO()
+    sf.write(buf, np.zeros((480, 2), dtype=np.float32), 48000, format="WAV", subtype="FLOAT")
+    audio = AudioBuffer.from_wav(buf.getvalue())
+    assert audio.samples.ndim == 1 and len(audio) == 480
+
+
+def test_concat_joins_parts() -> None:
+    parts = [np.ones(3, dtype=np.float32), np.zeros(2, dtype=np.float32)]
+    audio = AudioBuffer.concat(parts, 8000)
+    assert audio.float32().tolist() == [1, 1, 1, 0, 0]
+    assert len(AudioBuffer.concat([], 8000)) == 0
+
+
+def test_resampled_keeps_the_tone() -> None:
+    t = np.arange(48000) / 48000
+    audio = AudioBuffer((0.5 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32), 48000)
+
+    phone = audio.resampled(8000)
+    spectrum = np.abs(np.fft.rfft(phone.float32()))
+    assert phone.sample_rate == 8000 and len(phone) == 8000
+    assert np.argmax(spectrum) == 1000  # 1 Hz bins over one second
+    assert audio.resampled(48000) is audio
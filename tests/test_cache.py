@@ -0,0 +1,153 @@
+"""Tests for the indexed disk cache."""
+import os
+
+from app.audio.cache import DiskCache, MemoryCache, TieredCache
+
+
+def _key(i: int) -> str:
+    return f"{i:064x}"
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=10)
+    cache.put(_key(1), b"audio")
+    assert cache.get(_key(1)) == b"audio"
+    assert cache.get(_key(2)) is None
+    assert cache.stats() == {"files": 1, "bytes": 5, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_evicts_least_recently_used_by_file_count(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=2)
+    cache.put(_key(1), b"a")
+    cache.put(_key(2), b"b")
+    assert cache.get(_key(1)) == b"a"  # 1 becomes most recently used
+    cache.put(_key(3), b"c")
+
+    assert cache.get(_key(2)) is None
+    assert cache.get(_key(1)) == b"a"
+    assert cache.get(_key(3)) == b"c"
+    assert not cache._path(_key(2)).exists()
+    assert cache.evictions == 1
+
+
+def test_evicts_by_total_bytes(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=100, max_bytes=10)
+    cache.put(_key(1), b"x" * 6)
+    cache.put(_key(2), b"y" * 6)
+    assert cache.get(_key(1)) is None
+    assert cache.total_bytes == 6
+
+
+def test_overwrite_updates_size(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=10)
+    cache.put(_key(1), b"x" * 10)
+    cache.put(_key(1), b"x" * 3)
+    assert len(cache) == 1
+    assert cache.total_bytes == 3
+
+
+def test_index_is_rebuilt_from_existing_files(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=10)
+    cache.put(_key(1), b"a")
+    cache.put(_key(2), b"bb")
+    stray = cache._path(_key(3)).with_name("stray.bin.123.tmp")
+    stray.parent.mkdir(parents=True, exist_ok=True)
+    stray.write_bytes(b"torn")
+
+    reopened = DiskCache(str(tmp_path), max_files=10)
+    assert len(reopened) == 2
+    assert reopened.total_bytes == 3
+    assert reopened.get(_key(2)) == b"bb"
+    assert not stray.exists()
+
+
+def test_no_temp_files_left_after_put(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=10)
+    cache.put(_key(1), b"a")
+    leftovers = [fn for _, _, files in os.walk(tmp_path) for fn in files if fn.endswith(".tmp")]
+    assert leftovers == []
+
+
+def test_file_removed_externally_is_a_miss(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=10)
+    cache.put(_key(1), b"a")
+    cache._path(_key(1)).unlink()
+    assert cache.get(_key(1)) is None
+    assert len(cache) == 0
+
+
+def test_persistent_cache_warm_starts_from_manifest(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), max_files=10, fingerprint="model-a")
+    cache.put(_key(1), b"a")
+    cache.put(_key(2), b"bb")
+    cache.get(_key(1))
+    cache.save_manifest()
+
+    def _no_scan(*_args, **_kwargs):
+        raise AssertionError("warm start must not rescan the cache tree")
+
+    monkeypatch.setattr(os, "walk", _no_scan)
+    reopened = DiskCache(str(tmp_path), max_files=10, fingerprint="model-a")
+    assert list(reopened._index) == [_key(2), _key(1)]
+    assert reopened.get(_key(2)) == b"bb"
+    # The manifest is consumed: a crash before the next save falls back to a scan
+    assert not (tmp_path / DiskCache.MANIFEST_FILE).exists()
+
+
+def test_persistent_cache_without_manifest_rescans(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=10, fingerprint="model-a")
+    cache.put(_key(1), b"a")
+
+    reopened = DiskCache(str(tmp_path), max_files=10, fingerprint="model-a")
+    assert reopened.get(_key(1)) == b"a"
+
+
+def test_persistent_cache_dropped_on_fingerprint_change(tmp_path):
+    cache = DiskCache(str(tmp_path), max_files=10, fingerprint="model-a")
+    cache.put(_key(1), b"a")
+    cache.save_manifest()
+
+    reopened = DiskCache(str(tmp_path), max_files=10, fingerprint="model-b")
+    assert len(reopened) == 0
+    assert reopened.get(_key(1)) is None
+    assert not cache._path(_key(1)).exists()
+
+
+def test_memory_cache_evicts_by_byte_budget():
+    memory = MemoryCache(max_bytes=10)
+    memory.put("a", b"x" * 4)
+    memory.put("b", b"y" * 4)
+    assert memory.get("a") == b"x" * 4  # a becomes most recently used
+    memory.put("c", b"z" * 4)
+
+    assert memory.get("b") is None
+    assert memory.get("a") is not None and memory.get("c") is not None
+    assert memory.stats()["bytes"] == 8
+    assert memory.evictions == 1
+
+
+def test_memory_cache_skips_entries_larger_than_budget():
+    memory = MemoryCache(max_bytes=4)
+    memory.put("a", b"x" * 5)
+    assert len(memory) == 0
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = DiskCache(str(tmp_path), max_files=10)
+    disk.put(_key(1), b"audio")
+    cache = TieredCache(disk, MemoryCache(max_bytes=1024))
+
+    assert cache.get(_key(1)) == b"audio"  # disk hit, promoted
+    assert cache.get(_key(1)) == b"audio"  # memory hit
+    stats = cache.stats()
+    assert stats["disk"]["hits"] == 1
+    assert stats["memory"]["hits"] == 1
+    assert stats["memory"]["misses"] == 1
+
+
+def test_tiered_cache_demoted_entries_still_served_from_disk(tmp_path):
+    cache = TieredCache(DiskCache(str(tmp_path), max_files=10), MemoryCache(max_bytes=4))
+    cache.put(_key(1), b"aaa")
+    cache.put(_key(2), b"bbb")  # evicts key 1 from RAM
+    assert cache.get_memory(_key(1)) is None
+    assert cache.get(_key(1)) == b"aaa"
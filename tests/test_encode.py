@@ -0,0 +1,85 @@
+"""Tests for response encoding (in-process codecs and the ffmpeg fallback)."""
+import io
+import subprocess
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+import app.audio.encode as encode
+from app.audio.buffer import AudioBuffer
+from app.audio.encode import encode_audio, native_encoding_supported, stream_encode
+from app.audio.profiles import OutputProfile
+
+
+def _audio(sample_rate: int = 48000, seconds: float = 0.5) -> AudioBuffer:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return AudioBuffer((0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32), sample_rate)
+
+
+@pytest.fixture
+def ffmpeg_calls(monkeypatch):
+    """Records ffmpeg invocations instead of running them."""
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout=b"ffmpeg-output", stderr=b"")
+
+    monkeypatch.setattr(encode.subprocess, "run", fake_run)
+    return calls
+
+
+@pytest.mark.parametrize("fmt", ["flac", "mp3", "opus"])
+def test_native_formats_are_encoded_in_process(fmt, ffmpeg_calls):
+    if not native_encoding_supported(fmt, 48000):
+        pytest.skip(f"libsndfile without {fmt} support")
+    out = encode_audio(_audio(), fmt, ffmpeg_bin="ffmpeg")
+    assert not ffmpeg_calls
+    audio, sample_rate = sf.read(io.BytesIO(out))
+    assert sample_rate == 48000
+    assert abs(len(audio) - 24000) < 2000  # codecs may pad a frame
+
+
+def test_aac_falls_back_to_ffmpeg(ffmpeg_calls):
+    assert encode_audio(_audio(), "aac", ffmpeg_bin="ffmpeg") == b"ffmpeg-output"
+    assert len(ffmpeg_calls) == 1
+
+
+def test_native_speed_change_needs_no_ffmpeg(ffmpeg_calls):
+    out = encode_audio(_audio(), "wav", ffmpeg_bin="ffmpeg", speed=2.0)
+    assert not ffmpeg_calls
+    audio, _ = sf.read(io.BytesIO(out))
+    assert len(audio) == 12000
+
+
+def test_ffmpeg_speed_backend_uses_atempo(ffmpeg_calls):
+    encode_audio(_audio(), "flac", ffmpeg_bin="ffmpeg", speed=1.5, speed_backend="ffmpeg")
+    assert "atempo=1.500000" in ffmpeg_calls[0]
+
+
+def test_stream_with_native_speed_is_plain_wav():
+    parts = [np.zeros(4800, dtype=np.float32), np.zeros(4800, dtype=np.float32)]
+    out = b"".join(stream_encode(parts, 48000, "wav", ffmpeg_bin="missing-ffmpeg", speed=2.0))
+    assert len(out) == 44 + 2 * 2400 * 2
+
+
+def test_encoder_ffmpeg_forces_subprocess(ffmpeg_calls):
+    encode_audio(_audio(), "flac", ffmpeg_bin="ffmpeg", encoder="ffmpeg")
+    assert len(ffmpeg_calls) == 1
+    # ffmpeg is fed raw PCM, not a WAV to parse
+    assert ffmpeg_calls[0][ffmpeg_calls[0].index("-f") + 1] == "s16le"
+
+
+def test_opus_needs_a_supported_sample_rate():
+    assert not native_encoding_supported("opus", 44100)
+    assert not native_encoding_supported("aac", 48000)
+
+
+def test_profile_codec_settings_go_to_ffmpeg(ffmpeg_calls):
+    profile = OutputProfile(sample_rate=8000, bitrate="16k", opus_frame_ms=20)
+    encode_audio(_audio(), "opus", ffmpeg_bin="ffmpeg", profile=profile)
+    args = ffmpeg_calls[0]
+    assert args[args.index("-ar") + 1] == "8000"
+    assert args[args.index("-b:a") + 1] == "16k"
+    assert args[args.index("-frame_duration") + 1] == "20"
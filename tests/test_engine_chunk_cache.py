@@ -0,0 +1,47 @@
+"""Tests for the sub-phrase (chunk-level) audio cache of the engine."""
+import numpy as np
+
+from app.audio.cache import MemoryCache
+
+
+def _inferred(apply_calls: list[list[str]]) -> list[str]:
+    """Every text that reached apply_tts, in call order."""
+    return [text for call in apply_calls for text in call]
+
+
+def test_shared_chunks_are_synthesized_once(fake_apply_tts_engine):
+    engine, apply_calls = fake_apply_tts_engine(max_chars_per_chunk=20, chunk_cache=MemoryCache(max_bytes=1 << 20))
+    first = list(engine.iter_audio("Добрый день. Ваш заказ готов."))
+    second = list(engine.iter_audio("Добрый день. Ваш заказ отменён."))
+
+    assert _inferred(apply_calls) == ["Добрый день.", "Ваш заказ готов.", "Ваш заказ отменён."]
+    assert np.array_equal(first[0], second[0])
+
+
+def test_chunk_cache_key_depends_on_model_and_speaker(fake_apply_tts_engine):
+    cache = MemoryCache(max_bytes=1 << 20)
+    engine, apply_calls = fake_apply_tts_engine(chunk_cache=cache)
+    other_model, other_calls = fake_apply_tts_engine(chunk_cache=cache, model_id="v4_ru")
+
+    engine.synthesize_chunk("Привет.", "baya")
+    engine.synthesize_chunk("Привет.", "aidar")
+    other_model.synthesize_chunk("Привет.", "baya")
+
+    assert _inferred(apply_calls) == ["Привет.", "Привет."]
+    assert _inferred(other_calls) == ["Привет."]
+
+
+def test_without_chunk_cache_every_chunk_is_synthesized(fake_apply_tts_engine):
+    engine, apply_calls = fake_apply_tts_engine(chunk_cache=None)
+    engine.synthesize_chunk("Привет.", "baya")
+    engine.synthesize_chunk("Привет.", "baya")
+    assert _inferred(apply_calls) == ["Привет.", "Привет."]
+
+
+def test_warm_up_bypasses_chunk_cache(fake_apply_tts_engine):
+    """Every warmup run must reach the model, not the chunk cache."""
+    cache = MemoryCache(max_bytes=1 << 20)
+    engine, apply_calls = fake_apply_tts_engine(max_chars_per_chunk=20, chunk_cache=cache)
+    engine.warm_up(["Первое предложение. Второе предложение."], ["baya"], [48000, 8000], runs=2)
+    assert len(apply_calls) == 2 * 2 * 2
+    assert len(cache) == 0
@@ -18,7 +18,7 @@ class _FakeTorch:
             get_device_name=lambda _i: "Fake GPU",
         )
         self.version = types.SimpleNamespace(cuda="0.0")
-        self.hub = types.SimpleNamespace(load=self._hub_load)
+        self.hub = types.SimpleNamespace(load=self._hub_load, get_dir=lambda: os.path.join(os.environ["TORCH_HOME"], "hub"))
         self.inference_mode = _FakeInferenceMode
 
     def set_num_threads(self, _threads: int):
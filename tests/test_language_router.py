@@ -16,3 +16,13 @@ def test_split_mixed_text_preserves_order() -> None:
         ("en", "hello world!"),
         ("ru", "Как дела?"),
     ]
+
+
+def test_opening_quote_goes_with_the_next_segment() -> None:
+    router = LanguageAwareRouter()
+    segments = router.split("Он сказал «Hello» и ушёл.")
+    assert [(s.lang, s.text) for s in segments] == [
+        ("ru", "Он сказал"),
+        ("en", "«Hello»"),
+        ("ru", "и ушёл."),
+    ]
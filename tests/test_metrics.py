@@ -0,0 +1,82 @@
+"""Tests for the Prometheus metrics and GET /metrics."""
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.metrics import REGISTRY, Counter, Gauge, Histogram
+
+_SAMPLE_RE = re.compile(r'^[a-z_]+(\{([a-z_]+="[^"]*",?)*\})? -?[0-9.e+-]+$|^[a-z_]+(\{.*\})? \+Inf$')
+
+
+def _samples(text: str) -> dict[str, float]:
+    """Sample lines of an exposition text, checked against the format."""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            assert re.match(r"^# (HELP|TYPE) [a-z_]+ .+$", line), line
+            continue
+        assert _SAMPLE_RE.match(line), line
+        name, value = line.rsplit(" ", 1)
+        samples[name] = float(value)
+    return samples
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("t_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        h.observe(value, stage="x")
+    samples = _samples(h.render())
+    assert samples['t_seconds_bucket{stage="x",le="0.1"}'] == 1
+    assert samples['t_seconds_bucket{stage="x",le="1"}'] == 3
+    assert samples['t_seconds_bucket{stage="x",le="+Inf"}'] == 4
+    assert samples['t_seconds_count{stage="x"}'] == 4
+    assert samples['t_seconds_sum{stage="x"}'] == pytest.approx(4.25)
+
+
+def test_labels_are_checked_and_escaped():
+    c = Counter("t_total", "Test.", ("fmt",))
+    with pytest.raises(ValueError):
+        c.inc(other="x")
+    c.inc(2, fmt='a"b')
+    assert 't_total{fmt="a\\"b"} 2' in c.render()
+    g = Gauge("t_depth", "Test.")
+    g.set(3)
+    assert "t_depth 3" in g.render()
+
+
+def test_metrics_endpoint_reports_pipeline(client: TestClient, app, valid_speech_payload: dict):
+    REGISTRY.clear()
+    app.state.settings.auto_play = False
+    assert client.post("/v1/audio/speech", json=valid_speech_payload).status_code == 200
+    assert client.post("/v1/audio/speech", json=valid_speech_payload).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+    assert samples['tts_requests_total{format="wav",cache="miss"}'] == 1
+    assert samples['tts_requests_total{format="wav",cache="hit"}'] == 1
+    for stage in ("auth", "normalize", "concat"):
+        assert samples[f'tts_stage_seconds_count{{stage="{stage}"}}'] >= 1, stage
+    assert samples["tts_request_chunks_count"] == 1
+    assert samples["tts_realtime_factor_count"] == 1
+    assert samples['tts_cache_seconds_count{op="get",tier="memory"}'] == 2
+    assert samples['tts_cache_hits_total{cache="responses",tier="memory"}'] == 1
+    assert samples["tts_queue_depth"] == 0
+    assert samples['tts_engine_loaded{engine="ru"}'] == 1
+
+
+def test_metrics_require_auth(client_with_auth: TestClient):
+    assert client_with_auth.get("/metrics").status_code == 401
+    response = client_with_auth.get("/metrics", headers={"Authorization": "Bearer test-secret-key"})
+    assert response.status_code == 200
+
+
+def test_inference_and_characters_per_engine(fake_apply_tts_engine):
+    REGISTRY.clear()
+    engine, _ = fake_apply_tts_engine()
+    engine.synthesize("Привет, мир.")
+    samples = _samples(REGISTRY.render())
+    assert samples['tts_inference_seconds_count{engine="ru"}'] == 1
+    assert samples['tts_characters_total{engine="ru"}'] == len("Привет, мир.")
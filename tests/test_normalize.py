@@ -1,6 +1,21 @@
 """Tests for text normalization (URL → "link", EN numbers, etc.)."""
-from app.text.normalize import TextNormalizer, replace_urls
-from app.text.numbers import expand_numbers_en
+import subprocess
+import sys
+from pathlib import Path
+
+import app.text.normalize as normalize
+from app.text import morph
+from app.text.normalize import TextNormalizer, replace_urls, text_pipeline_fingerprint
+from app.text.numbers import (
+    NUM_NOUN_RE,
+    PERCENT_RE,
+    RUBLE_RE,
+    STANDALONE_INT_RE,
+    _counted_words,
+    _num_to_words_ru,
+    expand_numbers_en,
+)
+from app.text.transliterate import transliterate_latin_to_cyrillic
 
 
 def test_replace_urls_http():
@@ -31,3 +46,81 @@ def test_label_kept_url_replaced():
 def test_expand_numbers_en():
     assert expand_numbers_en("long audio #1.") == "long audio number one."
     assert "two" in expand_numbers_en("We have 2 goals.")
+
+
+def test_text_pipeline_fingerprint_is_stable():
+    assert text_pipeline_fingerprint() == text_pipeline_fingerprint()
+
+
+def test_text_pipeline_fingerprint_tracks_library_versions(monkeypatch):
+    """A new num2words/pymorphy3 release changes the fingerprint (and drops persistent caches)."""
+    before = text_pipeline_fingerprint()
+    monkeypatch.setattr(normalize.metadata, "version", lambda dist: "999.0")
+    assert text_pipeline_fingerprint() != before
+
+
+def test_text_pipeline_fingerprint_tracks_sources(monkeypatch, tmp_path):
+    """Editing any module of app/text changes the fingerprint."""
+    before = text_pipeline_fingerprint()
+    for src in Path(normalize.__file__).parent.glob("*.py"):
+        (tmp_path / src.name).write_bytes(src.read_bytes())
+    (tmp_path / "numbers.py").write_text("# changed\n", encoding="utf-8")
+    monkeypatch.setattr(normalize, "__file__", str(tmp_path / "normalize.py"))
+    assert text_pipeline_fingerprint() != before
+
+
+def _staged_reference(text: str) -> str:
+    """The normalizer as separate passes, one regex at a time (the order the pipeline must preserve)."""
+    text = replace_urls(text.strip())
+    text = NUM_NOUN_RE.sub(lambda m: _counted_words(int(m.group(1)), m.group(2)), text)
+    text = PERCENT_RE.sub(lambda m: _counted_words(int(m.group(1)), "процент"), text)
+    text = RUBLE_RE.sub(lambda m: _counted_words(int(m.group(1)), "рубль"), text)
+    text = STANDALONE_INT_RE.sub(lambda m: _num_to_words_ru(int(m.group(1))), text)
+    return " ".join(transliterate_latin_to_cyrillic(text).split())
+
+
+def test_merged_passes_match_staged_reference():
+    """Merging the number + noun/%/ruble passes keeps the results of running them one by one."""
+    n = TextNormalizer(transliterate_latin=True)
+    for text in [
+        "У меня 5 яблок, 21 рубль, 3% и 12 345 рублей.",
+        "Рост 5.3% за 2 дня",  # the standalone pass sees "3%" already replaced
+        "5руб 7 РУБ. 1 ₽ 100 % 11 процентов",
+        "Версия 2.0 в 10:30, API v5 и 5G",
+        "Ссылка www.x.ru/5 яблок и https://a.ru/1 2 дома",
+        "4G 12abc 7 Домов 2 ДОМА",
+    ]:
+        assert n.run(text) == _staged_reference(text), text
+
+
+def test_short_inputs_are_memoized(monkeypatch):
+    n = TextNormalizer(transliterate_latin=False)
+    assert n.run("  5 яблок ") == "пять яблок"
+    monkeypatch.setattr(n, "_passes", [])
+    assert n.run("5 яблок") == "пять яблок"  # served from the memo
+    assert n.run("6 яблок") == "6 яблок"
+
+
+def test_morph_analyzer_is_built_lazily():
+    code = "import app.text.normalize, app.text.morph as m; assert m._morph is None"
+    root = Path(__file__).resolve().parents[1]
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_agreement_by_numeral_class_matches_pymorphy():
+    """Cached agreement (one entry per noun and class) equals agreeing with the exact number."""
+    for word in ["яблоко", "рубль", "день", "минута", "человек", "сутки"]:
+        p = morph._best_noun_parse(word)
+        for n in [0, 1, 2, 4, 5, 11, 12, 14, 19, 21, 22, 25, 101, 111, 112, 1001, 1_000_000]:
+            agreed = p.make_agree_with_number(n)
+            assert morph.agree_word_with_number(word, n) == (agreed.word if agreed else word), (word, n)
+
+
+def test_preload_fills_agreement_cache():
+    morph._agree.cache_clear()
+    morph.preload(["рубль", "процент"])
+    assert morph._agree.cache_info().currsize == 6
+    hits = morph._agree.cache_info().hits
+    assert morph.agree_word_with_number("рубль", 21) == "рубль"
+    assert morph.agree_word_with_number("процент", 5) == "процентов"
+    assert morph._agree.cache_info().hits == hits + 2
@@ -0,0 +1,55 @@
+"""Tests for fanning out pieces of one request to a shared pool."""
+import threading
+import time
+
+from app.tts.parallel import FanoutPool
+
+
+def test_map_ordered_keeps_input_order():
+    pool = FanoutPool(workers=4, max_parallel=4)
+    delays = [0.05, 0.0, 0.03, 0.01, 0.0]
+
+    def work(i):
+        time.sleep(delays[i])
+        return i
+
+    assert list(pool.map_ordered(work, range(len(delays)))) == [0, 1, 2, 3, 4]
+
+
+def test_map_ordered_runs_concurrently():
+    pool = FanoutPool(workers=4, max_parallel=4)
+    t0 = time.perf_counter()
+    list(pool.map_ordered(lambda _: time.sleep(0.1), range(4)))
+    assert time.perf_counter() - t0 < 0.3
+
+
+def test_map_ordered_respects_per_request_cap():
+    pool = FanoutPool(workers=8, max_parallel=2)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def work(i):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return i
+
+    assert list(pool.map_ordered(work, range(6))) == list(range(6))
+    assert peak <= 2
+
+
+def test_map_ordered_sequential_when_cap_is_one():
+    pool = FanoutPool(workers=4, max_parallel=1)
+    threads = set()
+
+    def work(i):
+        threads.add(threading.get_ident())
+        return i * 2
+
+    assert list(pool.map_ordered(work, range(3))) == [0, 2, 4]
+    assert threads == {threading.get_ident()}
@@ -0,0 +1,80 @@
+"""Tests for multi-process engine sharding (fake worker engines, no model)."""
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+import app.tts.process_pool as process_pool
+from app.tts.process_pool import ShardedSileroTTSEngine
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fake worker engine is injected through fork",
+)
+
+
+class _FakeWorkerEngine:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def load(self):
+        pass
+
+    def _synthesize_batch(self, texts, speaker, sample_rate=None):
+        if "crash" in texts:
+            os._exit(1)
+        # Encode the worker pid into the audio so the test can see where inference ran
+        return [np.full(len(t), os.getpid(), dtype=np.float32) for t in texts]
+
+
+@pytest.fixture
+def sharded_engine(monkeypatch):
+    monkeypatch.setattr(process_pool, "SileroTTSEngine", _FakeWorkerEngine)
+    engine = ShardedSileroTTSEngine(
+        language="ru",
+        model_id="v5_1_ru",
+        device="cpu",
+        sample_rate=48000,
+        default_speaker="baya",
+        num_threads=1,
+        num_workers=2,
+        start_method="fork",
+    )
+    engine.load()
+    yield engine
+    engine.close()
+
+
+def test_sharded_engine_runs_inference_in_worker_processes(sharded_engine):
+    assert sharded_engine.is_loaded
+    audio = sharded_engine._synthesize_chunk("Привет", "baya")
+    assert len(audio) == len("Привет")
+    assert int(audio[0]) != os.getpid()
+
+
+def test_sharded_engine_iter_audio_keeps_chunk_order(sharded_engine):
+    sharded_engine.max_chars_per_chunk = 12
+    sharded_engine.chunk_pause_sec = 0.0
+    parts = list(sharded_engine.iter_audio("Раз два. Три четыре. Пять."))
+    assert [len(p) for p in parts] == [len("Раз два."), len("Три четыре."), len("Пять.")]
+
+
+def test_sharded_engine_restarts_pool_after_worker_crash(sharded_engine):
+    broken_pool = sharded_engine._pool
+    with pytest.raises(RuntimeError, match="died"):
+        sharded_engine._synthesize_chunk("crash", "baya")
+
+    assert sharded_engine.is_loaded
+    assert sharded_engine._pool is not broken_pool
+    audio = sharded_engine._synthesize_chunk("Привет", "baya")
+    assert len(audio) == len("Привет")
+
+
+def test_sharded_engine_not_loaded_before_load():
+    engine = ShardedSileroTTSEngine(
+        language="ru", model_id="v5_1_ru", device="cpu", sample_rate=48000, default_speaker="baya",
+    )
+    assert not engine.is_loaded
+    with pytest.raises(RuntimeError):
+        list(engine.iter_audio("Привет"))
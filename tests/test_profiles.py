@@ -0,0 +1,38 @@
+"""Tests for output profiles."""
+import pytest
+
+from app.audio.profiles import BUILTIN_PROFILES, OutputProfile, check_key_profiles, load_profiles
+from app.tts.engine import synthesis_rate
+
+
+def test_resolve_drops_settings_that_do_not_apply() -> None:
+    telephony = BUILTIN_PROFILES["telephony"]
+    assert telephony.resolve("wav", 8000).is_default
+    assert telephony.resolve("opus", 24000).sample_rate == 8000
+    assert telephony.resolve("mp3", 8000) == OutputProfile(bitrate="16k")
+    assert telephony.resolve("opus", 8000).cache_tag() == "|br=16k|frame=20"
+
+
+def test_custom_profiles_are_validated() -> None:
+    profiles = load_profiles({"car": {"sample_rate": 24000, "channels": 2}})
+    assert profiles["car"].ffmpeg_args() == ["-ac", "2"]
+    assert "telephony" in profiles
+    with pytest.raises(ValueError, match="unknown options"):
+        load_profiles({"bad": {"rate": 8000}})
+    with pytest.raises(ValueError, match="opus_frame_ms"):
+        OutputProfile(opus_frame_ms=15)
+
+
+def test_key_profiles_must_name_existing_profiles() -> None:
+    profiles = load_profiles({"car": {"channels": 2}})
+    check_key_profiles({"k1": "car", "k2": "telephony"}, profiles)
+    with pytest.raises(ValueError, match=r"unknown output profiles \['telephone'\]"):
+        check_key_profiles({"k1": "car", "k2": "telephone"}, profiles)
+
+
+@pytest.mark.parametrize(
+    "max_rate,out_rate,expected",
+    [(48000, None, 48000), (48000, 8000, 8000), (48000, 16000, 24000), (24000, 44100, 24000), (48000, 44100, 48000)],
+)
+def test_synthesis_rate_is_the_cheapest_covering_rate(max_rate, out_rate, expected) -> None:
+    assert synthesis_rate(max_rate, out_rate) == expected
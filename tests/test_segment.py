@@ -0,0 +1,67 @@
+"""Tests for sentence segmentation and balanced chunking."""
+import random
+
+import pytest
+
+from app.text.segment import chunk_text, split_sentences
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Привет, мир! Как дела?", ["Привет, мир!", "Как дела?"]),
+        ("Это т.е. пример. Дальше.", ["Это т.е. пример.", "Дальше."]),
+        ("Ну... ладно. Пока.", ["Ну... ладно.", "Пока."]),
+        ("Живу на ул. Ленина. Тут.", ["Живу на ул. Ленина.", "Тут."]),
+        ("А. С. Пушкин — поэт.", ["А. С. Пушкин — поэт."]),
+        ("Число 3.14 длинное. Да.", ["Число 3.14 длинное.", "Да."]),
+        ("«Да?» Он кивнул.", ["«Да?»", "Он кивнул."]),
+        ("— Что?! — спросил он. — Ничего.", ["— Что?! — спросил он.", "— Ничего."]),
+        ("Заголовок\nТекст", ["Заголовок", "Текст"]),
+        ("Mr. Smith came. He left.", ["Mr. Smith came.", "He left."]),
+    ],
+)
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_short_text_is_one_chunk():
+    assert chunk_text("  Привет. Пока.  ", 500) == ["Привет. Пока."]
+    assert chunk_text("   ", 500) == []
+
+
+def test_chunks_are_balanced_and_sentence_aligned():
+    rng = random.Random(1)
+    words = "раз два три четыре пять шесть семь восемь девять десять".split()
+    sentences = [" ".join(rng.choice(words) for _ in range(rng.randint(3, 30))).capitalize() + "." for _ in range(40)]
+    text = " ".join(sentences)
+
+    chunks = chunk_text(text, 500)
+    lengths = [len(c) for c in chunks]
+    assert max(lengths) <= 500
+    assert len(chunks) <= -(-len(text) // 500) + 1
+    assert max(lengths) - min(lengths) < 150
+    assert all(c.endswith(".") for c in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_greedy_remainder_is_avoided():
+    """480 + 40 characters of sentences split into two similar chunks, not a full one and a tiny one."""
+    text = " ".join(["Короткое предложение здесь."] * 19)
+    lengths = [len(c) for c in chunk_text(text, 480)]
+    assert len(lengths) == 2
+    assert abs(lengths[0] - lengths[1]) <= 28
+
+
+def test_long_sentence_is_cut_at_clauses_then_words():
+    clause = "слово " * 10
+    sentence = ", ".join([clause.strip()] * 6) + "."
+    chunks = chunk_text(sentence, 150)
+    assert all(len(c) <= 150 for c in chunks)
+    assert all(c.endswith((",", ".")) for c in chunks)
+    # Never mid-word
+    assert all(w == "слово" for c in chunks for w in c.replace(",", "").replace(".", "").split())
+
+
+def test_overlong_word_is_cut_evenly():
+    assert [len(c) for c in chunk_text("а" * 1200, 500)] == [400, 400, 400]
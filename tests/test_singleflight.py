@@ -0,0 +1,91 @@
+"""Tests for request coalescing (single-flight)."""
+import asyncio
+
+import pytest
+
+from app.audio.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return b"audio"
+
+    async def run():
+        sf = SingleFlight()
+        results = await asyncio.gather(*(sf.do("k", compute) for _ in range(4)))
+        return sf, results
+
+    sf, results = asyncio.run(run())
+    assert results == [b"audio"] * 4
+    assert len(calls) == 1
+    assert sf.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 3}
+
+
+def test_error_reaches_every_waiter_and_key_is_released():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad text")
+
+    async def run():
+        sf = SingleFlight()
+        results = await asyncio.gather(sf.do("k", fail), sf.do("k", fail), return_exceptions=True)
+        return sf, results
+
+    sf, results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert not sf.in_flight("k")
+
+
+def test_late_stream_subscriber_gets_every_chunk():
+    async def produce(flight):
+        for chunk in (b"a", b"b", b"c"):
+            flight.publish(chunk)
+            await asyncio.sleep(0.01)
+        return b"abc"
+
+    async def read_all(subscription):
+        return b"".join([chunk async for chunk in subscription])
+
+    async def read(flight):
+        return await read_all(flight.subscribe())
+
+    async def run():
+        sf = SingleFlight()
+        flight = sf.join_stream("k", produce)
+        first = flight.subscribe()
+        await asyncio.sleep(0.015)
+        # Joins after the first chunks were published
+        late = sf.join_stream("k", produce)
+        assert late is flight
+        return await asyncio.gather(read_all(first), read(late), late.result())
+
+    first, late, buffered = asyncio.run(run())
+    assert first == late == b"abc"
+    assert buffered == b"abc"
+
+
+def test_stream_is_abandoned_when_every_subscriber_leaves():
+    async def run():
+        sf = SingleFlight()
+        stopped = asyncio.Event()
+
+        async def produce(flight):
+            while not flight.abandoned:
+                flight.publish(b"x")
+                await asyncio.sleep(0.01)
+            stopped.set()
+            raise RuntimeError("abandoned")
+
+        flight = sf.join_stream("k", produce)
+        sub = flight.subscribe()
+        await asyncio.sleep(0.02)
+        sub.close()
+        await asyncio.wait_for(stopped.wait(), 1)
+        with pytest.raises(RuntimeError):
+            await flight.task
+
+    asyncio.run(run())
@@ -0,0 +1,95 @@
+"""Tests for background model loading, /healthz, /readyz and 503 while loading."""
+import threading
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.startup import start_in_background
+from tests.conftest import create_test_app
+
+
+def _starting_app(**settings):
+    """Test app in the state create_app leaves it in: nothing loaded yet."""
+    app = create_test_app(language_aware_routing=True)
+    app.state.settings = app.state.settings.model_copy(update={"morph_preload": False, **settings})
+    app.state.loaded = threading.Event()
+    app.state.ready = threading.Event()
+    app.state.startup_seconds = None
+    app.state.engine_status = {"ru": {"state": "pending", "seconds": None}, "en": {"state": "pending", "seconds": None}}
+    app.state.warmup = {"status": "pending", "seconds": None}
+    return app
+
+
+def test_importing_main_does_not_create_the_app():
+    assert "app" not in vars(main)
+
+
+def test_models_load_concurrently_in_background(valid_speech_payload):
+    app = _starting_app()
+    barrier = threading.Barrier(2, timeout=5)
+    # Each load waits for the other one: this only finishes if they run at the same time
+    app.state.engine.load = barrier.wait
+    app.state.en_engine.load = barrier.wait
+    release = threading.Event()
+    app.state.engine.warm_up = lambda *args, **kwargs: release.wait(5)
+    client = TestClient(app)
+
+    thread = start_in_background(app)
+    assert app.state.loaded.wait(5)
+    readyz = client.get("/readyz")
+    assert readyz.status_code == 503 and readyz.json()["warmup"]["status"] == "running"
+    assert client.get("/healthz").status_code == 200
+
+    release.set()
+    thread.join(5)
+    readyz = client.get("/readyz")
+    assert readyz.status_code == 200
+    body = readyz.json()
+    assert body["engines"]["ru"]["state"] == "loaded" and body["engines"]["en"]["state"] == "loaded"
+    assert body["engines"]["ru"]["seconds"] is not None and body["startup_seconds"] is not None
+    assert client.post("/v1/audio/speech", json=valid_speech_payload).status_code == 200
+
+
+def test_speech_is_503_while_loading(valid_speech_payload):
+    app = _starting_app()
+    response = TestClient(app).post("/v1/audio/speech", json=valid_speech_payload)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_en_model_failure_falls_back_to_ru():
+    app = _starting_app(warmup_enabled=False)
+
+    def broken():
+        raise RuntimeError("no such model")
+
+    app.state.en_engine.load = broken
+    start_in_background(app).join(5)
+    assert app.state.ready.is_set()
+    assert app.state.en_engine is None
+    assert app.state.engine_status["en"]["state"] == "failed"
+    assert app.state.engine_status["en"]["error"] == "no such model"
+
+
+def test_morph_preload_is_not_reported_as_an_engine(monkeypatch):
+    monkeypatch.setattr("app.text.morph.preload", lambda: None)
+    app = _starting_app(warmup_enabled=False, morph_preload=True)
+    start_in_background(app).join(5)
+    body = TestClient(app).get("/readyz").json()
+    assert set(body["engines"]) == {"ru", "en"}
+    assert body["preload"]["morph"]["state"] == "loaded"
+    assert 'engine="morph"' not in TestClient(app).get("/metrics").text
+
+
+def test_ru_model_failure_is_not_ready_and_not_healthy():
+    app = _starting_app()
+
+    def broken():
+        raise RuntimeError("download failed")
+
+    app.state.engine.load = broken
+    start_in_background(app).join(5)
+    client = TestClient(app)
+    assert client.get("/readyz").status_code == 503
+    healthz = client.get("/healthz")
+    assert healthz.status_code == 503 and healthz.json()["engines"]["ru"]["error"] == "download failed"
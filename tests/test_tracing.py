@@ -0,0 +1,142 @@
+"""Tests for request tracing: Server-Timing, OTLP/JSON span export and cProfile dumps."""
+import asyncio
+import contextvars
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from app import tracing
+from app.tracing import Tracer
+
+TRACE_HEADERS = {"X-Debug-Trace": "1"}
+
+
+def _stages(server_timing: str) -> dict[str, float]:
+    stages = {}
+    for item in server_timing.split(", "):
+        name, dur = item.split(";dur=")
+        stages[name] = float(dur)
+    return stages
+
+
+def _exported(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_untraced_request_has_no_timing_headers(client: TestClient, app, valid_speech_payload: dict):
+    app.state.settings.auto_play = False
+    response = client.post("/v1/audio/speech", json=valid_speech_payload)
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+    assert "x-trace-id" not in response.headers
+    assert not tracing.active()
+
+
+def test_header_returns_server_timing(client: TestClient, app, valid_speech_payload: dict):
+    app.state.settings.auto_play = False
+    response = client.post("/v1/audio/speech", json=valid_speech_payload, headers=TRACE_HEADERS)
+    assert response.status_code == 200
+    stages = _stages(response.headers["server-timing"])
+    for name in ("create_speech", "auth", "cache.get", "synthesize", "normalize", "concat", "cache.put"):
+        assert name in stages, name
+    assert stages["create_speech"] >= stages["synthesize"]
+    assert len(response.headers["x-trace-id"]) == 32
+
+
+def test_header_ignored_when_not_allowed(client: TestClient, app, valid_speech_payload: dict):
+    app.state.settings.auto_play = False
+    app.state.tracer = Tracer(allow_header=False)
+    response = client.post("/v1/audio/speech", json=valid_speech_payload, headers=TRACE_HEADERS)
+    assert "server-timing" not in response.headers
+
+
+def test_export_links_chunk_spans_across_threads(client: TestClient, app, fake_apply_tts_engine, tmp_path, valid_speech_payload: dict):
+    """Chunk spans run on inference and fan-out threads but join the request's trace under synthesize."""
+    from app.tts.parallel import FanoutPool
+
+    app.state.settings.auto_play = False
+    fanout = FanoutPool(workers=2, max_parallel=2)
+    engine, _ = fake_apply_tts_engine(max_chars_per_chunk=20, fanout=fanout)
+    app.state.engine = engine
+    export = tmp_path / "spans.jsonl"
+    app.state.tracer = Tracer(trace_all=True, export_path=str(export))
+    payload = {**valid_speech_payload, "input": "Первая фраза. Вторая фраза. Третья фраза."}
+    try:
+        response = client.post("/v1/audio/speech", json=payload)
+    finally:
+        fanout.shutdown()
+    assert response.status_code == 200
+
+    spans = _exported(export)
+    assert {s["traceId"] for s in spans} == {response.headers["x-trace-id"]}
+    by_id = {s["spanId"]: s for s in spans}
+    roots = [s for s in spans if "parentSpanId" not in s]
+    assert [s["name"] for s in roots] == ["create_speech"]
+    assert all(s["parentSpanId"] in by_id for s in spans if s is not roots[0])
+
+    chunks = [s for s in spans if s["name"] == "chunk"]
+    assert len(chunks) == 3
+    assert {by_id[s["parentSpanId"]]["name"] for s in chunks} == {"synthesize"}
+    inference = [s for s in spans if s["name"] == "inference"]
+    assert {by_id[s["parentSpanId"]]["name"] for s in inference} == {"chunk"}
+    assert {"key": "engine", "value": {"stringValue": "ru"}} in inference[0]["attributes"]
+    assert int(chunks[0]["endTimeUnixNano"]) >= int(chunks[0]["startTimeUnixNano"])
+
+
+def test_streamed_trace_is_exported_when_stream_ends(client: TestClient, app, tmp_path, valid_speech_payload: dict):
+    app.state.settings.auto_play = False
+    export = tmp_path / "spans.jsonl"
+    tracer = app.state.tracer = Tracer(export_path=str(export))
+    on_loop = []
+    finish = tracer.finish
+
+    def record_finish(trace):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        finish(trace)
+
+    tracer.finish = record_finish
+    payload = {**valid_speech_payload, "stream": True}
+    response = client.post("/v1/audio/speech", json=payload, headers=TRACE_HEADERS)
+    assert response.status_code == 200
+    assert "create_speech" in _stages(response.headers["server-timing"])
+    # The export does file I/O: it must not block the event loop
+    assert on_loop == [False]
+
+    names = {s["name"] for s in _exported(export)}
+    assert {"create_speech", "normalize"} <= names
+
+
+def _profiled_trace(tracer: Tracer, seconds: float) -> tracing.Trace:
+    def run() -> tracing.Trace:
+        trace = tracer.begin({"x-debug-trace": "1"})
+        with tracing.span("create_speech"):
+            tracing.profiled(time.sleep, seconds)
+        return trace
+
+    return contextvars.copy_context().run(run)
+
+
+def test_keeps_profiles_of_slowest_requests(tmp_path):
+    tracer = Tracer(profile_slowest=2, profile_dir=str(tmp_path))
+    for seconds in (0.03, 0.001, 0.05, 0.002):
+        tracer.finish(_profiled_trace(tracer, seconds))
+
+    kept = sorted(p.name for p in tmp_path.glob("*.prof"))
+    assert len(kept) == 2
+    assert [float(name.split("ms_")[0]) >= 30 for name in kept] == [True, True]
+
+
+def test_nested_profiled_calls_share_one_profiler():
+    def run():
+        trace = Tracer(profile_slowest=1).begin({"x-debug-trace": "1"})
+        tracing.profiled(tracing.profiled, sum, [1, 2])
+        return trace
+
+    trace = contextvars.copy_context().run(run)
+    assert trace.stats is not None
+    assert trace.stats.total_calls > 0
@@ -0,0 +1,59 @@
+"""Tests for the startup warmup and common-phrase cache priming."""
+from fastapi.testclient import TestClient
+
+from app.audio.profiles import load_profiles
+from app.warmup import DEFAULT_WARMUP_TEXTS, run_warmup, warmup_rates
+from tests.conftest import create_test_app
+
+
+def _cold_app(**settings):
+    app = create_test_app(language_aware_routing=True)
+    app.state.settings = app.state.settings.model_copy(update=settings)
+    app.state.warmup = {"status": "pending", "seconds": None}
+    return app
+
+
+def test_warmup_covers_engines_speakers_and_profile_rates():
+    app = _cold_app(warmup_speakers=["alloy", "baya", "aidar"], warmup_runs=3)
+    run_warmup(app)
+
+    texts, speakers, rates, runs = app.state.engine.warmups[0]
+    assert len(texts) == len(DEFAULT_WARMUP_TEXTS["ru"])
+    assert "21" not in texts[1]  # normalized like request text
+    assert speakers == ["baya", "aidar"]  # "alloy" maps to baya
+    assert rates == [48000, 24000, 8000]  # telephony and wideband profiles
+    assert runs == 3
+    en_texts, en_speakers, _, _ = app.state.en_engine.warmups[0]
+    assert en_speakers == ["en_0"] and len(en_texts) == len(DEFAULT_WARMUP_TEXTS["en"])
+
+
+def test_warmup_rates():
+    profiles = load_profiles({})
+    assert warmup_rates(48000, profiles) == [48000, 24000, 8000]
+    assert warmup_rates(24000, {"default": profiles["default"]}) == [24000]
+
+
+def test_failed_warmup_still_becomes_ready():
+    app = _cold_app()
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    app.state.engine.warm_up = broken
+    run_warmup(app)
+    assert app.state.warmup["status"] == "failed"
+
+
+def test_cache_phrases_are_served_from_cache(valid_speech_payload):
+    app = _cold_app(warmup_cache_phrases=["Минуту, пожалуйста."], warmup_speakers=["alloy"])
+    run_warmup(app)
+    assert app.state.warmup["cached_phrases"] == 1
+    calls = len(app.state.engine.calls)
+
+    client = TestClient(app)
+    response = client.post("/v1/audio/speech", json={**valid_speech_payload, "input": "Минуту, пожалуйста."})
+    assert response.status_code == 200
+    assert len(app.state.engine.calls) == calls
+
+    run_warmup(app)  # already cached: nothing is synthesized again
+    assert app.state.warmup["cached_phrases"] == 0